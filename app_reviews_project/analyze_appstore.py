@@ -1,5 +1,11 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-from textblob import TextBlob
+
+# Shared sentiment scoring (google_play_reviews_project/google_play_reviews/analysis/sentiment.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "google_play_reviews_project"))
+from google_play_reviews.analysis.sentiment import SENTIMENT_THRESHOLDS, add_sentiment
 
 # Load your previously saved Apple CSV
 df = pd.read_csv("appstore_reviews.csv")
@@ -29,18 +35,8 @@ print(df["text_length"].describe(), "\n")
 # -----------------------------
 # Sentiment Analysis (Polarity)
 # -----------------------------
-print("Calculating sentiment…")
-
-def get_sentiment(text):
-    score = TextBlob(str(text)).sentiment.polarity
-    if score > 0.05:
-        return "positive"
-    elif score < -0.05:
-        return "negative"
-    else:
-        return "neutral"
-
-df["sentiment"] = df["content"].apply(get_sentiment)
+print("Calculating sentiment…", SENTIMENT_THRESHOLDS)
+df = add_sentiment(df, text_col="content")
 
 print("\n===== SENTIMENT DISTRIBUTION =====")
 print(df["sentiment"].value_counts(), "\n")
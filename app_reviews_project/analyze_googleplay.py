@@ -1,5 +1,11 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-from textblob import TextBlob
+
+# Shared sentiment scoring (google_play_reviews_project/google_play_reviews/analysis/sentiment.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "google_play_reviews_project"))
+from google_play_reviews.analysis.sentiment import SENTIMENT_THRESHOLDS, add_sentiment
 
 # ====================================
 # LOAD DATA
@@ -37,20 +43,8 @@ print(df["text_length"].describe())
 # ====================================
 # SENTIMENT ANALYSIS
 # ====================================
-def simple_sentiment(text):
-    if not isinstance(text, str) or len(text.strip()) == 0:
-        return "neutral"
-
-    score = TextBlob(text).sentiment.polarity
-    if score > 0.1:
-        return "positive"
-    elif score < -0.1:
-        return "negative"
-    else:
-        return "neutral"
-
-print("\nCalculating sentiment…")
-df["sentiment"] = df["content"].apply(simple_sentiment)
+print("\nCalculating sentiment…", SENTIMENT_THRESHOLDS)
+df = add_sentiment(df, text_col="content")
 
 print("\n===== SENTIMENT DISTRIBUTION =====")
 print(df["sentiment"].value_counts())
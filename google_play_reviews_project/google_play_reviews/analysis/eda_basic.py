@@ -2,22 +2,31 @@ from __future__ import annotations
 
 import argparse
 import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
 
 import pandas as pd
 
+from ..pipeline.storage import iter_frames, read_frame
+from .eda_stream import ProfileAccumulator, compare_summaries, compare_time_frames
+
 
 def load_df(csv_path: Path) -> pd.DataFrame:
+    """
+    Load a processed run output (.csv, .parquet or .feather, detected from the
+    suffix). Parquet/Feather keep their stored types, so only CSV pays for
+    date parsing. All columns are read: basic_profile reports the column
+    count and missingness across every column.
+    """
     if not csv_path.exists():
-        raise FileNotFoundError(f"CSV not found: {csv_path}")
-    df = pd.read_csv(csv_path)
+        raise FileNotFoundError(f"Input not found: {csv_path}")
+    df = read_frame(csv_path)
+    return coerce_types(df)
+
 
+def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
     # Ensure key types
-    if "review_date" in df.columns:
-        df["review_date"] = pd.to_datetime(df["review_date"], errors="coerce")
-    if "scrape_time" in df.columns:
-        df["scrape_time"] = pd.to_datetime(df["scrape_time"], errors="coerce")
     if "rating" in df.columns:
         df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
     if "thumbs_up" in df.columns:
@@ -29,6 +38,46 @@ def load_df(csv_path: Path) -> pd.DataFrame:
     return df
 
 
+def profile_chunked(csv_path: Path, chunksize: int = 100_000) -> ProfileAccumulator:
+    """
+    Out-of-core profile: reads `chunksize` rows at a time, so peak memory is
+    one chunk plus the bounded accumulator state (see eda_stream).
+    """
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Input not found: {csv_path}")
+    acc = ProfileAccumulator()
+    for chunk in iter_frames(csv_path, chunksize=chunksize):
+        acc.update(add_text_features(coerce_types(chunk)))
+    return acc
+
+
+def _profile_partition(chunk: pd.DataFrame) -> ProfileAccumulator:
+    return ProfileAccumulator().update(add_text_features(coerce_types(chunk)))
+
+
+def profile_parallel(csv_path: Path, workers: int, chunksize: int = 100_000) -> ProfileAccumulator:
+    """
+    Partition the input into `chunksize`-row chunks and profile them in a
+    pool of `workers` processes (text features are the CPU-bound part),
+    merging the partial accumulators as they finish. At most 2 chunks per
+    worker are in flight, so memory stays bounded as in profile_chunked.
+    """
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Input not found: {csv_path}")
+    acc = ProfileAccumulator()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in iter_frames(csv_path, chunksize=chunksize):
+            pending.add(pool.submit(_profile_partition, chunk))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    acc.merge(f.result())
+        for f in pending:
+            acc.merge(f.result())
+    return acc
+
+
 def add_text_features(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     if "review_text" not in df.columns:
@@ -90,7 +139,7 @@ def basic_profile(df: pd.DataFrame) -> dict:
 
     # App version breakdown (top 10)
     if "app_version" in df.columns:
-        av = df["app_version"].fillna("MISSING").value_counts().head(10)
+        av = df["app_version"].astype(object).fillna("MISSING").value_counts().head(10)
         out["app_version_top10"] = {str(k): int(v) for k, v in av.items()}
         out["pct_app_version_missing"] = float((df["app_version"].isna() | (df["app_version"].astype(str).str.strip() == "")).mean())
 
@@ -169,10 +218,34 @@ def write_markdown(summary: dict, out_path: Path) -> None:
     out_path.write_text("\n".join(lines), encoding="utf-8")
 
 
+def write_outputs(summary: dict, agg: pd.DataFrame | None, outdir: Path, stem: str) -> list[Path]:
+    # Save JSON + MD
+    json_out = outdir / f"eda_summary_{stem}.json"
+    md_out = outdir / f"eda_summary_{stem}.md"
+    json_out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    write_markdown(summary, md_out)
+    paths = [json_out, md_out]
+
+    # Save time aggregation (CSV)
+    if agg is not None:
+        agg_out = outdir / f"eda_time_{stem}.csv"
+        agg.to_csv(agg_out, index=False)
+        paths.append(agg_out)
+
+    return paths
+
+
 def main():
     parser = argparse.ArgumentParser(description="Basic EDA for Google Play processed reviews CSV")
-    parser.add_argument("--csv", required=True, help="Path to processed CSV")
+    parser.add_argument("--csv", "--input", dest="csv", required=True,
+                        help="Path to processed reviews file (.csv, .parquet or .feather)")
     parser.add_argument("--outdir", default=None, help="Output directory (default: alongside CSV)")
+    parser.add_argument("--chunksize", type=int, default=0,
+                        help="Profile out-of-core, reading this many rows at a time (0 = load everything)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Profile chunks in this many processes (implies chunked mode)")
+    parser.add_argument("--verify", action="store_true",
+                        help="With --chunksize/--workers, also run the in-memory path and report differences")
     args = parser.parse_args()
 
     csv_path = Path(args.csv).expanduser().resolve()
@@ -186,24 +259,26 @@ def main():
 
     outdir.mkdir(parents=True, exist_ok=True)
 
-    df = load_df(csv_path)
-    df = add_text_features(df)
-
-    summary = basic_profile(df)
-
-    # Save JSON + MD
-    json_out = outdir / f"eda_summary_{csv_path.stem}.json"
-    md_out = outdir / f"eda_summary_{csv_path.stem}.md"
-    json_out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
-    write_markdown(summary, md_out)
-
-    # Save time aggregation (CSV)
-    agg = time_aggregation(df)
-    if agg is not None:
-        agg_out = outdir / f"eda_time_{csv_path.stem}.csv"
-        agg.to_csv(agg_out, index=False)
+    if args.chunksize or args.workers > 1:
+        chunksize = args.chunksize or 100_000
+        if args.workers > 1:
+            acc = profile_parallel(csv_path, workers=args.workers, chunksize=chunksize)
+        else:
+            acc = profile_chunked(csv_path, chunksize=chunksize)
+        summary = acc.to_summary()
+        agg = acc.to_time_frame()
+        if args.verify:
+            df = add_text_features(load_df(csv_path))
+            diffs = compare_summaries(basic_profile(df), summary) + compare_time_frames(time_aggregation(df), agg)
+            print("Verify: chunked == in-memory" if not diffs else "Verify differences:\n- " + "\n- ".join(diffs))
+    else:
+        df = load_df(csv_path)
+        df = add_text_features(df)
+        summary = basic_profile(df)
+        agg = time_aggregation(df)
 
-    print(f"Saved:\n- {json_out}\n- {md_out}" + (f"\n- {agg_out}" if agg is not None else ""))
+    paths = write_outputs(summary, agg, outdir, csv_path.stem)
+    print("Saved:\n- " + "\n- ".join(str(p) for p in paths))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+"""
+Incrementally maintained EDA summary across pipeline runs.
+
+Each run_pipeline run profiles only its own processed rows into a partial
+ProfileAccumulator, persisted as eda_partial_{run_id}.json, and merges it
+into a rolling cumulative state (eda_cumulative_state.json). The dashboard
+outputs eda_summary_cumulative.{json,md} / eda_time_cumulative.csv are then
+rewritten from that state, in time proportional to the new run only.
+
+A review is profiled once, in the first run that sees it: the state keeps
+the uid_keys of every profiled review (eda_seen_uids_*.npy), and later runs
+skip re-scraped or changed reviews instead of counting them again.
+
+  python -m google_play_reviews.analysis.eda_incremental refresh
+  python -m google_play_reviews.analysis.eda_incremental rebuild [--write]
+
+`rebuild` re-profiles every processed run file from scratch (in run order,
+first sightings only) and verifies it against the cumulative state
+(--write replaces the state with it).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline.config import PIPELINE_CONFIG
+from ..pipeline.storage import OUTPUT_FORMATS, iter_frames
+from ..pipeline.uids import first_sightings, uid_keys
+from .eda_basic import add_text_features, coerce_types, write_outputs
+from .eda_stream import ProfileAccumulator, compare_summaries, compare_time_frames
+
+STATE_FILE = "eda_cumulative_state.json"
+SEEN_STEM = "eda_seen_uids"
+OUTPUT_STEM = "cumulative"
+
+_PROCESSED_RE = re.compile(r"^reviews_processed_(.+)$")
+
+
+def profile_frame(df: pd.DataFrame, acc: ProfileAccumulator | None = None) -> ProfileAccumulator:
+    """
+    Add processed rows to `acc` (new accumulator if None), typed exactly as
+    eda_basic would see them after reloading the run file.
+    """
+    acc = acc or ProfileAccumulator()
+    return acc.update(add_text_features(coerce_types(df.copy())))
+
+
+class RunProfile:
+    """
+    One run's partial profile, counting each review_uid once: rows whose
+    uid is in `seen` (sorted uid_keys of reviews already in the cumulative
+    state) or earlier in this run are skipped.
+    """
+
+    def __init__(self, seen: np.ndarray | None = None):
+        self.acc = ProfileAccumulator()
+        self.seen = np.empty(0, dtype=np.int64) if seen is None else seen
+        self.new_keys: set[int] = set()
+        self.skipped = 0
+
+    def update(self, df: pd.DataFrame) -> "RunProfile":
+        keep = first_sightings(uid_keys(df["review_uid"]), self.seen, self.new_keys)
+        self.skipped += int((~keep).sum())
+        profile_frame(df[keep], self.acc)
+        return self
+
+    def seen_after(self, seen: np.ndarray | None = None) -> np.ndarray:
+        """
+        `seen` (default: the run's starting set) plus this run's reviews, sorted.
+        """
+        base = self.seen if seen is None else seen
+        return np.union1d(base, np.fromiter(self.new_keys, dtype=np.int64, count=len(self.new_keys)))
+
+
+def _write_json(path: Path, payload: dict):
+    # Write-then-rename so a crash never leaves a half-written state file
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_state(config=PIPELINE_CONFIG) -> tuple[ProfileAccumulator, list[str]]:
+    path = Path(config["eda_state_dir"]) / STATE_FILE
+    if not path.exists():
+        return ProfileAccumulator(), []
+    state = json.loads(path.read_text(encoding="utf-8"))
+    return ProfileAccumulator.from_dict(state["profile"]), state["runs"]
+
+
+def load_seen(config=PIPELINE_CONFIG) -> np.ndarray:
+    """
+    Sorted uid_keys of the reviews already in the cumulative state.
+    """
+    state_dir = Path(config["eda_state_dir"])
+    path = state_dir / STATE_FILE
+    seen_file = json.loads(path.read_text(encoding="utf-8")).get("seen_file") if path.exists() else None
+    if seen_file is None:
+        return np.empty(0, dtype=np.int64)
+    return np.load(state_dir / seen_file)
+
+
+def save_state(acc: ProfileAccumulator, runs: list[str], seen: np.ndarray, config=PIPELINE_CONFIG):
+    state_dir = Path(config["eda_state_dir"])
+    state_dir.mkdir(parents=True, exist_ok=True)
+    path = state_dir / STATE_FILE
+    old_seen = json.loads(path.read_text(encoding="utf-8")).get("seen_file") if path.exists() else None
+
+    # Seen uids go to a new file that the state then switches to, so a crash
+    # in between leaves the previous state and its seen file intact
+    seen_file = f"{SEEN_STEM}_{time.time_ns()}.npy"
+    with open(state_dir / seen_file, "wb") as f:
+        np.save(f, seen)
+    _write_json(path, {"runs": runs, "profile": acc.to_dict(), "seen_file": seen_file})
+    if old_seen is not None:
+        (state_dir / old_seen).unlink(missing_ok=True)
+
+
+def write_cumulative_outputs(acc: ProfileAccumulator, config=PIPELINE_CONFIG) -> list[Path]:
+    outdir = Path(config["eda_report_dir"])
+    outdir.mkdir(parents=True, exist_ok=True)
+    return write_outputs(acc.to_summary(), acc.to_time_frame(), outdir, OUTPUT_STEM)
+
+
+def update_cumulative(run_id: str, partial: RunProfile, config=PIPELINE_CONFIG, logger=None):
+    """
+    Persist the run's partial summary and merge it into the cumulative
+    state (once per run_id), then refresh the cumulative outputs.
+    """
+    state_dir = Path(config["eda_state_dir"])
+    state_dir.mkdir(parents=True, exist_ok=True)
+    _write_json(state_dir / f"eda_partial_{run_id}.json", {"run_id": run_id, "profile": partial.acc.to_dict()})
+
+    acc, runs = load_state(config)
+    if run_id not in runs:
+        acc.merge(partial.acc)
+        runs.append(run_id)
+        save_state(acc, runs, partial.seen_after(load_seen(config)), config)
+
+    paths = write_cumulative_outputs(acc, config)
+    if logger:
+        logger.info(
+            f"[EDA_INCREMENTAL] run_id={run_id} rows_added={partial.acc.rows} rows_already_seen={partial.skipped} "
+            f"rows_total={acc.rows} outputs={[str(p) for p in paths]}"
+        )
+    return acc
+
+
+def processed_run_files(config=PIPELINE_CONFIG) -> dict[str, Path]:
+    """
+    {run_id: processed output path} for every run in processed_out_dir.
+    """
+    out = {}
+    for path in sorted(Path(config["processed_out_dir"]).glob("reviews_processed_*")):
+        m = _PROCESSED_RE.match(path.stem)
+        if m and path.suffix in OUTPUT_FORMATS.values():
+            out[m.group(1)] = path
+    return out
+
+
+def rebuild(config=PIPELINE_CONFIG, chunksize=100_000) -> tuple[ProfileAccumulator, list[str], np.ndarray]:
+    # run_ids start with their timestamp, so files come in run order and
+    # each review is profiled at its first sighting, as in update_cumulative
+    profile = RunProfile()
+    files = processed_run_files(config)
+    for path in files.values():
+        for chunk in iter_frames(path, chunksize=chunksize):
+            profile.update(chunk)
+    return profile.acc, list(files), profile.seen_after()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental EDA summary across pipeline runs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="Rewrite cumulative outputs from the saved state")
+    rb = sub.add_parser("rebuild", help="Recompute from all processed run files and verify against the state")
+    rb.add_argument("--write", action="store_true", help="Replace the cumulative state with the rebuilt one")
+    rb.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if args.command == "refresh":
+        acc, runs = load_state()
+        paths = write_cumulative_outputs(acc)
+        print(f"Refreshed from {len(runs)} runs:\n- " + "\n- ".join(str(p) for p in paths))
+        return
+
+    full, full_runs, full_seen = rebuild(chunksize=args.chunksize)
+    inc, inc_runs = load_state()
+
+    only_full = sorted(set(full_runs) - set(inc_runs))
+    only_inc = sorted(set(inc_runs) - set(full_runs))
+    diffs = compare_summaries(full.to_summary(), inc.to_summary()) \
+        + compare_time_frames(full.to_time_frame(), inc.to_time_frame())
+    if only_full:
+        diffs.append(f"runs not in incremental state: {only_full}")
+    if only_inc:
+        diffs.append(f"runs in state without a processed file: {only_inc}")
+    print("Incremental == full rebuild" if not diffs else "Differences:\n- " + "\n- ".join(diffs))
+
+    if args.write:
+        save_state(full, full_runs, full_seen)
+        paths = write_cumulative_outputs(full)
+        print("Rewrote state and outputs:\n- " + "\n- ".join(str(p) for p in paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Chunked EDA profile: the same summary dict as eda_basic.basic_profile and
+the same daily frame as eda_basic.time_aggregation, built from mergeable
+accumulators instead of one in-memory DataFrame.
+
+Memory is bounded independently of the row count: the state holds one
+counter per column, distinct rating / sort_mode / app_version / day, plus
+a KLL sketch of O(k log n) word lengths. Chunks are fed through update()
+after eda_basic.add_text_features; partial accumulators (other files,
+processes or runs) combine with merge().
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .sketches import KLLSketch, RunningStats
+
+# Summary keys estimated from the KLL sketch rather than computed exactly
+APPROX_KEYS = {"word_len_median", "word_len_p25", "word_len_p75", "word_len_p95"}
+
+
+class ProfileAccumulator:
+    def __init__(self, sketch_k=200):
+        self.rows = 0
+        self.columns: list[str] = []
+        self.na_counts: dict[str, int] = {}
+
+        self.date_min = None
+        self.date_max = None
+
+        self.rating_counts: dict[float, int] = {}
+        self.rating_na = 0
+        self.rating_float = False
+        self.rating_na_repr = "nan"
+        self.rating_stats = RunningStats()
+
+        self.word_len_stats = RunningStats()
+        self.word_len_sketch = KLLSketch(k=sketch_k)
+        self.very_short = 0
+        self.emoji_only = 0
+
+        self.sort_mode_counts: dict[str, int] = {}
+        self.app_version_counts: dict[str, int] = {}
+        self.app_version_missing = 0
+
+        # day -> [reviews, rating_sum, rating_n]
+        self.daily: dict[str, list] = {}
+
+    # ---------- update / merge ----------
+
+    def update(self, df: pd.DataFrame) -> "ProfileAccumulator":
+        """
+        Add one chunk (already passed through add_text_features).
+        """
+        if len(df) == 0 and self.columns:
+            return self
+        self.rows += len(df)
+        for c in df.columns:
+            if c not in self.columns:
+                self.columns.append(c)
+        for c, v in df.isna().sum().items():
+            self.na_counts[c] = self.na_counts.get(c, 0) + int(v)
+
+        if "review_date" in df.columns:
+            dates = df["review_date"].dropna()
+            if len(dates):
+                self.date_min = dates.min() if self.date_min is None else min(self.date_min, dates.min())
+                self.date_max = dates.max() if self.date_max is None else max(self.date_max, dates.max())
+
+        if "rating" in df.columns:
+            rating = df["rating"]
+            if rating.dtype.kind == "f":
+                self.rating_float = True
+            if isinstance(rating.dtype, pd.api.extensions.ExtensionDtype):
+                self.rating_na_repr = "<NA>"
+            non_na = rating.dropna().astype(float)
+            self.rating_na += int(rating.isna().sum())
+            for k, v in non_na.value_counts().items():
+                self.rating_counts[float(k)] = self.rating_counts.get(float(k), 0) + int(v)
+            self.rating_stats.update(non_na.to_numpy())
+
+        if "word_len" in df.columns:
+            wl = df["word_len"].to_numpy(dtype=float)
+            self.word_len_stats.update(wl)
+            self.word_len_sketch.update(wl)
+            self.very_short += int(df["is_very_short"].sum())
+            self.emoji_only += int(df["is_emoji_or_symbol_only"].sum())
+
+        if "sort_mode" in df.columns:
+            for k, v in df["sort_mode"].astype(object).value_counts(dropna=False).items():
+                self.sort_mode_counts[str(k)] = self.sort_mode_counts.get(str(k), 0) + int(v)
+
+        if "app_version" in df.columns:
+            av = df["app_version"].astype(object)
+            for k, v in av.fillna("MISSING").value_counts().items():
+                self.app_version_counts[str(k)] = self.app_version_counts.get(str(k), 0) + int(v)
+            self.app_version_missing += int((av.isna() | (av.astype(str).str.strip() == "")).sum())
+
+        if "review_date" in df.columns:
+            d = df.dropna(subset=["review_date"])
+            if len(d):
+                day = d["review_date"].dt.date.astype(str)
+                count_col = "review_uid" if "review_uid" in d.columns else "review_date"
+                g = pd.DataFrame({
+                    "day": day,
+                    "n": d[count_col].notna().astype(int),
+                    "rating_sum": d["rating"].astype(float).fillna(0.0) if "rating" in d.columns else 0.0,
+                    "rating_n": d["rating"].notna().astype(int) if "rating" in d.columns else 0,
+                }).groupby("day").sum()
+                for day_key, row in g.iterrows():
+                    acc = self.daily.setdefault(day_key, [0, 0.0, 0])
+                    acc[0] += int(row["n"])
+                    acc[1] += float(row["rating_sum"])
+                    acc[2] += int(row["rating_n"])
+
+        return self
+
+    def merge(self, other: "ProfileAccumulator") -> "ProfileAccumulator":
+        self.rows += other.rows
+        for c in other.columns:
+            if c not in self.columns:
+                self.columns.append(c)
+        _add_counts(self.na_counts, other.na_counts)
+
+        for attr, pick in (("date_min", min), ("date_max", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else (mine if theirs is None else pick(mine, theirs)))
+
+        _add_counts(self.rating_counts, other.rating_counts)
+        self.rating_na += other.rating_na
+        self.rating_float = self.rating_float or other.rating_float
+        if other.rating_na_repr == "<NA>":
+            self.rating_na_repr = "<NA>"
+        self.rating_stats.merge(other.rating_stats)
+
+        self.word_len_stats.merge(other.word_len_stats)
+        self.word_len_sketch.merge(other.word_len_sketch)
+        self.very_short += other.very_short
+        self.emoji_only += other.emoji_only
+
+        _add_counts(self.sort_mode_counts, other.sort_mode_counts)
+        _add_counts(self.app_version_counts, other.app_version_counts)
+        self.app_version_missing += other.app_version_missing
+
+        for day, (n, rsum, rn) in other.daily.items():
+            acc = self.daily.setdefault(day, [0, 0.0, 0])
+            acc[0] += n
+            acc[1] += rsum
+            acc[2] += rn
+        return self
+
+    # ---------- outputs ----------
+
+    def to_summary(self) -> dict:
+        """
+        Same keys and value formats as eda_basic.basic_profile.
+        """
+        out = {}
+        out["rows"] = int(self.rows)
+        out["cols"] = len(self.columns)
+
+        if "review_date" in self.columns:
+            out["review_date_min"] = None if self.date_min is None else str(self.date_min)
+            out["review_date_max"] = None if self.date_max is None else str(self.date_max)
+
+        if "rating" in self.columns:
+            # value_counts keys: "5.0" for float columns (CSV with NaN), "5" for int / Int64
+            out["rating_counts"] = {
+                str(float(k)) if self.rating_float else str(int(k)): int(v)
+                for k, v in sorted(self.rating_counts.items())
+            }
+            if self.rating_na:
+                out["rating_counts"][self.rating_na_repr] = int(self.rating_na)
+
+            if self.rating_stats.n > 0:
+                out["rating_mean"] = float(self.rating_stats.mean)
+                out["rating_median"] = _median_from_counts(self.rating_counts)
+                out["rating_std"] = float(self.rating_stats.std(ddof=1))
+            else:
+                out["rating_mean"] = None
+                out["rating_median"] = None
+                out["rating_std"] = None
+
+        if "word_len" in self.columns and self.rows:
+            out["word_len_mean"] = float(self.word_len_stats.mean)
+            out["word_len_median"] = self.word_len_sketch.quantile(0.5)
+            out["word_len_p25"] = self.word_len_sketch.quantile(0.25)
+            out["word_len_p75"] = self.word_len_sketch.quantile(0.75)
+            out["word_len_p95"] = self.word_len_sketch.quantile(0.95)
+            out["word_len_max"] = int(self.word_len_stats.max)
+
+            out["pct_very_short_le_3_words"] = float(self.very_short / self.rows)
+            out["pct_emoji_or_symbol_only"] = float(self.emoji_only / self.rows)
+
+        miss = pd.Series(
+            {c: self.na_counts.get(c, 0) / self.rows if self.rows else float("nan") for c in self.columns},
+            dtype=float,
+        ).sort_values(ascending=False).head(10)
+        out["missingness_top10"] = {c: float(p) for c, p in miss.items()}
+
+        if "sort_mode" in self.columns:
+            out["sort_mode_counts"] = _top(self.sort_mode_counts)
+
+        if "app_version" in self.columns:
+            out["app_version_top10"] = _top(self.app_version_counts, 10)
+            out["pct_app_version_missing"] = float(self.app_version_missing / self.rows) if self.rows else float("nan")
+
+        return out
+
+    def to_time_frame(self) -> pd.DataFrame | None:
+        """
+        Same shape as eda_basic.time_aggregation.
+        """
+        if "review_date" not in self.columns or not self.daily:
+            return None
+        days = sorted(self.daily)
+        agg = pd.DataFrame({
+            "date": [pd.Timestamp(d).date() for d in days],
+            "reviews": [self.daily[d][0] for d in days],
+            "avg_rating": [self.daily[d][1] / self.daily[d][2] if self.daily[d][2] else np.nan for d in days],
+        })
+        if "rating" not in self.columns:
+            agg["avg_rating"] = None
+        return agg
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "columns": self.columns,
+            "na_counts": self.na_counts,
+            "date_min": None if self.date_min is None else str(self.date_min),
+            "date_max": None if self.date_max is None else str(self.date_max),
+            "rating_counts": [[k, v] for k, v in self.rating_counts.items()],
+            "rating_na": self.rating_na,
+            "rating_float": self.rating_float,
+            "rating_na_repr": self.rating_na_repr,
+            "rating_stats": self.rating_stats.to_dict(),
+            "word_len_stats": self.word_len_stats.to_dict(),
+            "word_len_sketch": self.word_len_sketch.to_dict(),
+            "very_short": self.very_short,
+            "emoji_only": self.emoji_only,
+            "sort_mode_counts": self.sort_mode_counts,
+            "app_version_counts": self.app_version_counts,
+            "app_version_missing": self.app_version_missing,
+            "daily": self.daily,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ProfileAccumulator":
+        acc = cls(sketch_k=d["word_len_sketch"]["k"])
+        acc.rows = d["rows"]
+        acc.columns = list(d["columns"])
+        acc.na_counts = dict(d["na_counts"])
+        acc.date_min = None if d["date_min"] is None else pd.Timestamp(d["date_min"])
+        acc.date_max = None if d["date_max"] is None else pd.Timestamp(d["date_max"])
+        acc.rating_counts = {float(k): int(v) for k, v in d["rating_counts"]}
+        acc.rating_na = d["rating_na"]
+        acc.rating_float = d["rating_float"]
+        acc.rating_na_repr = d["rating_na_repr"]
+        acc.rating_stats = RunningStats.from_dict(d["rating_stats"])
+        acc.word_len_stats = RunningStats.from_dict(d["word_len_stats"])
+        acc.word_len_sketch = KLLSketch.from_dict(d["word_len_sketch"])
+        acc.very_short = d["very_short"]
+        acc.emoji_only = d["emoji_only"]
+        acc.sort_mode_counts = dict(d["sort_mode_counts"])
+        acc.app_version_counts = dict(d["app_version_counts"])
+        acc.app_version_missing = d["app_version_missing"]
+        acc.daily = {k: list(v) for k, v in d["daily"].items()}
+        return acc
+
+
+def _add_counts(target: dict, other: dict):
+    for k, v in other.items():
+        target[k] = target.get(k, 0) + v
+
+
+def _top(counts: dict, n=None) -> dict:
+    items = sorted(counts.items(), key=lambda kv: -kv[1])
+    return {k: int(v) for k, v in (items if n is None else items[:n])}
+
+
+def _median_from_counts(counts: dict) -> float:
+    values = sorted(counts)
+    n = sum(counts.values())
+    targets = [(n - 1) // 2, n // 2]
+    found, seen = [], 0
+    for v in values:
+        seen += counts[v]
+        while len(found) < 2 and targets[len(found)] < seen:
+            found.append(v)
+    return float((found[0] + found[1]) / 2)
+
+
+def compare_summaries(a: dict, b: dict, approx_rel_tol=0.05, approx_abs_tol=1.0, rel_tol=1e-9) -> list[str]:
+    """
+    Differences between two profile summaries. APPROX_KEYS may differ by
+    approx_rel_tol / approx_abs_tol; other floats must match to rel_tol;
+    counts must match exactly (top-N dicts compared as count multisets so
+    ties at the cut-off do not count as a difference).
+    """
+    diffs = []
+    for key in sorted(set(a) | set(b)):
+        if key not in a or key not in b:
+            diffs.append(f"{key}: missing in {'first' if key not in a else 'second'}")
+            continue
+        x, y = a[key], b[key]
+        if isinstance(x, dict):
+            if key == "missingness_top10":
+                same = _close_lists(x, y) and all(
+                    math.isclose(x[c], y[c], rel_tol=1e-6, abs_tol=1e-12) for c in set(x) & set(y)
+                )
+            else:
+                same = sorted(x.values()) == sorted(y.values()) and all(x[k] == y[k] for k in set(x) & set(y))
+            if not same:
+                diffs.append(f"{key}: {x} != {y}")
+        elif isinstance(x, float) or isinstance(y, float):
+            if x is None or y is None:
+                if x is not y:
+                    diffs.append(f"{key}: {x} != {y}")
+            elif key in APPROX_KEYS:
+                if not math.isclose(x, y, rel_tol=approx_rel_tol, abs_tol=approx_abs_tol):
+                    diffs.append(f"{key}: {x} != {y} (approx)")
+            elif not math.isclose(x, y, rel_tol=rel_tol, abs_tol=1e-12):
+                diffs.append(f"{key}: {x} != {y}")
+        elif x != y:
+            diffs.append(f"{key}: {x} != {y}")
+    return diffs
+
+
+def _close_lists(x: dict, y: dict) -> bool:
+    return len(x) == len(y) and all(math.isclose(p, q, rel_tol=1e-6, abs_tol=1e-12)
+               for p, q in zip(sorted(x.values()), sorted(y.values())))
+
+
+def compare_time_frames(a: pd.DataFrame | None, b: pd.DataFrame | None, rel_tol=1e-9) -> list[str]:
+    if a is None or b is None:
+        return [] if a is None and b is None else ["time aggregation missing on one side"]
+    m = a.merge(b, on="date", how="outer", suffixes=("_a", "_b"), indicator=True)
+    diffs = [f"date {d} only in one side" for d in m.loc[m["_merge"] != "both", "date"]]
+    both = m[m["_merge"] == "both"]
+    for _, r in both.iterrows():
+        if r["reviews_a"] != r["reviews_b"]:
+            diffs.append(f"{r['date']}: reviews {r['reviews_a']} != {r['reviews_b']}")
+        ra, rb = r["avg_rating_a"], r["avg_rating_b"]
+        if pd.isna(ra) != pd.isna(rb) or (not pd.isna(ra) and not math.isclose(ra, rb, rel_tol=rel_tol)):
+            diffs.append(f"{r['date']}: avg_rating {ra} != {rb}")
+    return diffs
@@ -0,0 +1,512 @@
+"""
+Keyword statistics for review text: which terms set 1-star reviews apart
+from 5-star ones, one app_version from the others, or one month from the
+rest.
+
+- tokenize / Vocabulary: one regex pass per chunk over the joined texts;
+  terms get stable integer ids in first-seen order and the vocabulary is
+  persisted, so ids stay valid across runs.
+- CSRMatrix: document x term counts in compressed sparse row form, built
+  with NumPy (scipy is not a dependency).
+- tfidf / top_terms: vectorized sublinear TF-IDF with L2-normalized rows
+  and each document's highest weighted terms.
+- TermStats: per-facet (rating / app_version / month) group x term
+  document counts, updated chunk by chunk, from which distinctive_terms
+  ranks a group's terms against the rest of the facet by log-odds with an
+  informative Dirichlet prior, or by chi-squared.
+
+run_pipeline adds each run's processed rows to the persisted state once per
+run_id (keywords_incremental), and each review once: the state keeps the
+uid_keys of the reviews it counts, so a review re-scraped or changed in a
+later run is not another document. Memory grows with the vocabulary, the
+number of (group, term) pairs and 8 bytes per counted review.
+
+  python -m google_play_reviews.analysis.keywords top --facet rating --value 1
+  python -m google_play_reviews.analysis.keywords top --facet app_version --method chi2
+  python -m google_play_reviews.analysis.keywords rebuild --db path/to/reviews.db [--write]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline.config import PIPELINE_CONFIG
+from ..pipeline.db import connect
+from ..pipeline.uids import first_sightings, uid_keys
+
+VOCAB_FILE = "keywords_vocab.txt"
+STATE_FILE = "keywords_state.npz"
+
+FACETS = ("rating", "app_version", "month")
+METHODS = ("log_odds", "chi2")
+
+# Words of 2+ chars starting with a letter (digits / apostrophes inside are
+# kept: "gpt4", "don't"); the record separator \x1e marks document ends in
+# the joined chunk text
+_DOC_BREAK = "\x1e"
+TOKEN_RE = re.compile(r"\x1e|[^\W\d_][\w']*[^\W_]")
+
+STOPWORDS = frozenset("""
+a about after again all also am an and any app are as at be because been before being but by
+can could did do does doing don't for from get got had has have he her here him his how i i'm
+if in into is it it's its just me more most my no not now of on one only or other our out over
+so some still such than that the their them then there these they this to too up us use very
+was we were what when where which while who why will with would you your
+""".split())
+
+_GROUP_SHIFT = np.int64(32)  # (group, term) pairs packed as group << 32 | term
+_TERM_MASK = np.int64(0xFFFFFFFF)
+
+
+class Vocabulary:
+    """
+    term -> id in first-seen order. Stopwords never get an id.
+    """
+
+    def __init__(self, terms=()):
+        self._ids = {t: i for i, t in enumerate(terms)}
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def terms(self) -> list[str]:
+        return list(self._ids)
+
+    def lookup(self, tokens, grow: bool = True) -> np.ndarray:
+        """
+        Term id per token (-1 for stopwords, and for unknown terms when
+        grow is False).
+        """
+        ids = self._ids
+        if grow:
+            out = [-1 if t in STOPWORDS or t == _DOC_BREAK else ids.setdefault(t, len(ids)) for t in tokens]
+        else:
+            out = [ids.get(t, -1) for t in tokens]
+        return np.array(out, dtype=np.int64)
+
+    def save(self, path: Path):
+        _write_atomic(path, lambda f: f.write("\n".join(self._ids).encode("utf-8")))
+
+    @classmethod
+    def load(cls, path: Path) -> "Vocabulary":
+        text = path.read_text(encoding="utf-8")
+        return cls(text.split("\n") if text else ())
+
+
+def tokenize(texts: pd.Series, vocab: Vocabulary, grow: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (document index, term id) for every kept token of `texts`, in text order.
+    """
+    clean = texts.fillna("").astype(str).str.replace(_DOC_BREAK, " ", regex=False)
+    tokens = TOKEN_RE.findall((_DOC_BREAK.join(clean) + _DOC_BREAK).lower())
+    # Look up each distinct token once per chunk instead of once per occurrence
+    codes, uniques = pd.factorize(np.array(tokens, dtype=object))
+    is_break = (uniques == _DOC_BREAK)[codes]
+    doc = np.cumsum(is_break) - is_break
+    term = vocab.lookup(uniques, grow=grow)[codes]
+    keep = term >= 0
+    return doc[keep], term[keep]
+
+
+class CSRMatrix:
+    """
+    Compressed sparse rows: row i holds columns indices[indptr[i]:indptr[i + 1]]
+    with values data[...], columns ascending within a row.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_cols: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_cols = n_cols
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.indptr) - 1, self.n_cols
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def from_coo(cls, rows: np.ndarray, cols: np.ndarray, n_rows: int, n_cols: int,
+                 values: np.ndarray | None = None) -> "CSRMatrix":
+        """
+        Build from (row, col[, value]) triples, summing duplicates.
+        """
+        key = rows.astype(np.int64) * max(n_cols, 1) + cols
+        key, inverse = np.unique(key, return_inverse=True)
+        data = np.bincount(inverse, weights=values, minlength=len(key))
+        if values is None:
+            data = data.astype(np.int64)
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key // max(n_cols, 1), minlength=n_rows), out=indptr[1:])
+        return cls(indptr, key % max(n_cols, 1), data, n_cols)
+
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def binary(self) -> "CSRMatrix":
+        return CSRMatrix(self.indptr, self.indices, np.ones(self.nnz, dtype=np.int64), self.n_cols)
+
+    def column_sums(self) -> np.ndarray:
+        return np.bincount(self.indices, weights=self.data, minlength=self.n_cols).astype(self.data.dtype)
+
+    def to_dense(self) -> np.ndarray:
+        out = np.zeros(self.shape, dtype=self.data.dtype)
+        out[self.row_ids(), self.indices] = self.data
+        return out
+
+
+def doc_term_matrix(texts: pd.Series, vocab: Vocabulary, grow: bool = True) -> CSRMatrix:
+    """
+    Term counts, one row per entry of `texts`, one column per vocabulary id.
+    """
+    doc, term = tokenize(texts, vocab, grow=grow)
+    return CSRMatrix.from_coo(doc, term, len(texts), len(vocab))
+
+
+def tfidf(counts: CSRMatrix, doc_freq: np.ndarray, n_docs: int) -> CSRMatrix:
+    """
+    Sublinear TF-IDF, (1 + log tf) * (log((1 + N) / (1 + df)) + 1), with
+    each row scaled to unit L2 norm.
+    """
+    doc_freq = _padded(doc_freq, counts.n_cols)
+    idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+    weights = (1.0 + np.log(counts.data)) * idf[counts.indices]
+    rows = counts.row_ids()
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=counts.shape[0]))
+    return CSRMatrix(counts.indptr, counts.indices, weights / norms[rows], counts.n_cols)
+
+
+def top_terms(weights: CSRMatrix, vocab: Vocabulary, k: int = 5) -> list[list[str]]:
+    """
+    The k highest weighted terms of each row, best first.
+    """
+    rows = weights.row_ids()
+    order = np.lexsort((-weights.data, rows))
+    rank = np.arange(len(order)) - weights.indptr[rows[order]]
+    keep = order[rank < k]
+    terms = np.asarray(vocab.terms, dtype=object)[weights.indices[keep]]
+    per_row = np.bincount(rows[keep], minlength=weights.shape[0])
+    return [list(t) for t in np.split(terms, np.cumsum(per_row)[:-1])]
+
+
+def tfidf_keywords(texts: pd.Series, stats: "TermStats | None" = None, k: int = 5) -> pd.Series:
+    """
+    Top-k TF-IDF terms per text (index preserved). IDF comes from `stats`
+    (the persisted corpus) when given, else from `texts` themselves.
+    """
+    if stats is not None:
+        vocab = stats.vocab
+        counts = doc_term_matrix(texts, vocab, grow=False)
+        doc_freq, n_docs = stats.doc_freq, stats.docs
+    else:
+        vocab = Vocabulary()
+        counts = doc_term_matrix(texts, vocab)
+        doc_freq, n_docs = counts.binary().column_sums(), len(texts)
+    return pd.Series(top_terms(tfidf(counts, doc_freq, n_docs), vocab, k=k), index=texts.index)
+
+
+def facet_codes(df: pd.DataFrame) -> dict[str, tuple[np.ndarray, list[str]]]:
+    """
+    {facet: (group code per row or -1, group labels)}. Rows without a
+    rating / app_version / parseable review_date get -1 for that facet.
+    """
+    out = {}
+    rating = pd.to_numeric(df["rating"], errors="coerce")
+    codes, uniques = pd.factorize(rating.where(rating.between(1, 5)))
+    out["rating"] = (codes, [str(int(u)) for u in uniques])
+
+    codes, uniques = pd.factorize(df["app_version"])
+    out["app_version"] = (codes, [str(u) for u in uniques])
+
+    date = pd.to_datetime(df["review_date"], errors="coerce")
+    codes, uniques = pd.factorize(date.dt.year * 100 + date.dt.month)
+    out["month"] = (codes, [f"{int(u) // 100:04d}-{int(u) % 100:02d}" for u in uniques])
+    return out
+
+
+def _padded(values: np.ndarray, size: int) -> np.ndarray:
+    if len(values) >= size:
+        return values
+    return np.concatenate([values, np.zeros(size - len(values), dtype=values.dtype)])
+
+
+def _aggregate(keys: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    keys, inverse = np.unique(keys, return_inverse=True)
+    return keys, np.bincount(inverse, weights=counts, minlength=len(keys)).astype(np.int64)
+
+
+class TermStats:
+    """
+    Document frequencies overall and per facet group (rating "1".."5",
+    app_version, month "YYYY-MM"), over a growing Vocabulary. A document
+    counts once per term however often the term occurs in it. `seen`
+    holds the uid_keys of the reviews counted by earlier runs (see
+    update_new).
+    """
+
+    def __init__(self, vocab: Vocabulary | None = None):
+        self.vocab = vocab or Vocabulary()
+        self.docs = 0
+        self.seen = np.zeros(0, dtype=np.int64)
+        self.new_keys: set[int] = set()
+        self.added = 0
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.groups = {f: {} for f in FACETS}            # label -> group index
+        self.group_docs = {f: np.zeros(0, dtype=np.int64) for f in FACETS}
+        self.pairs = {f: (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)) for f in FACETS}
+        # Per-chunk (keys, counts) not yet merged into pairs; compacted once they
+        # outgrow it, so the sort cost stays proportional to the data added
+        self._pending = {f: [] for f in FACETS}
+
+    def update(self, df: pd.DataFrame, text_col: str = "review_text") -> "TermStats":
+        if df.empty:
+            return self
+        present = doc_term_matrix(df[text_col], self.vocab).binary()
+        self.docs += len(df)
+        self.doc_freq = _padded(self.doc_freq, len(self.vocab)) + present.column_sums()
+        rows = present.row_ids()
+
+        for facet, (codes, labels) in facet_codes(df).items():
+            mapping = self.groups[facet]
+            group_of = np.array([mapping.setdefault(label, len(mapping)) for label in labels] + [-1], dtype=np.int64)
+            groups = group_of[codes]                     # code -1 picks the trailing -1
+            self.group_docs[facet] = _padded(self.group_docs[facet], len(mapping)) \
+                + np.bincount(groups[groups >= 0], minlength=len(mapping))
+            token_groups = groups[rows]
+            keep = token_groups >= 0
+            keys = (token_groups[keep] << _GROUP_SHIFT) | present.indices[keep]
+            self._pending[facet].append(_aggregate(keys, np.ones(len(keys))))
+            if sum(len(k) for k, _ in self._pending[facet]) > max(len(self.pairs[facet][0]), 1_000_000):
+                self._compact(facet)
+        return self
+
+    def update_new(self, df: pd.DataFrame, text_col: str = "review_text", keys: np.ndarray | None = None) -> "TermStats":
+        """
+        update() with only the reviews not counted yet, by uid_key of
+        review_uid (or `keys`, one per row).
+        """
+        keep = first_sightings(uid_keys(df["review_uid"]) if keys is None else keys, self.seen, self.new_keys)
+        self.added += int(keep.sum())
+        return self.update(df[keep], text_col)
+
+    def _compact(self, facet: str):
+        if not self._pending[facet]:
+            return
+        parts = [self.pairs[facet]] + self._pending[facet]
+        self.pairs[facet] = _aggregate(np.concatenate([k for k, _ in parts]), np.concatenate([c for _, c in parts]))
+        self._pending[facet] = []
+
+    def group_matrix(self, facet: str) -> CSRMatrix:
+        """
+        Group x term document counts of `facet` (rows in self.groups order).
+        """
+        self._compact(facet)
+        keys, counts = self.pairs[facet]
+        return CSRMatrix.from_coo(keys >> _GROUP_SHIFT, keys & _TERM_MASK,
+                                  len(self.groups[facet]), len(self.vocab), values=counts)
+
+    def distinctive_terms(self, facet: str, value: str, top: int = 20, method: str = "log_odds",
+                          min_docs: int = 5, prior: float = 0.01) -> pd.DataFrame:
+        """
+        Terms most over-represented in group `value` of `facet` relative to
+        the facet's other groups, best first.
+
+        log_odds: z-score of the log-odds ratio with an informative
+        Dirichlet prior (alpha_w = prior * facet-wide count of w), which
+        shrinks rare terms instead of letting them top the list.
+        chi2: chi-squared of the 2x2 docs-with-term table, keeping only
+        positively associated terms.
+        Terms in fewer than min_docs documents of the facet are skipped.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {list(METHODS)}")
+        if value not in self.groups[facet]:
+            raise KeyError(f"No {facet} group {value!r}")
+        g = self.groups[facet][value]
+        matrix = self.group_matrix(facet)
+        y_all = matrix.column_sums().astype(float)
+        start, end = matrix.indptr[g], matrix.indptr[g + 1]
+        y_g = np.zeros(matrix.n_cols)
+        y_g[matrix.indices[start:end]] = matrix.data[start:end]
+        y_r = y_all - y_g
+        docs_g = float(self.group_docs[facet][g])
+        docs_r = float(self.group_docs[facet].sum()) - docs_g
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if method == "log_odds":
+                alpha = prior * y_all
+                alpha0 = alpha.sum()
+                n_g, n_r = y_g.sum(), y_r.sum()
+                delta = np.log((y_g + alpha) / (n_g + alpha0 - y_g - alpha)) \
+                    - np.log((y_r + alpha) / (n_r + alpha0 - y_r - alpha))
+                score = delta / np.sqrt(1.0 / (y_g + alpha) + 1.0 / (y_r + alpha))
+            else:
+                a, b = y_g, y_r
+                c, d = docs_g - a, docs_r - b
+                cross = a * d - b * c
+                score = (docs_g + docs_r) * cross ** 2 / ((a + b) * (c + d) * (a + c) * (b + d))
+                score[cross <= 0] = 0.0
+
+        candidates = np.flatnonzero((y_all >= min_docs) & (y_g > 0) & np.isfinite(score))
+        if len(candidates) > top:
+            candidates = candidates[np.argpartition(-score[candidates], top - 1)[:top]]
+        candidates = candidates[np.argsort(-score[candidates], kind="stable")]
+
+        terms = np.asarray(self.vocab.terms, dtype=object)
+        return pd.DataFrame({
+            "term": terms[candidates],
+            "docs": y_g[candidates].astype(np.int64),
+            "share": y_g[candidates] / max(docs_g, 1.0),
+            "share_rest": y_r[candidates] / max(docs_r, 1.0),
+            "score": score[candidates],
+        })
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        out = {"docs": np.array(self.docs), "doc_freq": _padded(self.doc_freq, len(self.vocab)),
+               "seen": np.union1d(self.seen, np.fromiter(self.new_keys, dtype=np.int64, count=len(self.new_keys)))}
+        for facet in FACETS:
+            self._compact(facet)
+            out[f"{facet}_labels"] = np.array(list(self.groups[facet]), dtype=str)
+            out[f"{facet}_docs"] = self.group_docs[facet]
+            out[f"{facet}_keys"], out[f"{facet}_counts"] = self.pairs[facet]
+        return out
+
+    @classmethod
+    def from_arrays(cls, arrays, vocab: Vocabulary) -> "TermStats":
+        stats = cls(vocab)
+        stats.docs = int(arrays["docs"])
+        stats.doc_freq = arrays["doc_freq"].astype(np.int64)
+        if "seen" in arrays:
+            stats.seen = arrays["seen"].astype(np.int64)
+        for facet in FACETS:
+            stats.groups[facet] = {label: i for i, label in enumerate(arrays[f"{facet}_labels"].tolist())}
+            stats.group_docs[facet] = arrays[f"{facet}_docs"].astype(np.int64)
+            stats.pairs[facet] = (arrays[f"{facet}_keys"].astype(np.int64), arrays[f"{facet}_counts"].astype(np.int64))
+        return stats
+
+
+def _write_atomic(path: Path, write):
+    # Write-then-rename so a crash never leaves a half-written state file
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def load_state(config=PIPELINE_CONFIG) -> tuple[TermStats, list[str]]:
+    state_dir = Path(config["keywords_state_dir"])
+    if not (state_dir / STATE_FILE).exists():
+        return TermStats(), []
+    vocab = Vocabulary.load(state_dir / VOCAB_FILE)
+    with np.load(state_dir / STATE_FILE) as arrays:
+        return TermStats.from_arrays(arrays, vocab), arrays["runs"].tolist()
+
+
+def save_state(stats: TermStats, runs: list[str], config=PIPELINE_CONFIG):
+    state_dir = Path(config["keywords_state_dir"])
+    state_dir.mkdir(parents=True, exist_ok=True)
+    # Vocabulary first: it only grows, so a crash between the two writes leaves
+    # an old state whose term ids are still valid
+    stats.vocab.save(state_dir / VOCAB_FILE)
+    arrays = stats.to_arrays()
+    _write_atomic(state_dir / STATE_FILE, lambda f: np.savez(f, runs=np.array(runs, dtype=str), **arrays))
+
+
+def commit_run(run_id: str, stats: TermStats, runs: list[str], rows_added: int,
+               config=PIPELINE_CONFIG, logger=None):
+    """
+    Persist `stats` (the loaded state plus this run's rows) unless run_id
+    was already merged.
+    """
+    if run_id in runs:
+        return
+    runs.append(run_id)
+    save_state(stats, runs, config)
+    if logger:
+        logger.info(
+            f"[KEYWORDS] run_id={run_id} rows={rows_added} docs_added={stats.added} "
+            f"docs_total={stats.docs} vocab={len(stats.vocab)}"
+        )
+
+
+def update_keywords(run_id: str, df: pd.DataFrame, config=PIPELINE_CONFIG, logger=None) -> TermStats:
+    """
+    Add a run's processed rows to the persisted keyword state, once per
+    run_id and once per review.
+    """
+    stats, runs = load_state(config)
+    if run_id not in runs:
+        stats.update_new(df)
+        commit_run(run_id, stats, runs, len(df), config=config, logger=logger)
+    return stats
+
+
+def rebuild_from_db(db_path: str, app_id: str | None = None, chunk_rows: int = 200_000) -> tuple[TermStats, list[str]]:
+    """
+    Fresh state over every stored review, streamed in chunks of chunk_rows.
+    Reviews count with their stored (latest) content, the incremental state
+    with the content of their first sighting, so the two differ where a
+    review's text, rating or app_version changed.
+    """
+    where, params = ("WHERE app_id = ?", (app_id,)) if app_id else ("", ())
+    stats = TermStats()
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(f"SELECT uid_key, review_text, rating, app_version, review_date FROM reviews {where}", params)
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            chunk = pd.DataFrame(rows, columns=["uid_key", "review_text", "rating", "app_version", "review_date"])
+            stats.update_new(chunk, keys=chunk["uid_key"].to_numpy(dtype=np.int64))
+        runs = [r[0] for r in conn.execute(f"SELECT DISTINCT run_id FROM reviews {where}", params) if r[0]]
+    finally:
+        conn.close()
+    return stats, runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distinctive review terms per rating / app_version / month")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tp = sub.add_parser("top", help="Print distinctive terms from the saved state")
+    tp.add_argument("--facet", choices=FACETS, default="rating")
+    tp.add_argument("--value", default=None, help="One group (default: every group of the facet)")
+    tp.add_argument("--method", choices=METHODS, default="log_odds")
+    tp.add_argument("--top", type=int, default=15)
+    tp.add_argument("--min-docs", type=int, default=5)
+    rb = sub.add_parser("rebuild", help="Recompute the state from every review in the DB")
+    rb.add_argument("--db", default=PIPELINE_CONFIG["db_path"])
+    rb.add_argument("--app-id", default=None)
+    rb.add_argument("--write", action="store_true", help="Replace the saved state with the rebuilt one")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        t0 = time.perf_counter()
+        stats, runs = rebuild_from_db(args.db, app_id=args.app_id)
+        print(f"docs={stats.docs} vocab={len(stats.vocab)} runs={len(runs)} in {time.perf_counter() - t0:.1f}s")
+        if args.write:
+            save_state(stats, runs)
+            print(f"Wrote {Path(PIPELINE_CONFIG['keywords_state_dir']) / STATE_FILE}")
+        return
+
+    stats, runs = load_state()
+    values = [args.value] if args.value else sorted(stats.groups[args.facet])
+    print(f"{stats.docs} docs from {len(runs)} runs, vocab={len(stats.vocab)}")
+    for value in values:
+        df = stats.distinctive_terms(args.facet, value, top=args.top, method=args.method, min_docs=args.min_docs)
+        print(f"\n{args.facet}={value} ({stats.group_docs[args.facet][stats.groups[args.facet][value]]} docs)")
+        print(", ".join(df["term"]) if not df.empty else "(no terms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Near-duplicate / template-spam detection for review text with MinHash + LSH.
+
+Texts are normalized (lowercase, punctuation -> space), cut into character
+k-gram shingles, and summarized by MinHash signatures (num_perm values per
+review, computed in bulk with NumPy, shingle batches of bounded size). LSH
+banding buckets reviews whose signatures agree on a whole band; only
+reviews sharing a bucket become candidate pairs, so no pairwise O(n^2) pass
+is made. Candidates are kept when their estimated Jaccard similarity
+reaches `threshold`, and connected components of the kept pairs form the
+clusters. Exact copies end up in the same cluster too.
+
+DB mode recomputes the clusters over all stored reviews and writes one
+`labels` row per clustered review (label_type="near_duplicate",
+label_source="minhash", label_value=cluster id):
+
+  python -m google_play_reviews.analysis.near_dupes --db path/to/reviews.db [--threshold 0.8]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline.db import connect
+
+LABEL_TYPE = "near_duplicate"
+LABEL_SOURCE = "minhash"
+
+SHINGLE_CHARS = 5
+NUM_PERM = 64
+BANDS = 16  # NUM_PERM / BANDS = 4 rows per band
+THRESHOLD = 0.8
+MIN_CHARS = 30  # shorter texts ("good app") repeat legitimately and are skipped
+BATCH_SHINGLES = 2_000_000
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def normalize_texts(texts: pd.Series) -> pd.Series:
+    return (
+        texts.fillna("").astype(str).str.lower()
+        .str.replace(r"[\W_]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _perm_params(num_perm: int, seed: int):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def _shingle_hashes(texts: list[str], k: int):
+    """
+    (doc index, 32-bit hash) for every character k-gram of every text, via
+    a rolling polynomial hash over the concatenated UTF-8 bytes.
+    """
+    encoded = [t.encode("utf-8") for t in texts]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    n_grams = len(buf) - k + 1
+    if n_grams <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+
+    h = np.zeros(n_grams, dtype=np.uint64)
+    for j in range(k):
+        h = h * np.uint64(1_000_003) + buf[j:j + n_grams]
+
+    ends = np.cumsum(lengths)
+    doc = np.repeat(np.arange(len(texts)), lengths)[:n_grams]
+    valid = np.arange(n_grams) + k <= ends[doc]
+    h = h[valid]
+    return doc[valid], (h ^ (h >> np.uint64(32))) & _MASK32
+
+
+def minhash_signatures(texts: list[str], num_perm: int = NUM_PERM, k: int = SHINGLE_CHARS,
+                       seed: int = 0, batch_shingles: int = BATCH_SHINGLES) -> np.ndarray:
+    """
+    uint32 MinHash signatures, shape (len(texts), num_perm). Every text must
+    have at least k characters. Docs are processed in batches of about
+    `batch_shingles` shingles to bound memory.
+    """
+    a, b = _perm_params(num_perm, seed)
+    sig = np.empty((len(texts), num_perm), dtype=np.uint32)
+    per_doc = np.fromiter((max(len(t) - k + 1, 1) for t in texts), dtype=np.int64, count=len(texts))
+    bounds = np.searchsorted(np.cumsum(per_doc), np.arange(batch_shingles, per_doc.sum(), batch_shingles))
+    starts = np.unique(np.concatenate([[0], bounds, [len(texts)]]))
+
+    for lo, hi in zip(starts[:-1], starts[1:]):
+        doc, x = _shingle_hashes(texts[lo:hi], k)
+        keys = np.unique((doc.astype(np.uint64) << np.uint64(32)) | x)
+        doc = (keys >> np.uint64(32)).astype(np.int64)
+        x = keys & _MASK32
+        firsts = np.flatnonzero(np.r_[True, doc[1:] != doc[:-1]])
+        rows = lo + doc[firsts]
+        # Multiply-shift hashing, one universal hash per signature column; a 1-D
+        # pass per column is several times faster than one (shingles x num_perm) block
+        for i in range(num_perm):
+            hashed = ((x * a[i] + b[i]) >> np.uint64(32)).astype(np.uint32)
+            sig[rows, i] = np.minimum.reduceat(hashed, firsts)
+    return sig
+
+
+def lsh_candidates(sig: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """
+    Candidate pairs (i, j), i < j, of rows sharing a bucket in any band.
+    Each bucket contributes a star around its first member rather than all
+    pairs, so a huge bucket of template spam stays linear.
+    """
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    pairs = []
+    for band in range(bands):
+        block = sig[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        key = np.zeros(n, dtype=np.uint64)
+        for col in range(rows):
+            key = (key * np.uint64(0x100000001B3)) ^ block[:, col]
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        new_group = np.r_[True, sorted_key[1:] != sorted_key[:-1]]
+        group_first = order[np.flatnonzero(new_group)][np.cumsum(new_group) - 1]
+        linked = group_first != order
+        if linked.any():
+            pairs.append(np.stack([group_first[linked], order[linked]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def estimated_jaccard(sig: np.ndarray, pairs: np.ndarray, chunk: int = 100_000) -> np.ndarray:
+    out = np.empty(len(pairs), dtype=float)
+    for lo in range(0, len(pairs), chunk):
+        p = pairs[lo:lo + chunk]
+        out[lo:lo + chunk] = (sig[p[:, 0]] == sig[p[:, 1]]).mean(axis=1)
+    return out
+
+
+def connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Component label (smallest member index) per node, by vectorized
+    hooking + pointer jumping.
+    """
+    labels = np.arange(n)
+    if len(pairs) == 0:
+        return labels
+    u, v = pairs[:, 0], pairs[:, 1]
+    while True:
+        lu, lv = labels[u], labels[v]
+        low = np.minimum(lu, lv)
+        new = labels.copy()
+        np.minimum.at(new, lu, low)
+        np.minimum.at(new, lv, low)
+        while True:
+            jumped = new[new]
+            if np.array_equal(jumped, new):
+                break
+            new = jumped
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def near_duplicate_clusters(texts: pd.Series, threshold: float = THRESHOLD, num_perm: int = NUM_PERM,
+                            bands: int = BANDS, min_chars: int = MIN_CHARS, seed: int = 0,
+                            stats: dict | None = None) -> pd.Series:
+    """
+    Cluster number per entry of `texts` (index preserved): members of the
+    same near-duplicate cluster share a number, everything else is -1.
+    `stats`, if given, is filled with counts and stage timings.
+    """
+    t0 = time.perf_counter()
+    norm = normalize_texts(texts)
+    eligible = np.flatnonzero(norm.str.len().to_numpy() >= max(min_chars, SHINGLE_CHARS))
+    docs = norm.iloc[eligible].tolist()
+
+    sig = minhash_signatures(docs, num_perm=num_perm, seed=seed)
+    t_sig = time.perf_counter()
+    pairs = lsh_candidates(sig, bands=bands)
+    t_lsh = time.perf_counter()
+    kept = pairs[estimated_jaccard(sig, pairs) >= threshold]
+    components = connected_components(len(docs), kept)
+    t_done = time.perf_counter()
+
+    sizes = np.bincount(components, minlength=len(docs))
+    clustered = sizes[components] > 1
+    # Renumber clusters 0..k-1 in order of their first member
+    _, cluster_no = np.unique(components[clustered], return_inverse=True)
+    out = np.full(len(texts), -1, dtype=np.int64)
+    out[eligible[clustered]] = cluster_no
+
+    if stats is not None:
+        stats.update({
+            "reviews": len(texts),
+            "eligible": len(docs),
+            "candidate_pairs": len(pairs),
+            "verified_pairs": len(kept),
+            "clusters": int(cluster_no.max() + 1) if len(cluster_no) else 0,
+            "clustered_reviews": int(clustered.sum()),
+            "signature_s": round(t_sig - t0, 3),
+            "lsh_s": round(t_lsh - t_sig, 3),
+            "verify_cluster_s": round(t_done - t_lsh, 3),
+        })
+    return pd.Series(out, index=texts.index)
+
+
+def label_near_duplicates(db_path: str, app_id: str | None = None, threshold: float = THRESHOLD,
+                          min_chars: int = MIN_CHARS, logger=None) -> dict:
+    """
+    Recompute clusters over the stored reviews (of `app_id`, or all) and
+    replace the near_duplicate labels. Cluster ids are "ndc_" + the first 16
+    chars of the smallest member uid, so they stay stable while the
+    membership does. Returns the stats dict.
+    """
+    where, params = ("WHERE app_id = ?", (app_id,)) if app_id else ("", ())
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT review_uid, review_text FROM reviews {where}", params).fetchall()
+        df = pd.DataFrame(rows, columns=["review_uid", "review_text"])
+        stats = {}
+        clusters = near_duplicate_clusters(df["review_text"], threshold=threshold, min_chars=min_chars, stats=stats)
+
+        members = df.loc[clusters >= 0, ["review_uid"]].assign(cluster=clusters[clusters >= 0])
+        cluster_ids = members.groupby("cluster")["review_uid"].transform("min").str[:16]
+
+        with conn:
+            scope = "AND review_id IN (SELECT review_uid FROM reviews WHERE app_id = ?)" if app_id else ""
+            conn.execute(
+                f"DELETE FROM labels WHERE label_type = ? AND label_source = ? {scope}",
+                (LABEL_TYPE, LABEL_SOURCE) + params,
+            )
+            conn.executemany(
+                """
+                INSERT INTO labels (label_id, review_id, label_type, label_value, label_source)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    (f"{LABEL_TYPE}:{LABEL_SOURCE}:{uid}", uid, LABEL_TYPE, f"ndc_{cid}", LABEL_SOURCE)
+                    for uid, cid in zip(members["review_uid"].tolist(), cluster_ids.tolist())
+                ),
+            )
+    finally:
+        conn.close()
+
+    if logger:
+        logger.info(f"[NEAR_DUPES] {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Label near-duplicate review clusters (MinHash + LSH)")
+    parser.add_argument("--db", required=True, help="Path to the reviews SQLite DB")
+    parser.add_argument("--app-id", default=None, help="Only this app")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Min estimated Jaccard similarity")
+    parser.add_argument("--min-chars", type=int, default=MIN_CHARS, help="Skip shorter (normalized) texts")
+    args = parser.parse_args()
+
+    stats = label_near_duplicates(args.db, app_id=args.app_id, threshold=args.threshold, min_chars=args.min_chars)
+    for k, v in stats.items():
+        print(f"{k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
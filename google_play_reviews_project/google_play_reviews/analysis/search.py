@@ -0,0 +1,143 @@
+"""
+Full-text search over stored reviews, backed by the reviews_fts FTS5 index
+(see schema/migrations/0006_review_text_fts.sql).
+
+Queries use FTS5 syntax: words are ANDed, "voice mode" is a phrase,
+log* a prefix, and OR / NOT / NEAR(...) combine terms. Words are
+porter-stemmed, so crash also matches crashes / crashing. Results are
+ranked by BM25 (best first) and paginated with limit / offset.
+
+  python -m google_play_reviews.analysis.search --db path/to/reviews.db "login*" --app-id com.openai.chatgpt --max-rating 2
+  python -m google_play_reviews.analysis.search --db path/to/reviews.db "voice mode" --phrase --start 2025-01-01
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+from ..pipeline.db import connect
+
+RESULT_COLS = ["review_uid", "app_id", "rating", "review_date", "score", "snippet", "review_text"]
+
+
+def quote_phrase(text: str) -> str:
+    """
+    FTS5 phrase for literal user text (quotes escaped, operators disabled).
+    """
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _filters(app_id=None, min_rating=None, max_rating=None, start=None, end=None):
+    where, params = [], []
+    if app_id is not None:
+        where.append("r.app_id = ?")
+        params.append(app_id)
+    if min_rating is not None:
+        where.append("r.rating >= ?")
+        params.append(min_rating)
+    if max_rating is not None:
+        where.append("r.rating <= ?")
+        params.append(max_rating)
+    if start is not None:
+        where.append("r.review_date >= ?")
+        params.append(str(start))
+    if end is not None:
+        # Inclusive end date: everything before the following day
+        where.append("r.review_date < date(?, '+1 day')")
+        params.append(str(end))
+    return "".join(f" AND {w}" for w in where), params
+
+
+# CROSS JOIN pins reviews_fts as the outer loop: the planner otherwise may walk
+# reviews by its app_id index and probe the FTS index once per row
+
+def search_reviews(db_path: str, query: str, app_id: str | None = None,
+                   min_rating: int | None = None, max_rating: int | None = None,
+                   start: str | None = None, end: str | None = None,
+                   limit: int = 20, offset: int = 0) -> pd.DataFrame:
+    """
+    Reviews matching the FTS5 `query`, filtered by app / rating range /
+    review_date range (start, end inclusive, "YYYY-MM-DD"), best BM25 first.
+    `score` is bm25() (lower is better); `snippet` marks hits with [ ].
+    """
+    where, params = _filters(app_id, min_rating, max_rating, start, end)
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT r.review_uid, r.app_id, r.rating, r.review_date,
+                   bm25(reviews_fts) AS score,
+                   snippet(reviews_fts, 0, '[', ']', '...', 12),
+                   r.review_text
+            FROM reviews_fts
+            CROSS JOIN reviews r ON r.review_rowid = reviews_fts.rowid
+            WHERE reviews_fts MATCH ?{where}
+            ORDER BY score
+            LIMIT ? OFFSET ?
+            """,
+            [query] + params + [limit, offset],
+        ).fetchall()
+    finally:
+        conn.close()
+    return pd.DataFrame(rows, columns=RESULT_COLS)
+
+
+def count_matches(db_path: str, query: str, app_id: str | None = None,
+                  min_rating: int | None = None, max_rating: int | None = None,
+                  start: str | None = None, end: str | None = None) -> int:
+    """
+    Total number of reviews search_reviews would page through.
+    """
+    where, params = _filters(app_id, min_rating, max_rating, start, end)
+    # Without filters the FTS index alone answers the count
+    join = "CROSS JOIN reviews r ON r.review_rowid = reviews_fts.rowid" if where else ""
+    conn = connect(db_path)
+    try:
+        return conn.execute(
+            f"""
+            SELECT COUNT(*)
+            FROM reviews_fts
+            {join}
+            WHERE reviews_fts MATCH ?{where}
+            """,
+            [query] + params,
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over stored reviews")
+    parser.add_argument("query", help='FTS5 query, e.g. login*, "voice mode", crash OR freeze')
+    parser.add_argument("--db", required=True, help="Path to the reviews SQLite DB")
+    parser.add_argument("--phrase", action="store_true", help="Treat the query as one literal phrase")
+    parser.add_argument("--prefix", action="store_true", help="Match the query as a prefix (adds *)")
+    parser.add_argument("--app-id", default=None)
+    parser.add_argument("--min-rating", type=int, default=None)
+    parser.add_argument("--max-rating", type=int, default=None)
+    parser.add_argument("--start", default=None, help="First review_date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="Last review_date (YYYY-MM-DD, inclusive)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--page", type=int, default=1, help="1-based result page of --limit rows")
+    args = parser.parse_args()
+
+    query = quote_phrase(args.query) if args.phrase else args.query
+    if args.prefix:
+        query += "*"
+    filters = dict(app_id=args.app_id, min_rating=args.min_rating, max_rating=args.max_rating,
+                   start=args.start, end=args.end)
+
+    t0 = time.perf_counter()
+    df = search_reviews(args.db, query, limit=args.limit, offset=(args.page - 1) * args.limit, **filters)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    total = count_matches(args.db, query, **filters)
+
+    with pd.option_context("display.max_colwidth", 80):
+        print(df.drop(columns=["review_text"]).to_string(index=False))
+    print(f"\npage {args.page}: {len(df)} of {total} matches in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
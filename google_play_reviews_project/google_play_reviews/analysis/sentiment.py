@@ -0,0 +1,176 @@
+"""
+Shared sentiment scoring for review text.
+
+Polarity comes from TextBlob, but each distinct text is scored once: texts
+are deduplicated per batch and memoized across batches by content hash
+(short reviews like "good app" repeat a lot). Large batches can be spread
+over a process pool. One threshold policy maps polarity to
+positive / neutral / negative.
+
+DB mode writes the labels as `labels` rows (label_type="sentiment",
+label_source="heuristic") and only scores reviews that have no such label yet:
+
+  python -m google_play_reviews.analysis.sentiment --db path/to/reviews.db [--workers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+try:
+    from textblob import TextBlob
+except ImportError:
+    TextBlob = None
+
+from ..pipeline.db import connect
+
+LABEL_TYPE = "sentiment"
+LABEL_SOURCE = "heuristic"
+
+# Polarity > positive -> "positive", < negative -> "negative", else "neutral"
+SENTIMENT_THRESHOLDS = {"positive": 0.1, "negative": -0.1}
+
+MEMO_MAX_ENTRIES = 1_000_000
+PARALLEL_MIN_TEXTS = 5_000
+
+_MEMO: dict[bytes, float] = {}
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def polarity(text: str) -> float:
+    if not text:
+        return 0.0
+    if TextBlob is None:
+        raise ImportError("Sentiment scoring requires textblob (pip install textblob)")
+    return float(TextBlob(text).sentiment.polarity)
+
+
+def _polarity_many(texts: list[str]) -> list[float]:
+    return [polarity(t) for t in texts]
+
+
+def score_texts(texts: pd.Series, workers: int = 1) -> pd.Series:
+    """
+    Polarity for every entry of `texts` (NaN/blank -> 0.0), index preserved.
+    Only texts not already in the memo cache are passed to TextBlob.
+    """
+    norm = texts.fillna("").astype(str).str.strip()
+    codes, uniques = pd.factorize(norm, sort=False)
+
+    keys = [text_key(t) for t in uniques]
+    todo = [i for i, k in enumerate(keys) if k not in _MEMO]
+
+    if todo:
+        pending = [uniques[i] for i in todo]
+        if workers > 1 and len(pending) >= PARALLEL_MIN_TEXTS:
+            chunks = np.array_split(np.array(pending, dtype=object), workers * 4)
+            with Pool(workers) as pool:
+                scored = [s for part in pool.map(_polarity_many, [list(c) for c in chunks]) for s in part]
+        else:
+            scored = _polarity_many(pending)
+
+        if len(_MEMO) + len(todo) > MEMO_MAX_ENTRIES:
+            _MEMO.clear()
+        for i, s in zip(todo, scored):
+            _MEMO[keys[i]] = s
+
+    unique_scores = np.array([_MEMO[k] for k in keys], dtype=float)
+    return pd.Series(unique_scores[codes], index=texts.index, dtype=float)
+
+
+def label_polarity(scores: pd.Series, thresholds: dict | None = None) -> pd.Series:
+    t = thresholds or SENTIMENT_THRESHOLDS
+    labels = np.select(
+        [scores > t["positive"], scores < t["negative"]],
+        ["positive", "negative"],
+        default="neutral",
+    )
+    return pd.Series(labels, index=scores.index)
+
+
+def add_sentiment(df: pd.DataFrame, text_col: str = "review_text", workers: int = 1,
+                  thresholds: dict | None = None) -> pd.DataFrame:
+    df = df.copy()
+    df["sentiment_polarity"] = score_texts(df[text_col], workers=workers)
+    df["sentiment"] = label_polarity(df["sentiment_polarity"], thresholds)
+    return df
+
+
+def label_reviews(db_path: str, app_id: str | None = None, workers: int = 1,
+                  thresholds: dict | None = None, chunk_rows: int = 50_000, logger=None) -> int:
+    """
+    Score reviews without a heuristic sentiment label, `chunk_rows` at a
+    time, and insert the labels. Returns the number of labels written.
+    """
+    where = "WHERE r.app_id = ?" if app_id else "WHERE 1"
+    params = (app_id,) if app_id else ()
+    total = 0
+
+    conn = connect(db_path)
+    try:
+        while True:
+            rows = conn.execute(
+                f"""
+                SELECT r.review_uid, r.review_text
+                FROM reviews r
+                {where} AND NOT EXISTS (
+                    SELECT 1 FROM labels l
+                    WHERE l.label_type = ? AND l.label_source = ? AND l.review_id = r.review_uid
+                )
+                LIMIT ?
+                """,
+                params + (LABEL_TYPE, LABEL_SOURCE, chunk_rows),
+            ).fetchall()
+            if not rows:
+                break
+
+            uids = [r[0] for r in rows]
+            labels = label_polarity(score_texts(pd.Series([r[1] for r in rows]), workers=workers), thresholds)
+
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO labels (label_id, review_id, label_type, label_value, label_source)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (
+                        (f"{LABEL_TYPE}:{LABEL_SOURCE}:{uid}", uid, LABEL_TYPE, value, LABEL_SOURCE)
+                        for uid, value in zip(uids, labels.tolist())
+                    ),
+                )
+            total += len(rows)
+            if logger:
+                logger.info(f"[SENTIMENT] labeled={total}")
+    finally:
+        conn.close()
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write heuristic sentiment labels for unlabeled reviews")
+    parser.add_argument("--db", required=True, help="Path to the reviews SQLite DB")
+    parser.add_argument("--app-id", default=None, help="Only label this app")
+    parser.add_argument("--workers", type=int, default=1, help="Scoring processes")
+    parser.add_argument("--positive", type=float, default=SENTIMENT_THRESHOLDS["positive"])
+    parser.add_argument("--negative", type=float, default=SENTIMENT_THRESHOLDS["negative"])
+    args = parser.parse_args()
+
+    n = label_reviews(
+        args.db,
+        app_id=args.app_id,
+        workers=args.workers,
+        thresholds={"positive": args.positive, "negative": args.negative},
+    )
+    print(f"Labeled {n} reviews")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Mergeable, bounded-size accumulators for chunked / parallel / incremental EDA.
+
+Every accumulator supports update (a chunk of values), merge (another
+accumulator of the same kind) and to_dict / from_dict (JSON-safe state),
+and merge is associative, so partial results can be combined in any grouping.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    Count / mean / variance (Welford, merged with Chan et al.'s pairwise
+    update) plus min / max over the non-NaN values seen.
+    """
+
+    def __init__(self, n=0, mean=0.0, m2=0.0, min=None, max=None):
+        self.n = int(n)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+        self.min = min
+        self.max = max
+
+    def update(self, values) -> "RunningStats":
+        x = np.asarray(values, dtype=float)
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return self
+        chunk = RunningStats(
+            n=len(x),
+            mean=float(x.mean()),
+            m2=float(((x - x.mean()) ** 2).sum()),
+            min=float(x.min()),
+            max=float(x.max()),
+        )
+        return self.merge(chunk)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2, self.min, self.max = other.n, other.mean, other.m2, other.min, other.max
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def std(self, ddof=1):
+        if self.n <= ddof:
+            return 0.0
+        return math.sqrt(self.m2 / (self.n - ddof))
+
+    def to_dict(self):
+        return {"n": self.n, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty 2016). Keeps O(k log(n/k))
+    values; rank error is roughly 1.7/k of n (k=200 -> under 1%).
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = int(k)
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _size(self):
+        return sum(len(lv) for lv in self.levels)
+
+    def _max_size(self):
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self):
+        while self._size() > self._max_size():
+            for h in range(len(self.levels)):
+                if len(self.levels[h]) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append(np.empty(0))
+                    items = np.sort(self.levels[h])
+                    keep = items[-1:] if len(items) % 2 else items[:0]
+                    pairs = items[:len(items) - len(keep)]
+                    promoted = pairs[int(self._rng.integers(2))::2]
+                    self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                    self.levels[h] = keep
+                    break
+
+    def update(self, values) -> "KLLSketch":
+        x = np.asarray(values, dtype=float)
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return self
+        self.levels[0] = np.concatenate([self.levels[0], x])
+        self.n += len(x)
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, lv in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], lv])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        if self.n == 0:
+            return None
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** h) for h, lv in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, last_rank = values[order], np.cumsum(weights[order]) - 1
+
+        def _at(rank):
+            return values[min(int(np.searchsorted(last_rank, rank, side="left")), len(values) - 1)]
+
+        # Linear interpolation between neighbouring ranks, like pandas' default
+        pos = q * last_rank[-1]
+        lo = math.floor(pos)
+        return float(_at(lo) + (pos - lo) * (_at(lo + 1) - _at(lo)))
+
+    def to_dict(self):
+        return {"k": self.k, "n": self.n, "levels": [lv.tolist() for lv in self.levels]}
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(k=d["k"])
+        sketch.n = d["n"]
+        sketch.levels = [np.asarray(lv, dtype=float) for lv in d["levels"]]
+        return sketch
@@ -0,0 +1,129 @@
+"""
+Rating / volume series read straight from the rollup tables (see
+pipeline/rollups.py) instead of grouping raw reviews.
+
+  python -m google_play_reviews.analysis.timeseries --db path/to/reviews.db --app-id com.openai.chatgpt --grain month
+  python -m google_play_reviews.analysis.timeseries --db path/to/reviews.db --app-id com.openai.chatgpt --verify
+
+--verify recomputes every rollup with GROUP BY over reviews and reports
+any mismatch.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+from ..pipeline.db import connect
+from ..pipeline.rollups import ROLLUPS, VALUE_COLS
+
+GRAINS = {"day": "rollup_daily", "month": "rollup_monthly", "version": "rollup_version"}
+
+_RATED = " + ".join(f"rating_{k}" for k in range(1, 6))
+
+
+def rating_series(db_path: str, app_id: str, grain: str = "month",
+                  start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    One row per day / month / app_version of `app_id`: reviews, avg_rating
+    (over rated reviews), rating_1..rating_5 and thumbs_up_sum. start / end
+    are inclusive key bounds ("2024-01" for months, "2024-01-31" for days).
+    A primary-key range read on the rollup table.
+    """
+    if grain not in GRAINS:
+        raise ValueError(f"Unknown grain {grain!r}; expected one of {list(GRAINS)}")
+    table = GRAINS[grain]
+    key = ROLLUPS[table][0]
+
+    where, params = ["app_id = ?"], [app_id]
+    if start is not None:
+        where.append(f"{key} >= ?")
+        params.append(start)
+    if end is not None:
+        where.append(f"{key} <= ?")
+        params.append(end)
+
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT {key}, reviews,
+                   CAST(rating_sum AS REAL) / NULLIF({_RATED}, 0) AS avg_rating,
+                   rating_1, rating_2, rating_3, rating_4, rating_5, thumbs_up_sum
+            FROM {table}
+            WHERE {" AND ".join(where)} AND reviews > 0
+            ORDER BY {key}
+            """,
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+
+    cols = [key, "reviews", "avg_rating"] + [f"rating_{k}" for k in range(1, 6)] + ["thumbs_up_sum"]
+    df = pd.DataFrame(rows, columns=cols)
+    if grain == "version":
+        df["app_version"] = df["app_version"].replace("", None)
+    return df
+
+
+def verify_rollups(db_path: str, app_id: str | None = None) -> list[str]:
+    """
+    Differences between each rollup table and the same aggregate computed
+    from reviews (empty list = consistent).
+    """
+    diffs = []
+    conn = connect(db_path)
+    try:
+        for table, (key, expr) in ROLLUPS.items():
+            where, params = ("WHERE app_id = ?", (app_id,)) if app_id else ("", ())
+            stored = pd.read_sql_query(
+                f"SELECT app_id, {key}, {', '.join(VALUE_COLS)} FROM {table} {where}", conn, params=params
+            )
+            stored = stored[stored["reviews"] != 0]
+            fresh = pd.read_sql_query(
+                f"""
+                SELECT app_id, {expr} AS {key}, COUNT(*) AS reviews,
+                       SUM(COALESCE(rating, 0)) AS rating_sum,
+                       {", ".join(f"SUM(COALESCE(rating, 0) = {k}) AS rating_{k}" for k in range(1, 6))},
+                       SUM(COALESCE(thumbs_up, 0)) AS thumbs_up_sum
+                FROM reviews
+                {where + (" AND" if where else "WHERE")} {expr} IS NOT NULL
+                GROUP BY 1, 2
+                """,
+                conn,
+                params=params,
+            )
+            merged = stored.merge(fresh, on=["app_id", key], how="outer", suffixes=("", "_fresh"), indicator=True)
+            for _, row in merged.iterrows():
+                if row["_merge"] != "both" or any(row[c] != row[f"{c}_fresh"] for c in VALUE_COLS):
+                    diffs.append(f"{table} {row['app_id']} {row[key]}: {row['_merge']}")
+    finally:
+        conn.close()
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rating series from the review rollup tables")
+    parser.add_argument("--db", required=True, help="Path to the reviews SQLite DB")
+    parser.add_argument("--app-id", required=True)
+    parser.add_argument("--grain", choices=list(GRAINS), default="month")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--verify", action="store_true", help="Check rollups against a GROUP BY over reviews")
+    args = parser.parse_args()
+
+    if args.verify:
+        diffs = verify_rollups(args.db, app_id=args.app_id)
+        print("Rollups match reviews" if not diffs else "Differences:\n- " + "\n- ".join(diffs[:50]))
+        raise SystemExit(1 if diffs else 0)
+
+    t0 = time.perf_counter()
+    df = rating_series(args.db, args.app_id, grain=args.grain, start=args.start, end=args.end)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    print(df.to_string(index=False))
+    print(f"\n{len(df)} rows in {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Per-app_version regression alerts, read from the rollup_version table (see
+pipeline/rollups.py), which upserts keep current with +1/-1 deltas per
+stored review. Evaluating never rescans reviews: it reads one rollup row
+per version, so its cost follows the number of versions, and the work per
+run stays proportional to the reviews that run loaded.
+
+Versions are ordered by their numeric parts ("1.2025.105" < "1.2025.112").
+Each version with at least `min_reviews` rated reviews is compared with the
+pooled `baseline_versions` versions before it:
+
+- low_star_share: share of 1-2 star ratings, one-sided two-proportion
+  z-test (pooled variance), plus prob_worse = P(p_version > p_baseline)
+  under Beta(1 + x, 1 + n - x) posteriors (normal approximation).
+- mean_rating_drop: one-sided z-test on mean rating, variances taken from
+  the rating_1..rating_5 counts.
+
+An alert needs z >= z_threshold and an effect of at least min_lift (share)
+or min_drop (stars). After each run_pipeline, version_alerts_{run_id}.json
+and version_alerts_latest.json are written to version_alerts_dir;
+new_alerts lists those not in the previous latest report.
+
+  python -m google_play_reviews.analysis.version_alerts --db path/to/reviews.db --app-id com.openai.chatgpt
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline.config import PIPELINE_CONFIG
+from ..pipeline.db import connect
+
+LATEST_FILE = "version_alerts_latest.json"
+
+DEFAULT_PARAMS = {
+    "baseline_versions": 3,
+    "min_reviews": 50,
+    "min_baseline_reviews": 200,
+    "z_threshold": 3.0,   # one-sided p ~ 0.0013, leaves room for testing many versions
+    "min_lift": 0.05,     # low-star share, absolute
+    "min_drop": 0.25,     # mean rating, stars
+}
+
+_RATINGS = np.arange(1, 6)
+
+
+def version_key(version: str) -> tuple:
+    """
+    Sort key comparing the numeric parts of a version string numerically.
+    """
+    return tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in re.findall(r"\d+|[^\d.]+", version))
+
+
+def load_version_counts(db_path: str, app_id: str) -> pd.DataFrame:
+    """
+    One row per app_version of `app_id` (in version order) with
+    rating_1..rating_5 counts, from rollup_version.
+    """
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT app_version, rating_1, rating_2, rating_3, rating_4, rating_5
+            FROM rollup_version
+            WHERE app_id = ? AND app_version != '' AND reviews > 0
+            """,
+            (app_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+    df = pd.DataFrame(rows, columns=["app_version"] + [f"rating_{k}" for k in _RATINGS])
+    order = sorted(range(len(df)), key=lambda i: version_key(df["app_version"].iat[i]))
+    return df.iloc[order].reset_index(drop=True)
+
+
+def _one_sided_p(z: np.ndarray) -> np.ndarray:
+    return np.array([0.5 * math.erfc(v / math.sqrt(2)) if np.isfinite(v) else np.nan for v in z])
+
+
+def evaluate_versions(counts: pd.DataFrame, params: dict | None = None) -> pd.DataFrame:
+    """
+    Test statistics per version against its pooled preceding versions;
+    `counts` as returned by load_version_counts.
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    k = p["baseline_versions"]
+    hist = counts[[f"rating_{r}" for r in _RATINGS]].to_numpy(dtype=float)
+    # Baseline = sum of the previous k versions' rating histograms
+    cum = np.vstack([np.zeros((1, 5)), np.cumsum(hist, axis=0)])
+    idx = np.arange(len(hist))
+    base = cum[idx] - cum[np.maximum(idx - k, 0)]
+
+    def moments(h):
+        n = h.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            low = (h[:, 0] + h[:, 1]) / n
+            mean = (h @ _RATINGS) / n
+            var = (h @ _RATINGS ** 2) / n - mean ** 2
+        return n, low, mean, var
+
+    n_new, low_new, mean_new, var_new = moments(hist)
+    n_base, low_base, mean_base, var_base = moments(base)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pooled = (low_new * n_new + low_base * n_base) / (n_new + n_base)
+        z_low = (low_new - low_base) / np.sqrt(pooled * (1 - pooled) * (1 / n_new + 1 / n_base))
+        z_mean = (mean_base - mean_new) / np.sqrt(var_new / n_new + var_base / n_base)
+
+        # Beta(1 + x, 1 + n - x) posterior mean / variance per side
+        def beta(share, n):
+            a, b = 1 + share * n, 1 + (1 - share) * n
+            return a / (a + b), a * b / ((a + b) ** 2 * (a + b + 1))
+
+        m_new, v_new = beta(low_new, n_new)
+        m_base, v_base = beta(low_base, n_base)
+        prob_worse = 1 - _one_sided_p((m_new - m_base) / np.sqrt(v_new + v_base))
+
+    out = pd.DataFrame({
+        "app_version": counts["app_version"],
+        "baseline": [counts["app_version"].iloc[max(i - k, 0):i].tolist() for i in idx],
+        "n": n_new.astype(np.int64),
+        "n_baseline": n_base.astype(np.int64),
+        "low_star_share": low_new,
+        "low_star_share_baseline": low_base,
+        "z_low_star": z_low,
+        "p_low_star": _one_sided_p(z_low),
+        "prob_worse": prob_worse,
+        "mean_rating": mean_new,
+        "mean_rating_baseline": mean_base,
+        "z_mean_drop": z_mean,
+        "p_mean_drop": _one_sided_p(z_mean),
+    })
+    testable = (out["n"] >= p["min_reviews"]) & (out["n_baseline"] >= p["min_baseline_reviews"])
+    return out[testable].reset_index(drop=True)
+
+
+def find_alerts(evaluations: pd.DataFrame, params: dict | None = None) -> list[dict]:
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    alerts = []
+    for row in evaluations.to_dict("records"):
+        lift = row["low_star_share"] - row["low_star_share_baseline"]
+        if row["z_low_star"] >= p["z_threshold"] and lift >= p["min_lift"]:
+            alerts.append({
+                "app_version": row["app_version"], "kind": "low_star_share",
+                "value": row["low_star_share"], "baseline_value": row["low_star_share_baseline"],
+                "effect": lift, "z": row["z_low_star"], "p_value": row["p_low_star"],
+                "prob_worse": row["prob_worse"], "n": row["n"], "n_baseline": row["n_baseline"],
+                "baseline_versions": row["baseline"],
+            })
+        drop = row["mean_rating_baseline"] - row["mean_rating"]
+        if row["z_mean_drop"] >= p["z_threshold"] and drop >= p["min_drop"]:
+            alerts.append({
+                "app_version": row["app_version"], "kind": "mean_rating_drop",
+                "value": row["mean_rating"], "baseline_value": row["mean_rating_baseline"],
+                "effect": drop, "z": row["z_mean_drop"], "p_value": row["p_mean_drop"],
+                "n": row["n"], "n_baseline": row["n_baseline"],
+                "baseline_versions": row["baseline"],
+            })
+    return alerts
+
+
+def _json_safe(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (np.integer, np.floating)):
+        return _json_safe(value.item())
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def _write_json(path: Path, payload: dict):
+    # Write-then-rename so readers never see a half-written report
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(_json_safe(payload), indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_report(db_path: str, app_id: str, run_id: str | None = None, params: dict | None = None,
+                 previous: dict | None = None) -> dict:
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    evaluations = evaluate_versions(load_version_counts(db_path, app_id), p)
+    alerts = find_alerts(evaluations, p)
+    seen = {(a["app_version"], a["kind"]) for a in (previous or {}).get("alerts", [])}
+    return {
+        "run_id": run_id,
+        "app_id": app_id,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "params": p,
+        "versions_evaluated": len(evaluations),
+        "alerts": alerts,
+        "new_alerts": [a for a in alerts if (a["app_version"], a["kind"]) not in seen],
+        "evaluations": evaluations.to_dict("records"),
+    }
+
+
+def update_alerts(run_id: str, config=PIPELINE_CONFIG, logger=None) -> dict:
+    """
+    Evaluate config["app_id"]'s versions after a run and write
+    version_alerts_{run_id}.json plus version_alerts_latest.json.
+    """
+    outdir = Path(config["version_alerts_dir"])
+    outdir.mkdir(parents=True, exist_ok=True)
+    latest = outdir / LATEST_FILE
+    previous = json.loads(latest.read_text(encoding="utf-8")) if latest.exists() else None
+    if previous is not None and previous.get("app_id") != config["app_id"]:
+        previous = None
+
+    report = build_report(config["db_path"], config["app_id"], run_id=run_id,
+                          params=config.get("version_alert_params"), previous=previous)
+    _write_json(outdir / f"version_alerts_{run_id}.json", report)
+    _write_json(latest, report)
+
+    if logger:
+        logger.info(
+            f"[VERSION_ALERTS] versions={report['versions_evaluated']} alerts={len(report['alerts'])} "
+            f"new={[(a['app_version'], a['kind']) for a in report['new_alerts']]}"
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-app_version rating regression alerts")
+    parser.add_argument("--db", default=PIPELINE_CONFIG["db_path"], help="Path to the reviews SQLite DB")
+    parser.add_argument("--app-id", default=PIPELINE_CONFIG["app_id"])
+    parser.add_argument("--z", type=float, default=DEFAULT_PARAMS["z_threshold"], help="Min one-sided z-score")
+    parser.add_argument("--baseline-versions", type=int, default=DEFAULT_PARAMS["baseline_versions"])
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    report = build_report(args.db, args.app_id,
+                          params={"z_threshold": args.z, "baseline_versions": args.baseline_versions})
+    if args.json:
+        print(json.dumps(_json_safe(report), indent=2))
+        return
+    print(f"{report['versions_evaluated']} versions evaluated, {len(report['alerts'])} alerts")
+    for a in report["alerts"]:
+        print(f"- {a['app_version']} {a['kind']}: {a['value']:.3f} vs {a['baseline_value']:.3f} "
+              f"(z={a['z']:.1f}, n={a['n']}, baseline {', '.join(a['baseline_versions'])})")
+
+
+if __name__ == "__main__":
+    main()
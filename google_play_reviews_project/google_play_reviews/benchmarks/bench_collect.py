@@ -0,0 +1,96 @@
+"""
+Row building in collect_reviews: per-row dicts (original) vs column-wise
+pages (scraper.page_frame), over a fake stream of review pages.
+
+  python -m google_play_reviews.benchmarks.bench_collect --reviews 1000000
+
+Reports build throughput (no tracing) and peak traced memory / final
+DataFrame size (with tracemalloc).
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline.scraper import PAGE_SOURCE_FIELDS, make_review_uid, page_frame
+from ..pipeline.uids import page_uids
+from .fake_play import FakePlayStore
+
+PAGE_SIZE = 200
+
+
+def fake_pages(total, distinct_pages=50):
+    # Cycle a fixed set of fake pages so the stream itself costs no memory
+    fake = FakePlayStore(reviews_per_app=distinct_pages * PAGE_SIZE, latency_sec=0)
+    pages = [
+        [fake.make_review("com.example.app", p * PAGE_SIZE + i) for i in range(PAGE_SIZE)]
+        for p in range(distinct_pages)
+    ]
+    for n in range(total // PAGE_SIZE):
+        yield pages[n % distinct_pages]
+
+
+def build_dict_rows(pages):
+    all_rows = []
+    for result in pages:
+        for r in result:
+            all_rows.append({
+                "review_uid": make_review_uid(r.get("userName"), r.get("at"), r.get("content")),
+                "user_name": r.get("userName"),
+                "rating": r.get("score"),
+                "review_text": r.get("content"),
+                "review_date": r.get("at"),
+                "thumbs_up": r.get("thumbsUpCount"),
+                "app_version": r.get("reviewCreatedVersion"),
+                "sort_mode": "newest",
+                "scrape_time": datetime.utcnow(),
+            })
+    return pd.DataFrame(all_rows)
+
+
+def build_column_pages(pages):
+    # Mirrors collect_reviews: extend column lists per page, one typed frame at the end
+    columns = {c: [] for c in ["review_uid", *PAGE_SOURCE_FIELDS]}
+    page_times, page_sizes = [], []
+    for result in pages:
+        columns["review_uid"].extend(page_uids(result))
+        for c, k in PAGE_SOURCE_FIELDS.items():
+            columns[c].extend(r.get(k) for r in result)
+        page_times.append(np.datetime64(datetime.utcnow(), "ns"))
+        page_sizes.append(len(result))
+    return page_frame(columns, "newest", np.repeat(np.array(page_times), page_sizes))
+
+
+BUILDERS = {
+    "dict_rows": build_dict_rows,
+    "column_pages": build_column_pages,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compact page representation")
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"reviews={args.reviews}")
+    print(f"{'builder':<14}{'reviews/s':>12}{'peak_mb':>10}{'df_mb':>9}")
+    for name, build in BUILDERS.items():
+        t0 = time.perf_counter()
+        build(fake_pages(args.reviews))
+        rate = args.reviews / (time.perf_counter() - t0)
+
+        tracemalloc.start()
+        df = build(fake_pages(args.reviews))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        df_mb = df.memory_usage(deep=True).sum() / 1e6
+        del df
+
+        print(f"{name:<14}{rate:>12,.0f}{peak / 1e6:>10.1f}{df_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
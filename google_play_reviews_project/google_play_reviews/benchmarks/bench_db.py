@@ -0,0 +1,112 @@
+"""
+Rows/sec of db.upsert_reviews vs the original implementation, into a fresh DB
+and as a full re-upsert. "pipeline" is the configuration run_pipeline loads
+with (change detection, rollups and FTS); the others switch those off one at
+a time to show what each costs on top of the bare staging merge.
+
+  python -m google_play_reviews.benchmarks.bench_db --sizes 10000 100000 1000000
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from ..pipeline import db
+from .bench_storage import make_frame
+
+# Baseline-schema review columns and conflict clause (before later migrations)
+LEGACY_REVIEW_COLS = [
+    "review_uid", "app_id", "user_name", "rating",
+    "review_text", "review_date", "thumbs_up",
+    "app_version", "sort_mode", "scrape_time", "run_id"
+]
+
+LEGACY_CONFLICT_SQL = """
+ON CONFLICT(review_uid) DO UPDATE SET
+    rating=excluded.rating,
+    review_text=excluded.review_text,
+    review_date=excluded.review_date,
+    thumbs_up=excluded.thumbs_up,
+    app_version=excluded.app_version,
+    sort_mode=excluded.sort_mode,
+    scrape_time=excluded.scrape_time,
+    run_id=excluded.run_id
+"""
+
+
+def legacy_upsert_reviews(df, db_path, app_id, run_id):
+    # Original implementation: schema script per call, object-dtype copies, one big list
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+
+    df = df.copy()
+    df["app_id"] = app_id
+    df["run_id"] = run_id
+    df["rating"] = pd.to_numeric(df["rating"], errors="coerce").astype("Int64")
+    df["thumbs_up"] = pd.to_numeric(df["thumbs_up"], errors="coerce").astype("Int64")
+    df["rating"] = df["rating"].astype(object).where(df["rating"].notna(), None)
+    df["thumbs_up"] = df["thumbs_up"].astype(object).where(df["thumbs_up"].notna(), None)
+    for col in ["review_date", "scrape_time"]:
+        df[col] = pd.to_datetime(df[col], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT OR IGNORE INTO apps(app_id) VALUES (?)", (app_id,))
+        rows = df[LEGACY_REVIEW_COLS].to_records(index=False)
+        conn.executemany(
+            f"INSERT INTO reviews ({', '.join(LEGACY_REVIEW_COLS)}) "
+            f"VALUES ({', '.join('?' for _ in LEGACY_REVIEW_COLS)}) " + LEGACY_CONFLICT_SQL,
+            list(rows),
+        )
+
+
+def new_upsert(change_detection=False, update_rollups=False, update_search_index=False):
+    def _upsert(df, db_path, app_id, run_id):
+        db.upsert_reviews(df, db_path, app_id, run_id,
+                          change_detection=change_detection, update_rollups=update_rollups,
+                          update_search_index=update_search_index)
+    return _upsert
+
+
+IMPLEMENTATIONS = {
+    "legacy": legacy_upsert_reviews,
+    "staging_merge": new_upsert(),
+    "change_detection": new_upsert(change_detection=True),
+    "with_rollups": new_upsert(change_detection=True, update_rollups=True),
+    "pipeline": new_upsert(change_detection=True, update_rollups=True, update_search_index=True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite review loading")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}  {'impl':<19}{'insert_rows/s':>15}{'reupsert_rows/s':>17}")
+    for n in args.sizes:
+        df = make_frame(n)
+        for name, fn in IMPLEMENTATIONS.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = str(Path(tmp) / "bench.db")
+                # schema cost excluded for every implementation; legacy keeps its own baseline schema
+                if name == "legacy":
+                    with sqlite3.connect(db_path) as conn:
+                        conn.executescript(db.SCHEMA_PATH.read_text(encoding="utf-8"))
+                else:
+                    db.init_db(db_path)
+
+                t0 = time.perf_counter()
+                fn(df, db_path, "com.example.app", "run_1")
+                t_insert = time.perf_counter() - t0
+
+                t0 = time.perf_counter()
+                fn(df, db_path, "com.example.app", "run_2")
+                t_reupsert = time.perf_counter() - t0
+
+            print(f"{n:>9}  {name:<19}{n / t_insert:>15,.0f}{n / t_reupsert:>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
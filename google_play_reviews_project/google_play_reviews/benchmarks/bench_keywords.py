@@ -0,0 +1,121 @@
+"""
+Keyword statistics (analysis.keywords) on synthetic reviews generated chunk
+by chunk: Zipf-distributed filler words plus a few terms planted at higher
+rates in 1-star reviews, 5-star reviews and one app_version.
+
+  python -m google_play_reviews.benchmarks.bench_keywords --reviews 10000000
+
+Reports TermStats.update throughput (generation time excluded), peak RSS,
+state size on disk, TF-IDF keyword throughput, whether the planted terms
+top their group's ranking, and whether updating across save / load cycles
+(as run_pipeline does per run) matches a single pass.
+"""
+import argparse
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ..analysis.keywords import STATE_FILE, VOCAB_FILE, TermStats, load_state, save_state, tfidf_keywords
+from .bench_storage import make_frame
+
+# group -> planted terms and the share of that group's reviews mentioning each
+PLANTED = {
+    ("rating", "1"): (["refund", "crashes", "logout"], 0.15),
+    ("rating", "5"): (["lifesaver", "brilliant"], 0.15),
+    ("app_version", "1.7.0"): (["voicebug"], 0.3),
+}
+
+
+def make_chunk(rows, seed, vocab_size=50_000):
+    df = make_frame(rows, seed)
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+    # Right-skewed lengths, longer for low ratings
+    lengths = np.minimum(rng.lognormal(2.0, 0.8, rows).astype(int) + 1 + 10 * (df["rating"].to_numpy() <= 2), 80)
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    words = vocab[np.minimum(rng.zipf(1.2, size=bounds[-1]), vocab_size) - 1]
+    texts = [" ".join(words[bounds[i]:bounds[i + 1]]) for i in range(rows)]
+    for (facet, value), (terms, share) in PLANTED.items():
+        column = df[facet].astype(str).to_numpy()
+        for term in terms:
+            for i in np.flatnonzero((column == value) & (rng.random(rows) < share)):
+                texts[i] += f" {term}"
+    df["review_text"] = texts
+    return df
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _same(a: TermStats, b: TermStats) -> bool:
+    if a.vocab.terms != b.vocab.terms or a.docs != b.docs or not np.array_equal(a.doc_freq, b.doc_freq):
+        return False
+    for facet in a.groups:
+        if a.groups[facet] != b.groups[facet]:
+            return False
+        ma, mb = a.group_matrix(facet), b.group_matrix(facet)
+        if not (np.array_equal(ma.indptr, mb.indptr) and np.array_equal(ma.indices, mb.indices)
+                and np.array_equal(ma.data, mb.data)):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming keyword statistics")
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=4, help="Save/load cycles for the incremental check")
+    args = parser.parse_args()
+
+    n_chunks = max(1, args.reviews // args.chunk)
+    stats, update_s = TermStats(), 0.0
+    for seed in range(n_chunks):
+        df = make_chunk(args.chunk, seed)
+        t0 = time.perf_counter()
+        stats.update(df)
+        update_s += time.perf_counter() - t0
+    docs = n_chunks * args.chunk
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"keywords_state_dir": tmp}
+        t0 = time.perf_counter()
+        save_state(stats, [], config)
+        save_s = time.perf_counter() - t0
+        state_mb = sum((Path(tmp) / f).stat().st_size for f in (STATE_FILE, VOCAB_FILE)) / 1e6
+
+    print(f"reviews={docs:,} vocab={len(stats.vocab):,} update_s={update_s:.1f} "
+          f"reviews/s={docs / update_s:,.0f} peak_rss_mb={_peak_rss_mb():.0f}")
+    print(f"save_s={save_s:.2f} state_mb={state_mb:.1f}")
+
+    for (facet, value), (terms, _) in PLANTED.items():
+        t0 = time.perf_counter()
+        top = stats.distinctive_terms(facet, value, top=len(terms))
+        rank_ms = (time.perf_counter() - t0) * 1000
+        found = sorted(top["term"]) == sorted(terms)
+        print(f"{facet}={value}: top={list(top['term'])} planted_found={found} rank_ms={rank_ms:.0f}")
+
+    sample = make_chunk(args.chunk, seed=10_000)["review_text"]
+    t0 = time.perf_counter()
+    tfidf_keywords(sample, stats, k=5)
+    print(f"tfidf_keywords reviews/s={len(sample) / (time.perf_counter() - t0):,.0f}")
+
+    # Incremental: one chunk per simulated run, state saved and reloaded between runs
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"keywords_state_dir": tmp}
+        single = TermStats()
+        for seed in range(args.runs):
+            df = make_chunk(20_000, seed)
+            single.update(df)
+            inc, runs = load_state(config)
+            inc.update(df)
+            save_state(inc, runs + [f"run{seed}"], config)
+        inc, runs = load_state(config)
+        print(f"incremental over {len(runs)} runs == single pass: {_same(inc, single)}")
+
+
+if __name__ == "__main__":
+    main()
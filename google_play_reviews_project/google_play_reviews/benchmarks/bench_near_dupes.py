@@ -0,0 +1,100 @@
+"""
+Near-duplicate detection (analysis.near_dupes) on synthetic reviews with
+injected template spam: copies of a few hundred templates with a handful of
+words substituted, inserted or dropped. Reports throughput, candidate pairs
+vs the n^2/2 a pairwise pass would compare, and pair precision / recall
+against the injected clusters.
+
+  python -m google_play_reviews.benchmarks.bench_near_dupes --reviews 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..analysis.near_dupes import near_duplicate_clusters
+
+
+def _pairs(sizes: np.ndarray) -> int:
+    sizes = sizes.astype(np.int64)
+    return int((sizes * (sizes - 1) // 2).sum())
+
+
+def make_texts(n_reviews, dup_share=0.05, seed=0, vocab_size=20_000):
+    """
+    (texts, true cluster per text or -1). About dup_share of the texts are
+    edited copies of templates, 2-60 copies each.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"word{i}" for i in range(vocab_size)])
+
+    def random_words(k):
+        return vocab[rng.integers(0, vocab_size, k)].tolist()
+
+    texts, truth = [], []
+    n_dupes = int(n_reviews * dup_share)
+    cluster = 0
+    while len(texts) < n_dupes:
+        template = random_words(int(rng.integers(12, 60)))
+        for _ in range(int(rng.integers(2, 61))):
+            words = list(template)
+            for _ in range(max(1, len(words) // 25)):
+                op, pos = rng.integers(3), int(rng.integers(len(words)))
+                if op == 0:
+                    words[pos] = random_words(1)[0]
+                elif op == 1:
+                    words.insert(pos, random_words(1)[0])
+                elif len(words) > 12:
+                    del words[pos]
+            texts.append(" ".join(words))
+            truth.append(cluster)
+        cluster += 1
+
+    lengths = np.minimum(rng.lognormal(2.3, 0.8, n_reviews - len(texts)).astype(int) + 2, 120)
+    words = random_words(int(lengths.sum()))
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    texts += [" ".join(words[bounds[i]:bounds[i + 1]]) for i in range(len(lengths))]
+    truth += [-1] * len(lengths)
+
+    order = rng.permutation(len(texts))
+    return pd.Series(np.array(texts, dtype=object)[order]), np.array(truth)[order]
+
+
+def pair_scores(truth: np.ndarray, pred: np.ndarray):
+    """
+    Pair precision / recall of predicted clusters (-1 = singleton).
+    """
+    both = (truth >= 0) & (pred >= 0)
+    cells = pd.Series(1, index=pd.MultiIndex.from_arrays([truth[both], pred[both]])).groupby(level=[0, 1]).size()
+    tp = _pairs(cells.to_numpy())
+    predicted = _pairs(np.bincount(pred[pred >= 0]))
+    actual = _pairs(np.bincount(truth[truth >= 0]))
+    return (tp / predicted if predicted else 1.0), (tp / actual if actual else 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection")
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--dup-share", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    texts, truth = make_texts(args.reviews, dup_share=args.dup_share)
+    stats = {}
+    t0 = time.perf_counter()
+    pred = near_duplicate_clusters(texts, threshold=args.threshold, stats=stats).to_numpy()
+    elapsed = time.perf_counter() - t0
+    precision, recall = pair_scores(truth, pred)
+
+    n = stats["eligible"]
+    print(f"reviews={args.reviews} injected={int((truth >= 0).sum())} in {truth.max() + 1} clusters")
+    print(f"elapsed_s={elapsed:.1f} reviews/s={args.reviews / elapsed:,.0f}")
+    print(f"candidate_pairs={stats['candidate_pairs']:,} vs pairwise={n * (n - 1) // 2:,}")
+    print(f"clusters={stats['clusters']} clustered_reviews={stats['clustered_reviews']}")
+    print(f"pair_precision={precision:.3f} pair_recall={recall:.3f}")
+    print({k: v for k, v in stats.items() if k.endswith("_s")})
+
+
+if __name__ == "__main__":
+    main()
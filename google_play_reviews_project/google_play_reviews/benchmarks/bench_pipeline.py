@@ -0,0 +1,368 @@
+"""
+Per-stage and end-to-end pipeline benchmark on synthetic reviews
+(benchmarks/synthetic.py), with a JSON history and a regression check.
+
+  python -m google_play_reviews.benchmarks.bench_pipeline run --scales 10k 100k 1m
+  python -m google_play_reviews.benchmarks.bench_pipeline run --scales 10m --stages clean save db_load eda
+  python -m google_play_reviews.benchmarks.bench_pipeline compare                # latest vs previous
+  python -m google_play_reviews.benchmarks.bench_pipeline compare --baseline <suite_id> --threshold 0.15
+
+`run` generates `rows` reviews per scale and times the batch path of
+run_pipeline on them:
+  scrape   scraper.scrape_streams over SyntheticPlayStore (no network
+           latency, so this is page parsing, uid hashing and dedup)
+  clean    processing.basic_clean
+  save     storage.save_run_outputs (--format csv / parquet / feather)
+  db_load  db.upsert_reviews into a fresh DB with the configured
+           change-detection options, rollups and FTS
+  eda      eda_basic on the processed run file: load_df, add_text_features,
+           basic_profile, time_aggregation
+Stages left out of --stages still produce their output for the next
+stage, untimed. Each scale runs in its own spawned process, so peak RSS
+is that scale's alone (per stage where /proc/self/clear_refs allows, see
+pipeline/metrics.py). Memory grows about linearly with rows: 1m peaks
+near 2 GB (in eda), so 10m needs a machine with 20+ GB.
+
+Every scale appends one entry to `benchmark_history_path`: rows/s, wall
+and CPU seconds and peak RSS per stage and end to end (generation
+excluded), scrape page latency percentiles, plus git commit, host and
+settings. `compare` matches a candidate suite against a baseline suite
+(default: the latest suite and the one before it with the same seed and
+format) scale by scale, flags stages whose rows/s fell or whose peak RSS
+or p90 page latency rose by more than --threshold, and exits 1 when any
+did. Stages under --min-wall-s in the baseline are reported but never
+flagged, since their timings are mostly noise.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+from google_play_scraper import Sort
+
+from ..analysis.eda_basic import add_text_features, basic_profile, load_df, time_aggregation
+from ..pipeline.config import PIPELINE_CONFIG, REPO_ROOT
+from ..pipeline.db import upsert_reviews
+from ..pipeline.metrics import RunMetrics
+from ..pipeline.processing import basic_clean
+from ..pipeline.scraper import build_streams, scrape_streams
+from ..pipeline.storage import output_path, save_run_outputs, write_frame
+from .fake_play import patched_reviews
+from .synthetic import SyntheticPlayStore, generate_reviews
+
+STAGES = ["scrape", "clean", "save", "db_load", "eda"]
+APP_ID = "com.example.synthetic"
+SORT_MODES = {
+    "newest": Sort.NEWEST,
+    "most_relevant": Sort.MOST_RELEVANT,
+}
+
+# (metric, direction): 1 = higher is worse, -1 = lower is worse
+COMPARED = [("rows_per_s", -1), ("peak_rss_mb", 1), ("page_p90_ms", 1)]
+MIN_RSS_DELTA_MB = 20  # RSS moves by a few MB between identical runs
+
+
+def parse_rows(text: str) -> int:
+    """
+    "10k" -> 10_000, "1m" -> 1_000_000, "2500" -> 2500.
+    """
+    text = text.strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+
+
+def run_scale(rows: int, stages: list[str], seed: int, fmt: str) -> dict:
+    """
+    Benchmark one scale (meant to run in a fresh process). Returns the
+    history entry fields for it.
+    """
+    logger = logging.getLogger(__name__)
+    t0 = time.perf_counter()
+    df = generate_reviews(rows, seed=seed)
+    generate_s = time.perf_counter() - t0
+
+    run_id = f"bench_{rows}"
+    metrics = RunMetrics(run_id)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {
+            **PIPELINE_CONFIG,
+            "raw_out_dir": str(Path(tmp) / "raw"),
+            "processed_out_dir": str(Path(tmp) / "processed"),
+            "db_path": str(Path(tmp) / "reviews.db"),
+            "output_format": fmt,
+        }
+        metrics.start()
+
+        if "scrape" in stages:
+            store = SyntheticPlayStore(df)
+            streams = build_streams([APP_ID], SORT_MODES)
+            with patched_reviews(store), metrics.stage("scrape") as st:
+                df_raw = scrape_streams(streams, target_per_mode=rows, max_workers=len(streams),
+                                        page_latency=metrics.page_latency)
+                st["rows"] = len(df_raw)
+            del store
+        else:
+            df_raw = df
+        del df
+
+        with metrics.stage("clean", len(df_raw)) if "clean" in stages else nullcontext({}):
+            df_proc = basic_clean(df_raw)
+
+        proc_path = output_path(config["processed_out_dir"], "reviews_processed", run_id, fmt)
+        if "save" in stages:
+            with metrics.stage("save", len(df_raw)):
+                save_run_outputs(df_raw, df_proc, run_id, config, logger)
+        elif "eda" in stages:
+            proc_path.parent.mkdir(parents=True, exist_ok=True)
+            write_frame(df_proc, proc_path, fmt)
+        del df_raw
+
+        if "db_load" in stages:
+            with metrics.stage("db_load", len(df_proc)):
+                upsert_reviews(df_proc, config["db_path"], APP_ID, run_id,
+                               change_detection=config.get("db_change_detection", False))
+        del df_proc
+
+        if "eda" in stages:
+            with metrics.stage("eda") as st:
+                eda_df = add_text_features(load_df(proc_path))
+                basic_profile(eda_df)
+                time_aggregation(eda_df)
+                st["rows"] = len(eda_df)
+            del eda_df
+
+        metrics.stop()
+
+    m = metrics.to_dict()
+    timed_rows = max((s["rows"] for s in m["stages"].values()), default=0)
+    latency = m["page_latency"]
+    stage_out = {}
+    for name in STAGES:
+        if name not in m["stages"]:
+            continue
+        s = m["stages"][name]
+        stage_out[name] = {k: s[k] for k in ("rows", "wall_s", "cpu_s", "rows_per_s", "peak_rss_mb")}
+        if name == "scrape":
+            stage_out[name].update(pages=latency["count"], page_p50_ms=latency["p50_ms"],
+                                   page_p90_ms=latency["p90_ms"], page_p99_ms=latency["p99_ms"])
+    return {
+        "rows": rows,
+        "generate_s": round(generate_s, 3),
+        "peak_rss_scope": m["peak_rss_scope"],
+        "stages": stage_out,
+        "e2e": {
+            "rows": timed_rows,
+            "wall_s": m["wall_s"],
+            "cpu_s": m["cpu_s"],
+            "rows_per_s": round(timed_rows / m["wall_s"], 1) if m["wall_s"] else None,
+            "peak_rss_mb": m["peak_rss_mb"],
+        },
+    }
+
+
+def load_history(path) -> list[dict]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))["runs"]
+
+
+def append_history(path, entries: list[dict]):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    runs = load_history(path) + entries
+    # Write-then-rename so an interrupted write never loses the history
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"runs": runs}, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def suites(runs: list[dict]) -> dict:
+    """
+    {suite_id: [entries]} in the order suites were recorded.
+    """
+    out = {}
+    for entry in runs:
+        out.setdefault(entry["suite_id"], []).append(entry)
+    return out
+
+
+def run_suite(scales: list[int], stages: list[str], seed: int, fmt: str, label: str | None = None) -> list[dict]:
+    suite_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    common = {
+        "suite_id": suite_id,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "label": label,
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "format": fmt,
+    }
+    entries = []
+    os.environ.setdefault("TQDM_DISABLE", "1")  # no scraper progress bars in the workers
+    ctx = multiprocessing.get_context("spawn")
+    for rows in scales:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            result = pool.submit(run_scale, rows, stages, seed, fmt).result()
+        entry = {**common, **result}
+        entries.append(entry)
+        print_entry(entry)
+    return entries
+
+
+def print_entry(entry: dict):
+    print(f"rows={entry['rows']:,} generate_s={entry['generate_s']}")
+    for name, s in [*entry["stages"].items(), ("e2e", entry["e2e"])]:
+        extra = f" page_p50/p90_ms={s['page_p50_ms']}/{s['page_p90_ms']}" if "page_p50_ms" in s else ""
+        rate = f"{s['rows_per_s']:>12,.0f}" if s["rows_per_s"] else f"{'-':>12}"
+        print(f"  {name:<8} wall_s={s['wall_s']:>9.3f} rows/s={rate} peak_rss_mb={s['peak_rss_mb']:>8.1f}{extra}")
+
+
+def compare_entries(base: dict, cand: dict, threshold: float, min_wall_s: float) -> list[dict]:
+    """
+    One row per (stage, metric) both entries have, with the relative change
+    and whether it counts as a regression.
+    """
+    rows = []
+    for name in [*STAGES, "e2e"]:
+        b = base["e2e"] if name == "e2e" else base["stages"].get(name)
+        c = cand["e2e"] if name == "e2e" else cand["stages"].get(name)
+        if not b or not c:
+            continue
+        noisy = (b.get("wall_s") or 0) < min_wall_s
+        for metric, direction in COMPARED:
+            bv, cv = b.get(metric), c.get(metric)
+            if not bv or cv is None:
+                continue
+            change = (cv - bv) / bv
+            worse = change * direction > threshold
+            if metric == "peak_rss_mb" and abs(cv - bv) < MIN_RSS_DELTA_MB:
+                worse = False
+            rows.append({
+                "rows": cand["rows"], "stage": name, "metric": metric, "baseline": bv, "candidate": cv,
+                "change": round(change, 3), "regression": worse and not noisy, "noisy": noisy,
+            })
+    return rows
+
+
+def _pick_suites(runs, baseline_runs, baseline: str, candidate: str):
+    by_suite = suites(runs)
+    if not by_suite:
+        raise SystemExit("No benchmark history yet; run `bench_pipeline run` first")
+    cand_id = list(by_suite)[-1] if candidate == "latest" else candidate
+    if cand_id not in by_suite:
+        raise SystemExit(f"Unknown candidate suite {cand_id!r}")
+    cand = by_suite[cand_id]
+
+    base_suites = suites(baseline_runs)
+    if baseline != "previous":
+        if baseline not in base_suites:
+            raise SystemExit(f"Unknown baseline suite {baseline!r}")
+        return base_suites[baseline], cand
+    settings = (cand[0]["seed"], cand[0]["format"])
+    scales = {e["rows"] for e in cand}
+    ids = list(base_suites)
+    if baseline_runs is runs:
+        ids = ids[:ids.index(cand_id)]
+    for suite_id in reversed(ids):
+        entries = base_suites[suite_id]
+        if (entries[0]["seed"], entries[0]["format"]) == settings and scales & {e["rows"] for e in entries}:
+            return entries, cand
+    raise SystemExit(f"No earlier suite with seed={settings[0]} format={settings[1]} and a common scale")
+
+
+def compare(runs, baseline_runs, baseline: str = "previous", candidate: str = "latest",
+            threshold: float = 0.10, min_wall_s: float = 0.5) -> list[dict]:
+    base_entries, cand_entries = _pick_suites(runs, baseline_runs, baseline, candidate)
+    base_by_rows = {e["rows"]: e for e in base_entries}
+    b0, c0 = base_entries[0], cand_entries[0]
+    print(f"baseline  {b0['suite_id']} commit={b0['git_commit']} host={b0['host']}")
+    print(f"candidate {c0['suite_id']} commit={c0['git_commit']} host={c0['host']}")
+    if b0["host"] != c0["host"]:
+        print("warning: suites ran on different hosts")
+
+    results = []
+    for cand in cand_entries:
+        base = base_by_rows.get(cand["rows"])
+        if base is None:
+            continue
+        results.extend(compare_entries(base, cand, threshold, min_wall_s))
+    for r in results:
+        flag = "REGRESSION" if r["regression"] else "noisy" if r["noisy"] else "ok"
+        print(f"{r['rows']:>10,} {r['stage']:<8} {r['metric']:<12} {r['baseline']:>14,.1f} -> "
+              f"{r['candidate']:>14,.1f} {r['change']:>+8.1%}  {flag}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic reviews")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Benchmark and append to the history")
+    p_run.add_argument("--scales", nargs="+", default=["10k", "100k", "1m"],
+                       help="Review counts, e.g. 10k 100k 1m 10m")
+    p_run.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--format", default=PIPELINE_CONFIG.get("output_format", "csv"),
+                       choices=["csv", "parquet", "feather"])
+    p_run.add_argument("--label", default=None, help="Free-text note stored with the suite")
+    p_run.add_argument("--history", default=PIPELINE_CONFIG["benchmark_history_path"])
+    p_run.add_argument("--no-record", action="store_true", help="Print results without appending them")
+
+    p_cmp = sub.add_parser("compare", help="Flag regressions of a suite against a baseline suite")
+    p_cmp.add_argument("--history", default=PIPELINE_CONFIG["benchmark_history_path"])
+    p_cmp.add_argument("--baseline", default="previous",
+                       help="Baseline suite_id, or 'previous' (latest earlier suite with the same seed/format)")
+    p_cmp.add_argument("--baseline-history", default=None,
+                       help="Take the baseline from this history file (e.g. a saved reference run)")
+    p_cmp.add_argument("--candidate", default="latest", help="Candidate suite_id, or 'latest'")
+    p_cmp.add_argument("--threshold", type=float, default=0.10, help="Relative change that counts as a regression")
+    p_cmp.add_argument("--min-wall-s", type=float, default=0.5,
+                       help="Never flag stages faster than this in the baseline")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        entries = run_suite([parse_rows(s) for s in args.scales], args.stages, args.seed, args.format, args.label)
+        if not args.no_record:
+            append_history(args.history, entries)
+            print(f"Saved: {args.history} suite_id={entries[0]['suite_id']}")
+        return
+
+    runs = load_history(args.history)
+    baseline_runs = load_history(args.baseline_history) if args.baseline_history else runs
+    results = compare(runs, baseline_runs, args.baseline, args.candidate, args.threshold, args.min_wall_s)
+    regressions = [r for r in results if r["regression"]]
+    print(f"{len(regressions)} regression(s) at threshold {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Response cache (pipeline.response_cache) against FakePlayStore: a cold
+recording scrape, a warm scrape served from the cache, and a pure replay
+with the fake store switched off.
+
+  python -m google_play_reviews.benchmarks.bench_response_cache --target 5000 --latency 0.1
+
+Reports wall time per pass, requests that reached the store, cache size
+and compression ratio, whether replay returns the same frame as the
+recording run (scrape_time aside), and LRU eviction under a small size limit.
+"""
+import argparse
+import gzip
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from google_play_scraper import Sort
+
+from ..pipeline.response_cache import SUFFIX, ResponseCache, ResponseCacheMiss
+from ..pipeline.scraper import build_streams, scrape_streams
+from .fake_play import FakePlayStore, patched_reviews
+
+SORT_MODES = {
+    "newest": Sort.NEWEST,
+    "most_relevant": Sort.MOST_RELEVANT,
+}
+
+
+def scrape(streams, target, workers, cache):
+    t0 = time.perf_counter()
+    df = scrape_streams(streams, target_per_mode=target, max_workers=workers, response_cache=cache)
+    return df, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper response cache")
+    parser.add_argument("--apps", type=int, default=2)
+    parser.add_argument("--target", type=int, default=5000, help="target_per_mode")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per fake request")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    streams = build_streams([f"com.example.app{i}" for i in range(args.apps)], SORT_MODES)
+    fake = FakePlayStore(reviews_per_app=args.target * 2, latency_sec=args.latency)
+
+    with tempfile.TemporaryDirectory() as tmp, patched_reviews(fake):
+        cold, cold_s = scrape(streams, args.target, args.workers, ResponseCache(tmp, mode="record"))
+        cold_calls = fake.calls
+
+        warm_cache = ResponseCache(tmp, mode="record")
+        warm, warm_s = scrape(streams, args.target, args.workers, warm_cache)
+        warm_calls = fake.calls - cold_calls
+
+        fake.latency_sec = 60  # any request reaching the store would stall the replay
+        replay, replay_s = scrape(streams, args.target, args.workers, ResponseCache(tmp, mode="replay"))
+
+        files = list(Path(tmp).glob(f"*/*{SUFFIX}"))
+        stored = sum(f.stat().st_size for f in files)
+        raw = sum(len(gzip.decompress(f.read_bytes())) for f in files)
+
+        try:
+            scrape([("com.example.unseen", "newest", Sort.NEWEST, "us", "en")], 10, 1,
+                   ResponseCache(tmp, mode="replay"))
+            miss = "served"
+        except ResponseCacheMiss:
+            miss = "ResponseCacheMiss"
+
+        # LRU: re-read one stream, then shrink the limit to half the cache
+        lru = ResponseCache(tmp, mode="record", max_mb=stored / 2 / 2**20)
+        kept_stream = streams[:1]
+        scrape(kept_stream, args.target, 1, lru)
+        evicted = lru.evict(lru.max_bytes)
+        check = ResponseCache(tmp, mode="replay")
+        scrape(kept_stream, args.target, 1, check)
+        kept_ok = check.stats["misses"] == 0
+
+    # scrape_time is the replay's own clock; everything else must match
+    same = cold.drop(columns="scrape_time").reset_index(drop=True).equals(
+        replay.drop(columns="scrape_time").reset_index(drop=True))
+    rows = len(cold)
+    print(f"streams={len(streams)} rows={rows:,} pages={len(files)} latency_s={args.latency}")
+    print(f"cold (record): wall_s={cold_s:.2f} requests={cold_calls}")
+    print(f"warm (record): wall_s={warm_s:.3f} requests={warm_calls} stats={json.dumps(warm_cache.stats)}")
+    print(f"replay: wall_s={replay_s:.3f} rows/s={rows / replay_s:,.0f} same_frame={same} unseen_stream={miss}")
+    print(f"cache_mb={stored / 2**20:.2f} uncompressed_mb={raw / 2**20:.2f} ratio={raw / stored:.1f}x")
+    print(f"lru: evicted={evicted} recently_used_stream_still_cached={kept_ok}")
+
+
+if __name__ == "__main__":
+    main()
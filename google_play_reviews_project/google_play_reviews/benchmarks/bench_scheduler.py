@@ -0,0 +1,126 @@
+"""
+Scheduler policy (pipeline.scheduler.plan_cycle) on a simulated portfolio:
+reviews arrive per app as a Poisson process with log-normally spread
+velocities, and the scheduler is planned every hour against the same
+request budget. Baseline: every app once a day at the old fixed
+target_per_mode of 2500.
+
+  python -m google_play_reviews.benchmarks.bench_scheduler --apps 50 --days 14 --budget 400
+
+A run fetches NEWEST down to the previous run's high-water mark (or its
+target, whichever is hit first), plus `target` reviews of each other sort
+mode. Reports page requests, reviews lost from NEWEST because the target
+was too shallow, and staleness (hours from a review's arrival until a run
+picks it up), for the busiest tenth of apps and for all apps.
+"""
+import argparse
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from ..pipeline.config import PIPELINE_CONFIG
+from ..pipeline.scheduler import PAGE_SIZE, plan_cycle
+
+N_SORT_MODES = 3
+
+
+class SimApp:
+    def __init__(self, app_id, per_hour):
+        self.app_id = app_id
+        self.per_hour = per_hour
+        self.pending = []  # arrival hours not yet fetched
+        self.history = []  # (hour, arrivals), for the velocity estimate
+        self.last_run = None
+        self.stale_h = []
+        self.lost = 0
+        self.pages = 0
+
+    def arrive(self, hour, n):
+        self.pending.extend([hour + 0.5] * n)
+        self.history.append((hour, n))
+
+    def velocity(self, hour, window_h):
+        return sum(n for h, n in self.history if h > hour - window_h) / window_h
+
+    def run(self, hour, target, now):
+        fetched = min(len(self.pending), target)
+        # NEWEST returns the most recent reviews first; older ones past the target are never seen
+        self.stale_h.extend(hour - t for t in self.pending[len(self.pending) - fetched:])
+        self.lost += len(self.pending) - fetched
+        self.pending = []
+        self.pages += max(1, math.ceil(fetched / PAGE_SIZE)) + (N_SORT_MODES - 1) * math.ceil(target / PAGE_SIZE)
+        self.last_run = now
+
+
+def simulate(velocities, hours, policy, config, seed):
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 1)
+    apps = [SimApp(f"com.sim.app{i}", v) for i, v in enumerate(velocities)]
+    # One week of history before the first cycle, already fetched
+    for a in apps:
+        for h in range(-168, 0):
+            a.history.append((h, rng.poisson(a.per_hour)))
+        a.last_run = start - timedelta(hours=1)
+
+    for hour in range(hours):
+        now = start + timedelta(hours=hour)
+        for a in apps:
+            a.arrive(hour, rng.poisson(a.per_hour))
+        if policy == "fixed":
+            if hour % 24 == 0:
+                for a in apps:
+                    a.run(hour, 2500, now)
+            continue
+        by_id = {a.app_id: a for a in apps}
+        plan = plan_cycle(
+            [{"app_id": a.app_id} for a in apps],
+            {a.app_id: a.velocity(hour, config["scheduler_velocity_window_hours"]) for a in apps},
+            {a.app_id: a.last_run for a in apps},
+            config,
+            now,
+            n_sort_modes=N_SORT_MODES,
+        )
+        for e in plan:
+            if e["action"] == "run":
+                by_id[e["app_id"]].run(hour, e["target_per_mode"], now)
+    return apps
+
+
+def summary(apps):
+    stale = np.concatenate([np.asarray(a.stale_h, dtype=float) for a in apps] or [np.zeros(0)])
+    return {
+        "pages": sum(a.pages for a in apps),
+        "lost": sum(a.lost for a in apps),
+        "stale_mean_h": float(stale.mean()) if len(stale) else 0.0,
+        "stale_p90_h": float(np.percentile(stale, 90)) if len(stale) else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the multi-app scheduler against a fixed daily run")
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--budget", type=int, default=PIPELINE_CONFIG["scheduler_request_budget"],
+                        help="Page requests per hourly cycle")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    velocities = np.sort(rng.lognormal(0.0, 2.0, args.apps))[::-1]  # reviews/hour, a few very busy apps
+    config = {**PIPELINE_CONFIG, "scheduler_request_budget": args.budget}
+    hours = args.days * 24
+    top = max(1, args.apps // 10)
+
+    print(f"apps={args.apps} days={args.days} budget/cycle={args.budget} "
+          f"velocity/h: max={velocities[0]:.1f} median={np.median(velocities):.2f} min={velocities[-1]:.3f}")
+    for policy in ("fixed", "scheduler"):
+        apps = simulate(velocities, hours, policy, config, args.seed)
+        busy, total = summary(apps[:top]), summary(apps)
+        print(f"{policy:>9}: pages={total['pages']:,} pages/day={total['pages'] / args.days:,.0f} "
+              f"lost={total['lost']:,} stale_mean_h={total['stale_mean_h']:.1f} stale_p90_h={total['stale_p90_h']:.1f} | "
+              f"top{top}: pages={busy['pages']:,} lost={busy['lost']:,} stale_mean_h={busy['stale_mean_h']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
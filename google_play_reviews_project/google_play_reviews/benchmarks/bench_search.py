@@ -0,0 +1,89 @@
+"""
+FTS5 search (analysis.search) vs a pandas str.contains scan over the
+processed run file, on synthetic reviews with a Zipf-distributed vocabulary
+and a few triage terms at realistic rates.
+
+  python -m google_play_reviews.benchmarks.bench_search --rows 1000000
+
+Reports top-20 search and total-count latency for the index, and scan time
+for pandas both with the file already in memory and including the CSV load.
+Match counts differ slightly: FTS5 matches stemmed whole words, str.contains
+raw substrings.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ..analysis.search import count_matches, search_reviews
+from ..pipeline import db
+from ..pipeline.storage import read_frame, write_frame
+from .bench_storage import make_frame
+
+# term -> share of reviews that mention it
+TRIAGE_TERMS = {"login": 0.02, "crash": 0.03, "voice mode": 0.005, "subscription": 0.01}
+
+# (FTS5 query, equivalent pandas substring)
+QUERIES = [
+    ("login", "login"),
+    ("crash", "crash"),
+    ('"voice mode"', "voice mode"),
+    ("subscr*", "subscr"),
+]
+
+
+def make_search_frame(rows, seed=0, vocab_size=20_000):
+    df = make_frame(rows, seed)
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+    lengths = np.minimum(rng.lognormal(2.0, 0.8, rows).astype(int) + 1, 60)
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    words = vocab[np.minimum(rng.zipf(1.3, size=bounds[-1]), vocab_size) - 1]
+    texts = [" ".join(words[bounds[i]:bounds[i + 1]]) for i in range(rows)]
+    for term, share in TRIAGE_TERMS.items():
+        for i in np.flatnonzero(rng.random(rows) < share):
+            texts[i] += f" {term}"
+    df["review_text"] = texts
+    df["review_uid"] = [f"{i:016x}{rng.integers(1 << 62):048x}" for i in range(rows)]
+    return df
+
+
+def _timed(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 review search vs pandas str.contains")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = make_search_frame(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "search.db")
+        csv_path = Path(tmp) / "reviews_processed.csv"
+        t0 = time.perf_counter()
+        db.upsert_reviews(df, db_path, "com.example.app", "bench", update_rollups=False)
+        t_load = time.perf_counter() - t0
+        write_frame(df, csv_path, "csv", None)
+
+        print(f"rows={args.rows} load_with_index_s={t_load:.1f}")
+        print(f"{'query':<16}{'fts_top20_ms':>14}{'fts_count_ms':>14}{'fts_hits':>10}"
+              f"{'pandas_ms':>12}{'pandas+load_ms':>16}{'pandas_hits':>13}")
+        for fts_query, needle in QUERIES:
+            top_ms, _ = _timed(lambda: search_reviews(db_path, fts_query, app_id="com.example.app", limit=20))
+            count_ms, hits = _timed(lambda: count_matches(db_path, fts_query, app_id="com.example.app"))
+            scan_ms, mask = _timed(lambda: df["review_text"].str.contains(needle, case=False, regex=False))
+            load_ms, _ = _timed(lambda: read_frame(csv_path)["review_text"].str.contains(needle, case=False, regex=False), repeat=1)
+            print(f"{fts_query:<16}{top_ms:>14.1f}{count_ms:>14.1f}{hits:>10,}"
+                  f"{scan_ms:>12.1f}{load_ms:>16.1f}{int(mask.sum()):>13,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+CSV vs Parquet vs Feather for run outputs: write time, full read time,
+projected read time (3 columns) and file size.
+
+  python -m google_play_reviews.benchmarks.bench_storage --rows 1000000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..pipeline.storage import read_frame, write_frame
+
+WORDS = np.array("app good great bad crash login voice update slow love chat answer".split())
+
+
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    n_words = np.minimum(rng.lognormal(2.0, 1.0, rows).astype(int) + 1, 200)
+    vocab = WORDS[rng.integers(0, len(WORDS), 256)]
+    text = [" ".join(vocab[(i * 7) % 200:(i * 7) % 200 + k]) for i, k in enumerate(n_words % 50 + 1)]
+    dates = pd.Timestamp("2026-01-01") - pd.to_timedelta(rng.exponential(60, rows) * 86400, unit="s")
+    versions = np.array([None] + [f"1.{i}.0" for i in range(30)], dtype=object)
+    return pd.DataFrame({
+        "review_uid": [f"{i:064x}" for i in range(rows)],
+        "user_name": [f"user_{i % 50000}" for i in range(rows)],
+        "rating": rng.choice([1, 2, 3, 4, 5], rows, p=[0.15, 0.04, 0.05, 0.1, 0.66]),
+        "review_text": text,
+        "review_date": dates.floor("s"),
+        "thumbs_up": rng.poisson(0.5, rows),
+        "app_version": versions[rng.integers(0, len(versions), rows)],
+        "sort_mode": np.where(rng.random(rows) < 0.5, "newest", "most_relevant"),
+        "scrape_time": pd.Timestamp("2026-01-02 12:00:00"),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run output formats")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    cols = ["review_date", "rating", "review_uid"]
+    print(f"rows={args.rows}")
+    print(f"{'format':<16}{'write_s':>10}{'read_s':>10}{'read3col_s':>12}{'size_mb':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, compression in [("csv", None), ("parquet", "snappy"), ("parquet", "zstd"),
+                                 ("feather", "lz4"), ("feather", "zstd")]:
+            path = Path(tmp) / f"bench_{compression}.{fmt}"
+
+            t0 = time.perf_counter()
+            write_frame(df, path, fmt, compression)
+            t_write = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            read_frame(path)
+            t_read = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            read_frame(path, columns=cols)
+            t_proj = time.perf_counter() - t0
+
+            label = fmt if compression is None else f"{fmt}/{compression}"
+            size_mb = path.stat().st_size / 1e6
+            print(f"{label:<16}{t_write:>10.2f}{t_read:>10.2f}{t_proj:>12.2f}{size_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
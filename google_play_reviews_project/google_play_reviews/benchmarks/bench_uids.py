@@ -0,0 +1,58 @@
+"""
+review_uid hashing throughput: the original per-row make_review_uid vs the
+batch page_uids for every available scheme, plus uid size and 64-bit
+uid_key collisions over the generated reviews.
+
+  python -m google_play_reviews.benchmarks.bench_uids --reviews 1000000
+"""
+import argparse
+import time
+
+from ..pipeline.scraper import make_review_uid
+from ..pipeline.uids import available_schemes, page_uids, uid_keys
+from .fake_play import FakePlayStore
+
+
+def fake_pages(n_reviews, page_size=200):
+    store = FakePlayStore(reviews_per_app=n_reviews)
+    reviews = [store.make_review("com.example.app", k) for k in range(n_reviews)]
+    return [reviews[i:i + page_size] for i in range(0, n_reviews, page_size)]
+
+
+def per_row(pages):
+    return [make_review_uid(r.get("userName"), r.get("at"), r.get("content")) for p in pages for r in p]
+
+
+def batch(scheme):
+    def _run(pages):
+        return [uid for p in pages for uid in page_uids(p, scheme)]
+    return _run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark review_uid hashing")
+    parser.add_argument("--reviews", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N timings")
+    args = parser.parse_args()
+
+    pages = fake_pages(args.reviews)
+    legacy = per_row(pages)
+
+    print(f"reviews={args.reviews}")
+    print(f"{'hasher':<14} {'uids/s':>12} {'uid_chars':>10} {'unique':>10} {'key_coll':>9}  legacy_match")
+    cases = [("per_row", per_row)] + [(f"batch_{s}", batch(s)) for s in available_schemes()]
+    for name, fn in cases:
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            uids = fn(pages)
+            elapsed = min(elapsed, time.perf_counter() - t0)
+        keys = uid_keys(uids)
+        key_collisions = len(set(uids)) - len(set(keys.tolist()))
+        match = "yes" if uids == legacy else "no"
+        print(f"{name:<14} {len(uids) / elapsed:>12,.0f} {len(uids[0]):>10} {len(set(uids)):>10,} "
+              f"{key_collisions:>9}  {match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Version regression alerts (analysis.version_alerts) on a synthetic DB where
+one app_version gets a planted rating drop.
+
+  python -m google_play_reviews.benchmarks.bench_version_alerts --rows 1000000
+
+Reports whether the planted version alerts (and nothing else), and the time
+to evaluate from rollup_version vs aggregating the same per-version rating
+histograms from reviews with GROUP BY.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ..analysis.version_alerts import build_report
+from ..pipeline import db
+from ..pipeline.db import connect
+from .bench_storage import make_frame
+
+APP_ID = "com.example.app"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-version regression alerts")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--bad-version", default="1.17.0")
+    parser.add_argument("--extra-low-share", type=float, default=0.08,
+                        help="Share of the bad version's reviews turned into 1-star")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    rng = np.random.default_rng(1)
+    bad = (df["app_version"] == args.bad_version).to_numpy() & (rng.random(len(df)) < args.extra_low_share)
+    df.loc[bad, "rating"] = 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "alerts.db")
+        db.upsert_reviews(df, db_path, APP_ID, "bench", update_search_index=False)
+
+        t0 = time.perf_counter()
+        report = build_report(db_path, APP_ID)
+        rollup_ms = (time.perf_counter() - t0) * 1000
+
+        conn = connect(db_path)
+        t0 = time.perf_counter()
+        conn.execute(
+            "SELECT app_version, rating, COUNT(*) FROM reviews WHERE app_id = ? GROUP BY 1, 2", (APP_ID,)
+        ).fetchall()
+        group_by_ms = (time.perf_counter() - t0) * 1000
+        conn.close()
+
+    flagged = sorted({a["app_version"] for a in report["alerts"]})
+    print(f"rows={args.rows:,} versions_evaluated={report['versions_evaluated']} planted={args.bad_version} "
+          f"({int(bad.sum())} extra 1-star)")
+    print(f"flagged={flagged} detected={args.bad_version in flagged} "
+          f"false_positives={len(set(flagged) - {args.bad_version})}")
+    for a in report["alerts"]:
+        print(f"  {a['app_version']} {a['kind']}: {a['value']:.3f} vs {a['baseline_value']:.3f} z={a['z']:.1f}")
+    print(f"evaluate_from_rollups_ms={rollup_ms:.1f} group_by_reviews_ms={group_by_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Local stand-in for the App Store customer-reviews RSS feed.
+
+FakeAppStore serves /{country}/rss/customerreviews/page={n}/id={app_id}/
+sortby=mostrecent/json from a ThreadingHTTPServer on 127.0.0.1, in the
+real feed's JSON layout (label-wrapped fields, rel="last" link, the app's
+metadata entry first on page 1). Each request sleeps `latency_sec`; a
+`error_rate` share of requests answers 503 to exercise retries. Reviews
+are deterministic per app, so repeated runs see the same uids.
+
+  with FakeAppStore(reviews_per_app=500) as store:
+      scrape_appstore(["123"], base_url=store.base_url)
+"""
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+
+BASE_DATE = datetime(2026, 1, 1)
+PAGE_SIZE = 50
+
+_PATH_RE = re.compile(r"^/(\w+)/rss/customerreviews/page=(\d+)/id=(\w+)/sortby=mostrecent/json$")
+
+
+def _label(value):
+    return {"label": str(value)}
+
+
+class FakeAppStore:
+    def __init__(self, reviews_per_app=500, latency_sec=0.05, error_rate=0.0, seed=0):
+        self.reviews_per_app = reviews_per_app
+        self.latency_sec = latency_sec
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def make_entry(self, app_id, k):
+        return {
+            "author": {"name": _label(f"user_{k % 9973}"), "uri": _label(f"https://example.com/{k}")},
+            "updated": _label((BASE_DATE - timedelta(minutes=7 * k)).strftime("%Y-%m-%dT%H:%M:%S-07:00")),
+            "im:rating": _label(5 if k % 4 else 1 + (k % 5)),
+            "im:version": _label(f"1.{k % 7}.0"),
+            "id": _label(f"{app_id}{k}"),
+            "title": _label(f"title {k}"),
+            "content": {**_label(f"review {k} for {app_id}" + (" love it" if k % 3 else " crashes on launch")),
+                        "attributes": {"type": "text"}},
+            "im:voteSum": _label(k % 13),
+            "im:voteCount": _label(k % 29),
+        }
+
+    def feed(self, country, page, app_id):
+        last = max(1, min(10, -(-self.reviews_per_app // PAGE_SIZE)))
+        start = (page - 1) * PAGE_SIZE
+        entries = [self.make_entry(app_id, k)
+                   for k in range(start, min(start + PAGE_SIZE, self.reviews_per_app))] if page <= last else []
+        if page == 1:
+            entries.insert(0, {"im:name": _label(f"App {app_id}"), "id": _label(app_id)})
+
+        def link(rel, p):
+            return {"attributes": {"rel": rel, "type": "application/json",
+                                   "href": f"{self.base_url}/{country}/rss/customerreviews/page={p}"
+                                           f"/id={app_id}/sortby=mostrecent/json"}}
+
+        return {"feed": {
+            "author": {"name": _label("iTunes Store")},
+            "entry": entries,
+            "link": [{"attributes": {"rel": "alternate", "type": "text/html", "href": "https://apps.apple.com/"}},
+                     link("self", page), link("first", 1), link("last", last)],
+        }}
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                with store._lock:
+                    store.connections += 1
+
+            def do_GET(self):
+                with store._lock:
+                    store.requests += 1
+                    fail = store._rng.random() < store.error_rate
+                    store.errors += fail
+                time.sleep(store.latency_sec)
+                m = _PATH_RE.match(self.path)
+                if fail or not m:
+                    self._send(503 if fail else 404, b"{}")
+                    return
+                country, page, app_id = m.group(1), int(m.group(2)), m.group(3)
+                self._send(200, json.dumps(store.feed(country, page, app_id)).encode())
+
+            def _send(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
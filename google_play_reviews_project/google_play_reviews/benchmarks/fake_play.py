@@ -0,0 +1,90 @@
+"""
+Offline stand-in for google_play_scraper.reviews.
+
+FakePlayStore.reviews has the same signature and continuation-token
+semantics as the real function, sleeps `latency_sec` per call to simulate
+the network round trip, and serves a deterministic review universe per app.
+Different sort modes return the same reviews in a different order, so
+cross-sort dedup behaves like the real store.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import threading
+import time
+
+from google_play_scraper import Sort
+
+BASE_DATE = datetime(2026, 1, 1)
+
+
+class FakeContinuationToken:
+    __slots__ = ("token", "lang", "country", "sort", "count")
+
+    def __init__(self, token, lang, country, sort, count):
+        self.token = token
+        self.lang = lang
+        self.country = country
+        self.sort = sort
+        self.count = count
+
+
+class FakePlayStore:
+    def __init__(self, reviews_per_app=5000, latency_sec=0.05):
+        self.reviews_per_app = reviews_per_app
+        self.latency_sec = latency_sec
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _review_index(self, sort, position):
+        # NEWEST walks the universe in date order; other sorts walk a fixed permutation
+        if sort == Sort.NEWEST.value:
+            return position
+        return (position * 7919) % self.reviews_per_app
+
+    def make_review(self, app_id, k):
+        return {
+            "reviewId": f"{app_id}:{k}",
+            "userName": f"user_{k % 9973}",
+            "content": f"review {k} for {app_id}" + (" works great" if k % 3 else " keeps crashing on login"),
+            "score": 5 if k % 4 else 1 + (k % 5),
+            "thumbsUpCount": k % 17,
+            "reviewCreatedVersion": None if k % 11 == 0 else f"1.{k % 7}.0",
+            "at": BASE_DATE - timedelta(minutes=k),
+        }
+
+    def reviews(self, app_id, lang="en", country="us", sort=Sort.NEWEST, count=100,
+                filter_score_with=None, filter_device_with=None, continuation_token=None):
+        with self._lock:
+            self.calls += 1
+
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            offset = continuation_token.token
+            lang, country = continuation_token.lang, continuation_token.country
+            sort, count = continuation_token.sort, continuation_token.count
+        else:
+            offset = 0
+            sort = sort.value
+
+        time.sleep(self.latency_sec)
+
+        end = min(offset + count, self.reviews_per_app)
+        result = [self.make_review(app_id, self._review_index(sort, i)) for i in range(offset, end)]
+        next_token = end if end < self.reviews_per_app else None
+        return result, FakeContinuationToken(next_token, lang, country, sort, count)
+
+
+@contextmanager
+def patched_reviews(fake):
+    """
+    Route pipeline.scraper's `reviews` calls to `fake` for the duration of the block.
+    """
+    from ..pipeline import scraper
+
+    original = scraper.reviews
+    scraper.reviews = fake.reviews
+    try:
+        yield fake
+    finally:
+        scraper.reviews = original
@@ -0,0 +1,130 @@
+"""
+EXPLAIN QUERY PLAN checks for the main analytical queries: each must be
+answered from the named index (and covering indexes must not touch the table).
+
+  python -m google_play_reviews.benchmarks.query_plans [--db path]
+
+Exits non-zero if any plan regresses. Without --db a scratch DB is created.
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from ..pipeline.db import connect
+
+# name -> (sql, params, expected index, must be covering)
+ANALYTICAL_QUERIES = {
+    "daily_rating_series": (
+        """
+        SELECT date(review_date) AS day, COUNT(*), AVG(rating)
+        FROM reviews
+        WHERE app_id = ? AND review_date >= ?
+        GROUP BY day
+        """,
+        ("com.example.app", "2025-01-01"),
+        "idx_reviews_app_date_rating",
+        True,
+    ),
+    "monthly_rating_series": (
+        """
+        SELECT strftime('%Y-%m', review_date) AS month, COUNT(*), AVG(rating)
+        FROM reviews
+        WHERE app_id = ?
+        GROUP BY month
+        """,
+        ("com.example.app",),
+        "idx_reviews_app_date_rating",
+        True,
+    ),
+    "rating_distribution": (
+        "SELECT rating, COUNT(*) FROM reviews WHERE app_id = ? GROUP BY rating",
+        ("com.example.app",),
+        "idx_reviews_app_rating",
+        True,
+    ),
+    "low_rating_reviews": (
+        "SELECT review_uid, review_text FROM reviews WHERE app_id = ? AND rating <= 2",
+        ("com.example.app",),
+        "idx_reviews_app_rating",
+        False,
+    ),
+    "version_rating_stats": (
+        """
+        SELECT app_version, COUNT(*), AVG(rating)
+        FROM reviews
+        WHERE app_id = ?
+        GROUP BY app_version
+        """,
+        ("com.example.app",),
+        "idx_reviews_app_version_rating",
+        True,
+    ),
+    "rollup_monthly_series": (
+        """
+        SELECT month, reviews, rating_sum
+        FROM rollup_monthly
+        WHERE app_id = ? AND month >= ? AND month <= ?
+        """,
+        ("com.example.app", "2024-01", "2025-12"),
+        "PRIMARY KEY",  # WITHOUT ROWID table: the primary key holds every column
+        False,
+    ),
+    "known_uid_lookup": (
+        "SELECT review_uid, rating, review_text, thumbs_up FROM reviews WHERE uid_key IN (?, ?)",
+        (1, 2),
+        "idx_reviews_uid_key",
+        False,
+    ),
+    "labels_for_review": (
+        "SELECT label_type, label_value FROM labels WHERE review_id = ?",
+        ("abc",),
+        "idx_labels_review",
+        False,
+    ),
+}
+
+
+def explain(conn: sqlite3.Connection, sql: str, params=()) -> list[str]:
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def check_query_plans(conn: sqlite3.Connection) -> list[str]:
+    """
+    Returns a list of failures (empty when every query uses its index).
+    """
+    failures = []
+    for name, (sql, params, index, covering) in ANALYTICAL_QUERIES.items():
+        plan = explain(conn, sql, params)
+        detail = " | ".join(plan)
+        if not any(index in step for step in plan):
+            failures.append(f"{name}: expected {index}, plan: {detail}")
+        elif covering and not any(f"COVERING INDEX {index}" in step for step in plan):
+            failures.append(f"{name}: expected covering {index}, plan: {detail}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify analytical queries use their indexes")
+    parser.add_argument("--db", default=None, help="DB to check (default: scratch DB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or str(Path(tmp) / "plans.db")
+        conn = connect(db_path)
+        try:
+            for name, (sql, params, _, _) in ANALYTICAL_QUERIES.items():
+                print(f"{name}: {' | '.join(explain(conn, sql, params))}")
+            failures = check_query_plans(conn)
+        finally:
+            conn.close()
+
+    if failures:
+        print("\nFAILED:\n" + "\n".join(failures))
+        sys.exit(1)
+    print("\nAll query plans use their indexes.")
+
+
+if __name__ == "__main__":
+    main()
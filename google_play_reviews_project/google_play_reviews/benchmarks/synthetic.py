@@ -0,0 +1,239 @@
+"""
+Seeded synthetic Play reviews with the distributions the README reports
+for the collected data, for benchmarks at sizes we cannot scrape:
+
+- ratings polarized: mostly 5 stars, a meaningful share of 1 star, few 2-4,
+  with the 1-star share shifting between app versions (non-stationary
+  sentiment);
+- text length right-skewed (log-normal words), longer for low ratings,
+  short and emoji-only texts concentrated in 5-star reviews, a few empty;
+- review dates skewed to recent months (exponential age);
+- app_version the release current at the review date, sometimes an older
+  one, and missing for a share of rows;
+- thumbs_up heavy-tailed and growing with text length (informativeness);
+- a small share of exact duplicate reviews.
+
+generate_reviews() returns an EXPECTED_COLS frame as the scraper produces
+it (rows newest first). SyntheticPlayStore serves such a frame through the
+google_play_scraper.reviews interface, newest rows for Sort.NEWEST and
+most_relevant rows by thumbs_up for Sort.MOST_RELEVANT, so the scraper
+stage runs on the same data (see benchmarks/bench_pipeline.py).
+
+  python -m google_play_reviews.benchmarks.synthetic --rows 100000 --out /tmp/synthetic.csv
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from google_play_scraper import Sort
+
+from ..pipeline.scraper import EXPECTED_COLS, PAGE_SOURCE_FIELDS
+from ..pipeline.storage import detect_format, write_frame
+from .fake_play import FakeContinuationToken, FakePlayStore
+
+END_DATE = datetime(2026, 1, 1)
+
+DEFAULT_PARAMS = {
+    "rating_p": [0.16, 0.04, 0.05, 0.09, 0.66],         # 1..5 stars
+    "version_shift_sd": 0.4,                            # log-odds sd of a version's 1-star vs 5-star shift
+    "words_mu": {1: 3.0, 2: 3.0, 3: 2.7, 4: 2.2, 5: 1.5},  # log-normal mean of words per review, by rating
+    "words_sigma": 0.9,
+    "max_words": 400,
+    "emoji_only_5star": 0.04,                           # share of 5-star texts that are emoji/symbols only
+    "empty_text": 0.003,
+    "recency_days": 75,                                 # mean review age
+    "span_days": 3 * 365,
+    "release_every_days": 14,
+    "older_version": 0.25,                              # share of reviews from a release behind the current one
+    "missing_version": 0.12,
+    "thumbs_base": 0.15,
+    "thumbs_per_word": 0.02,
+    "thumbs_dispersion": 0.3,                           # negative binomial shape; lower = heavier tail
+    "duplicate_rate": 0.001,
+    "text_pool": 4096,                                  # distinct texts per rating
+}
+
+POSITIVE = ("great love easy helpful amazing useful fast best perfect smart accurate "
+            "awesome excellent nice good recommend works brilliant").split()
+NEGATIVE = ("crash crashes slow login error bug broken wrong worse useless freezes "
+            "subscription refund update lost stuck annoying disappointed fails").split()
+NEUTRAL = ("the app it and to i a is for this but my when with on answers chat "
+           "voice model version history after before feature phone time really").split()
+EMOJI = ["👍", "❤️", "🔥", "😊", "👌", "⭐", "🙏", "😍", "!!", "..."]
+
+
+def _text_pool(rng, rating: int, size: int, params: dict) -> np.ndarray:
+    words = np.clip(np.rint(rng.lognormal(params["words_mu"][rating], params["words_sigma"], size)), 1,
+                    params["max_words"]).astype(int)
+    tone = POSITIVE if rating >= 4 else NEGATIVE if rating <= 2 else POSITIVE + NEGATIVE
+    pool = []
+    for n in words:
+        n_tone = max(1, n // 4)
+        parts = list(rng.choice(tone, n_tone)) + list(rng.choice(NEUTRAL, n - n_tone))
+        rng.shuffle(parts)
+        pool.append(" ".join(parts).capitalize())
+    if rating == 5:
+        n_emoji = int(size * params["emoji_only_5star"])
+        for i in rng.choice(size, n_emoji, replace=False):
+            pool[i] = "".join(rng.choice(EMOJI, rng.integers(1, 4)))
+    return np.array(pool, dtype=object)
+
+
+def generate_reviews(rows: int, seed: int = 0, params: dict | None = None,
+                     end_date: datetime = END_DATE) -> pd.DataFrame:
+    """
+    `rows` synthetic reviews (EXPECTED_COLS), newest first. The same seed
+    and params always give the same frame.
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    rng = np.random.default_rng(seed)
+
+    # Dates: exponential age, folded into the span
+    age_s = (rng.exponential(p["recency_days"], rows) % p["span_days"]) * 86400
+    dates = pd.Timestamp(end_date) - pd.to_timedelta(np.rint(age_s), unit="s")
+
+    # Versions: the release current at the review date, sometimes an older one
+    n_releases = p["span_days"] // p["release_every_days"] + 1
+    release = (p["span_days"] - age_s / 86400) // p["release_every_days"]
+    release = release - (rng.random(rows) < p["older_version"]) * rng.geometric(0.5, rows)
+    release = np.clip(release, 0, n_releases - 1).astype(int)
+    versions = np.array([f"1.{r // 10}.{r % 10}" for r in range(n_releases)], dtype=object)
+
+    # Ratings: base mix, 1- vs 5-star share shifted per release
+    shift = rng.normal(0.0, p["version_shift_sd"], n_releases)
+    base = np.asarray(p["rating_p"], dtype=float)
+    rating = np.empty(rows, dtype=np.int64)
+    for r in np.unique(release):
+        idx = np.flatnonzero(release == r)
+        probs = base * np.exp([-shift[r], 0, 0, 0, shift[r]])
+        rating[idx] = rng.choice([1, 2, 3, 4, 5], len(idx), p=probs / probs.sum())
+
+    # Text: drawn from a per-rating pool of distinct texts
+    pools = {r: _text_pool(rng, r, p["text_pool"], p) for r in range(1, 6)}
+    text = np.empty(rows, dtype=object)
+    for r, pool in pools.items():
+        idx = np.flatnonzero(rating == r)
+        text[idx] = pool[rng.integers(0, len(pool), len(idx))]
+    text[rng.random(rows) < p["empty_text"]] = None
+    words = pd.Series(text).str.count(" ").fillna(-1).to_numpy() + 1
+
+    # Engagement: heavy-tailed, rewarding longer (more informative) reviews
+    lam = p["thumbs_base"] + p["thumbs_per_word"] * words
+    k = p["thumbs_dispersion"]
+    thumbs = rng.negative_binomial(k, k / (k + lam))
+
+    app_version = versions[release]
+    app_version[rng.random(rows) < p["missing_version"]] = None
+
+    uids = rng.bytes(16 * rows).hex()
+    df = pd.DataFrame({
+        "review_uid": [uids[i:i + 32] for i in range(0, 32 * rows, 32)],
+        "user_name": "user_" + pd.Series(rng.integers(0, max(rows, 1) * 4, rows)).astype(str),
+        "rating": rating,
+        "review_text": text,
+        "review_date": dates,
+        "thumbs_up": thumbs,
+        "app_version": app_version,
+        "sort_mode": np.where(rng.random(rows) < 0.5, "newest", "most_relevant").astype(object),
+        "scrape_time": pd.Timestamp(end_date) + pd.Timedelta(hours=12),
+    })
+
+    # Exact duplicates: a few rows repeat others
+    n_dup = int(rows * p["duplicate_rate"])
+    if n_dup:
+        take = np.arange(rows)
+        take[rng.choice(rows, n_dup, replace=False)] = rng.choice(rows, n_dup, replace=False)
+        df = df.take(take)
+
+    return df.sort_values("review_date", ascending=False, kind="stable", ignore_index=True)[EXPECTED_COLS]
+
+
+def distribution_summary(df: pd.DataFrame) -> dict:
+    """
+    The README's headline figures for a frame, to check a synthetic one against.
+    """
+    text = df["review_text"].fillna("").astype(str)
+    words = text.str.split().str.len()
+    age_days = (df["review_date"].max() - df["review_date"]).dt.days
+    return {
+        "rows": len(df),
+        "rating_share": {int(k): round(float(v), 3) for k, v in df["rating"].value_counts(normalize=True).sort_index().items()},
+        "words_median": float(words.median()),
+        "words_mean": round(float(words.mean()), 1),
+        "words_p95": float(words.quantile(0.95)),
+        "words_median_by_rating": {int(k): float(v) for k, v in words.groupby(df["rating"]).median().items()},
+        "pct_very_short_le_3_words_5star": round(float((words[df["rating"] == 5] <= 3).mean()), 3),
+        "pct_within_90_days": round(float((age_days <= 90).mean()), 3),
+        "pct_app_version_missing": round(float(df["app_version"].isna().mean()), 3),
+        "thumbs_up_mean": round(float(df["thumbs_up"].mean()), 2),
+        "thumbs_up_max": int(df["thumbs_up"].max()),
+        "duplicate_uids": int(df["review_uid"].duplicated().sum()),
+    }
+
+
+class SyntheticPlayStore(FakePlayStore):
+    """
+    FakePlayStore serving a generate_reviews() frame: Sort.NEWEST pages walk
+    the newest rows by date, any other sort walks the most_relevant rows by
+    thumbs_up, so scraping both sorts to the end returns every row once
+    (duplicates aside). One frame serves every app_id.
+    """
+
+    def __init__(self, df: pd.DataFrame, latency_sec: float = 0.0):
+        super().__init__(reviews_per_app=len(df), latency_sec=latency_sec)
+        self.columns = {field: df[col].tolist() for col, field in PAGE_SOURCE_FIELDS.items()}
+        self.columns["at"] = [d.to_pydatetime() for d in df["review_date"]]
+        self.columns["reviewId"] = df["review_uid"].tolist()
+        newest = df["sort_mode"].to_numpy() == "newest"
+        relevant = df.loc[~newest, "thumbs_up"].sort_values(ascending=False, kind="stable").index
+        self.order = {Sort.NEWEST.value: np.flatnonzero(newest), "other": relevant.to_numpy()}
+
+    def make_review(self, app_id, k):
+        return {field: values[k] for field, values in self.columns.items()}
+
+    def reviews(self, app_id, lang="en", country="us", sort=Sort.NEWEST, count=100,
+                filter_score_with=None, filter_device_with=None, continuation_token=None):
+        with self._lock:
+            self.calls += 1
+
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            offset = continuation_token.token
+            lang, country = continuation_token.lang, continuation_token.country
+            sort, count = continuation_token.sort, continuation_token.count
+        else:
+            offset = 0
+            sort = sort.value
+
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+
+        order = self.order[sort if sort == Sort.NEWEST.value else "other"]
+        end = min(offset + count, len(order))
+        result = [self.make_review(app_id, k) for k in order[offset:end]]
+        next_token = end if end < len(order) else None
+        return result, FakeContinuationToken(next_token, lang, country, sort, count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic Play reviews")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Write the frame here (.csv, .parquet or .feather)")
+    args = parser.parse_args()
+
+    df = generate_reviews(args.rows, seed=args.seed)
+    for k, v in distribution_summary(df).items():
+        print(f"{k}: {v}")
+    if args.out:
+        write_frame(df, args.out, detect_format(args.out))
+        print(f"Saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Apple App Store reviews from the public customer-reviews RSS feed, mapped
+onto the pipeline's EXPECTED_COLS schema so they go through the same
+cleaning, known-review split and upsert as Google Play pages.
+
+The feed serves up to 10 pages of 50 reviews per (app, country), most
+recent first. For each app, page 1 is fetched first to learn the last
+page number, then the remaining pages. All pages of all apps share one
+worker pool and one pooled requests.Session (keep-alive, retries with
+backoff on connection errors / 429 / 5xx, Retry-After honoured). A
+per-host rate limiter caps the total request rate. Pages are yielded as
+they arrive.
+
+Mapping: review_uid hashes (author, updated, text) like the Play scraper;
+review_text is the title and body joined by a newline; thumbs_up is
+im:voteSum; app_version is im:version; sort_mode is "most_recent". App
+Store apps are registered in the apps table with platform "app_store".
+
+  python -m google_play_reviews.pipeline.appstore 6448311069 --country us
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .scraper import EXPECTED_COLS, page_frame
+from .throttle import host_limiter
+from .uids import DEFAULT_UID_SCHEME, review_uids
+
+APPSTORE_HOST = "itunes.apple.com"
+APPSTORE_BASE_URL = f"https://{APPSTORE_HOST}"
+APPSTORE_PLATFORM = "app_store"
+SORT_NAME = "most_recent"
+MAX_PAGES = 10
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_PAGE_RE = re.compile(r"/page=(\d+)/")
+
+
+def feed_url(app_id: str, country: str = "us", page: int = 1, base_url: str = APPSTORE_BASE_URL) -> str:
+    return f"{base_url}/{country}/rss/customerreviews/page={page}/id={app_id}/sortby=mostrecent/json"
+
+
+def make_session(pool_size: int = 8, retries: int = 4, backoff: float = 0.5) -> requests.Session:
+    """
+    Session whose connection pool holds `pool_size` keep-alive connections
+    per host, retrying GETs on connection errors and RETRY_STATUSES.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept"] = "application/json"
+    return session
+
+
+def _label(entry: dict, *path):
+    for key in path:
+        entry = entry.get(key) if isinstance(entry, dict) else None
+    return entry.get("label") if isinstance(entry, dict) else None
+
+
+def _int_label(entry: dict, key: str):
+    try:
+        return int(_label(entry, key))
+    except (TypeError, ValueError):
+        return None
+
+
+def last_page(feed: dict) -> int:
+    """
+    Last page number from the feed's rel="last" link (1 when absent).
+    """
+    links = feed.get("feed", {}).get("link", [])
+    for link in links if isinstance(links, list) else [links]:
+        attrs = link.get("attributes", {}) if isinstance(link, dict) else {}
+        if attrs.get("rel") == "last":
+            m = _PAGE_RE.search(attrs.get("href", ""))
+            if m:
+                return min(int(m.group(1)), MAX_PAGES)
+    return 1
+
+
+def feed_columns(feed: dict) -> dict:
+    """
+    Column lists (page_frame layout, review_uid excluded) for the review
+    entries of one feed page. Entries without a rating (the app's own
+    metadata entry on some feeds) are skipped.
+    """
+    entries = feed.get("feed", {}).get("entry", [])
+    if isinstance(entries, dict):
+        entries = [entries]
+    entries = [e for e in entries if "im:rating" in e]
+
+    def text(e):
+        title, body = _label(e, "title"), _label(e, "content")
+        return "\n".join(part for part in (title, body) if part)
+
+    updated = pd.to_datetime([_label(e, "updated") for e in entries], errors="coerce", utc=True)
+    return {
+        "user_name": [_label(e, "author", "name") for e in entries],
+        "rating": [_int_label(e, "im:rating") for e in entries],
+        "review_text": [text(e) for e in entries],
+        # Naive UTC, like the Play scraper's review dates
+        "review_date": [None if pd.isna(t) else t.tz_convert(None).to_pydatetime() for t in updated],
+        "thumbs_up": [_int_label(e, "im:voteSum") for e in entries],
+        "app_version": [_label(e, "im:version") for e in entries],
+    }
+
+
+def feed_frame(feed: dict, app_id: str, scrape_time, uid_scheme: str = DEFAULT_UID_SCHEME) -> pd.DataFrame:
+    """
+    One feed page as an ["app_id"] + EXPECTED_COLS frame.
+    """
+    columns = feed_columns(feed)
+    columns["review_uid"] = review_uids(columns["user_name"], columns["review_date"], columns["review_text"],
+                                        scheme=uid_scheme)
+    df = page_frame(columns, SORT_NAME, scrape_time)
+    df.insert(0, "app_id", app_id)
+    return df
+
+
+def scrape_appstore_pages(apps, max_workers=8, requests_per_sec=None, base_url=APPSTORE_BASE_URL,
+                          session=None, uid_scheme=DEFAULT_UID_SCHEME, page_latency=None,
+                          timeout=15, logger=None):
+    """
+    Yield deduplicated ["app_id"] + EXPECTED_COLS page frames for every
+    app in `apps` ({"app_id": ..., "country": ...} dicts or app_id
+    strings), all pages fetched concurrently on `max_workers` threads.
+    An app whose page fails after retries is logged and skipped.
+    """
+    apps = [a if isinstance(a, dict) else {"app_id": a} for a in apps]
+    own_session = session is None
+    session = session or make_session(pool_size=max_workers)
+    limiter = host_limiter(APPSTORE_HOST, requests_per_sec)
+    failed = set()
+    failed_lock = threading.Lock()
+
+    def _fetch(app, page):
+        if limiter is not None:
+            limiter.acquire()
+        url = feed_url(app["app_id"], app.get("country", "us"), page, base_url)
+        t0 = time.perf_counter()
+        resp = session.get(url, timeout=timeout)
+        if page_latency is not None:
+            page_latency.observe(time.perf_counter() - t0)
+        resp.raise_for_status()
+        return resp.json(), datetime.utcnow()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="appstore")
+    try:
+        pending = {pool.submit(_fetch, app, 1): (app, 1) for app in apps}
+        seen = set()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                app, page = pending.pop(future)
+                try:
+                    feed, scrape_time = future.result()
+                except (requests.RequestException, ValueError) as e:
+                    with failed_lock:
+                        failed.add(app["app_id"])
+                    if logger:
+                        logger.warning(f"[APPSTORE] app_id={app['app_id']} page={page} error={e!r}")
+                    continue
+                if page == 1:
+                    for p in range(2, last_page(feed) + 1):
+                        pending[pool.submit(_fetch, app, p)] = (app, p)
+
+                df = feed_frame(feed, app["app_id"], scrape_time, uid_scheme=uid_scheme)
+                df = df.drop_duplicates(subset="review_uid")
+                df = df[~df["review_uid"].isin(seen)]
+                seen.update(df["review_uid"])
+                if not df.empty:
+                    yield df.reset_index(drop=True)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if own_session:
+            session.close()
+    if failed and logger:
+        logger.warning(f"[APPSTORE] failed_apps={sorted(failed)}")
+
+
+def scrape_appstore(apps, **kwargs) -> pd.DataFrame:
+    """
+    All pages of scrape_appstore_pages as one frame.
+    """
+    pages = list(scrape_appstore_pages(apps, **kwargs))
+    if not pages:
+        return pd.DataFrame(columns=["app_id"] + EXPECTED_COLS)
+    return pd.concat(pages, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch App Store RSS reviews into the pipeline schema")
+    parser.add_argument("app_ids", nargs="+")
+    parser.add_argument("--country", default="us")
+    parser.add_argument("--base-url", default=APPSTORE_BASE_URL)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--out", default=None, help="Write the frame to this CSV")
+    args = parser.parse_args()
+
+    df = scrape_appstore([{"app_id": a, "country": args.country} for a in args.app_ids],
+                         max_workers=args.workers, base_url=args.base_url)
+    print(df.groupby("app_id").size().to_string() if not df.empty else "no reviews")
+    if args.out:
+        df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
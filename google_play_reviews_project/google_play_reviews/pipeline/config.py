@@ -11,14 +11,109 @@ PIPELINE_CONFIG = {
     "raw_out_dir": str(PROJECT_ROOT / "data" / "raw"),
     "processed_out_dir": str(PROJECT_ROOT / "data" / "processed"),
     "logs_dir": str(PROJECT_ROOT / "data" /"logs"),
+
+    # Run output format: "csv", "parquet" or "feather" (Arrow IPC); the columnar
+    # formats keep typed columns and need pyarrow. Compression None = format default
+    "output_format": "csv",
+    "output_compression": None,
+
     "app_id": "com.openai.chatgpt",
     "lang": "en",
     "country": "us",
     "target_per_mode": 2500,
     "use_scraper": True,
 
+    # Scraper concurrency: one worker per (app_id, sort_mode, country, lang) stream,
+    # all sharing a per-host limit on page requests/sec (None = unlimited)
+    "scrape_workers": 4,
+    "rate_limit_per_sec": 5.0,
+
+    # Play page response cache (pipeline/response_cache.py): "record" serves cached pages
+    # younger than the TTL and stores fetched ones, "refresh" always fetches and stores,
+    # "replay" serves only cached pages and never touches the network, "off" disables it.
+    # Least recently used pages are evicted past max_mb
+    "response_cache": "off",
+    "response_cache_dir": str(PROJECT_ROOT / "data" / "cache" / "responses"),
+    "response_cache_ttl_hours": 24,
+    "response_cache_max_mb": 512,
+
+    # Apple App Store apps (pipeline/appstore.py), e.g. {"app_id": "6448311069", "country": "us"},
+    # scraped after the Play app on one pooled keep-alive session and loaded into the same
+    # reviews table (apps.platform = "app_store"). Empty = Play only
+    "appstore_apps": [],
+    "appstore_base_url": "https://itunes.apple.com",
+    "appstore_workers": 8,
+    "appstore_rate_limit_per_sec": 10.0,
+
+    # review_uid hashing (see uids.py): "sha256" matches existing rows; "blake2b"/"xxh128"
+    # give shorter uids but re-key everything, so only switch on a fresh DB.
+    # uid_stats logs collision / cross-sort stability counters per run: a diagnostic that
+    # keeps per-uid state for the whole run, so memory grows with the run's reviews
+    "uid_scheme": "sha256",
+    "uid_stats": False,
+
+    # Streaming mode: clean, save and load page by page instead of whole-run DataFrames
+    "streaming": False,
+    "db_batch_rows": 2000,
+
+    # Checkpointing (requires load_to_db, implies streaming): each page is loaded in one
+    # transaction with its stream positions and the run's counters, so an interrupted run
+    # continues after its last committed page with `run_pipeline --resume <run_id>`
+    "checkpointing": False,
+
+    # Incremental mode: fetch only reviews newer than the per-(app_id, sort_mode)
+    # cursor stored in the DB (requires load_to_db)
+    "incremental": True,
+
+    # Incremental EDA: per-run partial profiles merged into a rolling cumulative summary
+    "eda_incremental": True,
+    "eda_state_dir": str(PROJECT_ROOT / "data" / "eda"),
+    "eda_report_dir": str(PROJECT_ROOT / "reports" / "eda"),
+
+    # Incremental keyword stats (analysis/keywords.py): each run's processed rows are
+    # added to a persisted vocabulary + per-rating/version/month term counts
+    "keywords_incremental": True,
+    "keywords_state_dir": str(PROJECT_ROOT / "data" / "keywords"),
+
+    # Per-app_version regression alerts from rollup_version after each run (requires
+    # load_to_db); params override analysis/version_alerts.py DEFAULT_PARAMS
+    "version_alerts": True,
+    "version_alerts_dir": str(PROJECT_ROOT / "reports" / "alerts"),
+    "version_alert_params": {},
+
+    # Run metrics (pipeline/metrics.py: stage wall/CPU/peak RSS, page latency) always go
+    # to run_metadata_*.json and, with load_to_db, the pipeline_runs table. cProfile
+    # (main thread only) and tracemalloc slow the run down, so they are opt-in
+    "profile_cprofile": False,
+    "profile_tracemalloc": False,
+
+    # Multi-app scheduler (pipeline/scheduler.py): apps from a JSON file or (None) the apps
+    # table, run on worker processes. Depth and frequency follow each app's reviews/hour over
+    # the velocity window: an app is due every ~new_reviews_per_run reviews (within the
+    # interval bounds) and fetches expected-new x depth_margin per sort mode (within the
+    # target bounds). The request budget caps page requests per cycle over all apps
+    "scheduler_apps_file": None,
+    "scheduler_workers": 2,
+    "scheduler_request_budget": 400,
+    "scheduler_velocity_window_hours": 7 * 24,
+    "scheduler_new_reviews_per_run": 200,
+    "scheduler_min_interval_hours": 1,
+    "scheduler_max_interval_hours": 7 * 24,
+    "scheduler_min_target": 200,
+    "scheduler_max_target": 10000,
+    "scheduler_depth_margin": 1.5,
+
+    # Stage / end-to-end benchmark history (benchmarks/bench_pipeline.py run / compare)
+    "benchmark_history_path": str(PROJECT_ROOT / "data" / "benchmarks" / "history.json"),
+
     # Database config
     "load_to_db": True,
     "db_path": str(PROJECT_ROOT / "data" / "db" / "reviews.db"),
+    # Leave rows whose rating/text/thumbs_up/app_version fingerprint is unchanged
+    # untouched; last sighting goes to review_last_seen instead
+    "db_change_detection": True,
+    # Look scraped uids up in the DB (batched, via uid_key) and only save/load
+    # reviews that are new or whose rating/text/thumbs_up changed
+    "skip_known_reviews": True,
 }
 
@@ -1,68 +1,582 @@
+import hashlib
+import json
 import sqlite3
 from pathlib import Path
 import pandas as pd
 
+from .migrations import migrate
+from .rollups import apply_staged_deltas, rebuild_rollups, rollups_missing
+from .scraper import StreamCheckpoint, StreamCursor
+from .uids import uid_keys
+
 SCHEMA_PATH = Path(__file__).resolve().parents[1] / "schema" / "schema_sqlite.sql"
 
+# Connection-level pragmas for bulk loads. WAL is set once per DB file in init_db;
+# synchronous=NORMAL is durable under WAL except for the last commit on power loss.
+BULK_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # KiB (negative) -> ~64 MB page cache
+    "temp_store": "MEMORY",
+}
+
+REVIEW_COLS = [
+    "review_uid", "app_id", "user_name", "rating",
+    "review_text", "review_date", "thumbs_up",
+    "app_version", "sort_mode", "scrape_time", "run_id", "uid_key", "content_fp"
+]
+
+UPSERT_CONFLICT_SQL = """
+ON CONFLICT(review_uid) DO UPDATE SET
+    rating=excluded.rating,
+    review_text=excluded.review_text,
+    review_date=excluded.review_date,
+    thumbs_up=excluded.thumbs_up,
+    app_version=excluded.app_version,
+    content_fp=excluded.content_fp,
+    sort_mode=excluded.sort_mode,
+    scrape_time=excluded.scrape_time,
+    run_id=excluded.run_id
+"""
+
+# Change-aware variant: a row whose content fingerprint matches is left untouched;
+# scrape_time / run_id / sort_mode then record when the content last changed
+CHANGED_CONFLICT_SQL = UPSERT_CONFLICT_SQL + """
+WHERE reviews.content_fp IS NOT excluded.content_fp
+"""
+
+LAST_SEEN_SQL = """
+INSERT INTO review_last_seen (review_uid, run_id, scrape_time, sort_mode)
+SELECT review_uid, run_id, scrape_time, sort_mode FROM staging_reviews WHERE true
+ON CONFLICT(review_uid) DO UPDATE SET
+    run_id=excluded.run_id,
+    scrape_time=excluded.scrape_time,
+    sort_mode=excluded.sort_mode
+"""
 
-def init_db(db_path: str):
+_INITIALIZED = set()
+
+
+def init_db(db_path: str, force: bool = False):
+    """
+    Bring the DB to the latest schema version (see migrations.py). Checked
+    once per DB file per process; force=True checks again.
+    """
+    key = str(Path(db_path).resolve())
+    if key in _INITIALIZED and not force:
+        return
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
-        conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        with conn:
+            migrate(conn)
+            conn.execute("PRAGMA journal_mode=WAL")
+            backfill_uid_keys(conn)
+            backfill_content_fps(conn)
+            if rollups_missing(conn):
+                rebuild_rollups(conn)
+    finally:
+        conn.close()
+    _INITIALIZED.add(key)
+
+
+def content_fingerprint(rating, review_text, thumbs_up, app_version) -> int:
+    """
+    Signed 64-bit hash of a review's mutable content, from DB-ready values.
+    """
+    raw = "\x1f".join("" if v is None else str(v) for v in (rating, review_text, thumbs_up, app_version))
+    return int.from_bytes(hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
 
 
-def upsert_reviews(df: pd.DataFrame, db_path: str, app_id: str, run_id: str):
+def backfill_content_fps(conn: sqlite3.Connection):
+    """
+    Fill reviews.content_fp for rows loaded before migration 0004.
+    """
+    conn.create_function("content_fingerprint", 4, content_fingerprint, deterministic=True)
+    with conn:
+        conn.execute(
+            "UPDATE reviews SET content_fp = content_fingerprint(rating, review_text, thumbs_up, app_version) "
+            "WHERE content_fp IS NULL"
+        )
+
+
+def backfill_uid_keys(conn: sqlite3.Connection, chunk_rows: int = 50_000) -> int:
+    """
+    Fill reviews.uid_key for rows loaded before migration 0003.
+    """
+    total = 0
+    while True:
+        uids = [r[0] for r in conn.execute(
+            "SELECT review_uid FROM reviews WHERE uid_key IS NULL LIMIT ?", (chunk_rows,)
+        )]
+        if not uids:
+            return total
+        with conn:
+            conn.executemany(
+                "UPDATE reviews SET uid_key = ? WHERE review_uid = ?",
+                zip(uid_keys(uids).tolist(), uids),
+            )
+        total += len(uids)
+
+
+def connect(db_path: str) -> sqlite3.Connection:
     init_db(db_path)
+    # Wait for other processes' write transactions (e.g. scheduler workers) instead of failing fast
+    conn = sqlite3.connect(db_path, timeout=30)
+    for name, value in BULK_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
 
-    df = df.copy()
-    df["app_id"] = app_id
-    df["run_id"] = run_id
-       
-    if "rating" in df.columns:
-        df["rating"] = pd.to_numeric(df["rating"], errors="coerce").astype("Int64")
 
-    if "thumbs_up" in df.columns:
-        df["thumbs_up"] = pd.to_numeric(df["thumbs_up"], errors="coerce").astype("Int64")
+def _nullable(values: pd.Series) -> list:
+    return values.astype(object).where(values.notna(), None).tolist()
 
-    df["rating"] = df["rating"].astype(object).where(df["rating"].notna(), None)
-    df["thumbs_up"] = df["thumbs_up"].astype(object).where(df["thumbs_up"].notna(), None)
 
+def iter_review_rows(df: pd.DataFrame, app_id: str, run_id: str, chunk_rows: int = 50_000):
+    """
+    Yield DB-ready tuples (REVIEW_COLS order), converting `chunk_rows` rows
+    at a time so no full converted copy of `df` is ever built.
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        n = len(chunk)
+        cols = {}
+        for col in ["review_uid", "user_name", "review_text", "app_version", "sort_mode"]:
+            cols[col] = _nullable(chunk[col]) if col in chunk.columns else [None] * n
+        for col in ["rating", "thumbs_up"]:
+            if col in chunk.columns:
+                cols[col] = pd.to_numeric(chunk[col], errors="coerce").astype("Int64") \
+                              .to_numpy(dtype=object, na_value=None).tolist()
+            else:
+                cols[col] = [None] * n
+        for col in ["review_date", "scrape_time"]:
+            if col in chunk.columns:
+                cols[col] = _nullable(pd.to_datetime(chunk[col], errors="coerce")
+                                      .dt.strftime("%Y-%m-%d %H:%M:%S"))
+            else:
+                cols[col] = [None] * n
+        cols["app_id"] = [app_id] * n
+        cols["run_id"] = [run_id] * n
+        cols["uid_key"] = uid_keys(cols["review_uid"]).tolist()
+        cols["content_fp"] = [
+            content_fingerprint(*v)
+            for v in zip(cols["rating"], cols["review_text"], cols["thumbs_up"], cols["app_version"])
+        ]
 
+        yield from zip(*(cols[c] for c in REVIEW_COLS))
 
-    for col in ["review_date", "scrape_time"]:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce") \
-                         .dt.strftime("%Y-%m-%d %H:%M:%S")
 
-    with sqlite3.connect(db_path) as conn:
-        conn.execute(
-            "INSERT OR IGNORE INTO apps(app_id) VALUES (?)",
+def upsert_reviews(df: pd.DataFrame, db_path: str, app_id: str, run_id: str,
+                   chunk_rows: int = 50_000, change_detection: bool = False,
+                   update_rollups: bool = True, update_search_index: bool = True,
+                   checkpoint: dict | None = None) -> dict:
+    """
+    Upsert `df` into reviews in a single transaction.
+
+    Rows are bulk-inserted into an unindexed temp table first and merged
+    with one INSERT ... SELECT ... ON CONFLICT, which is faster for large
+    loads than per-row conflict handling. Returns {"inserted", "updated",
+    "unchanged"} counts, by content fingerprint.
+
+    change_detection=True skips the UPDATE for rows whose content
+    fingerprint is unchanged and records every row's last sighting in
+    review_last_seen instead.
+
+    update_rollups=True adds the new / changed rows to the rollup tables in
+    the same transaction (see rollups.py); only turn it off for loads that
+    are followed by rollups.rebuild_rollups.
+
+    update_search_index=True adds newly inserted reviews to the reviews_fts
+    full-text index; turn it off only for loads followed by
+    rebuild_search_index.
+
+    checkpoint: run checkpoint committed in the same transaction as the
+    rows (see save_run_checkpoint).
+    """
+    placeholders = ", ".join("?" for _ in REVIEW_COLS)
+    col_list = ", ".join(REVIEW_COLS)
+    rows = iter_review_rows(df, app_id, run_id, chunk_rows=chunk_rows)
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO apps(app_id) VALUES (?)",
+                (app_id,),
+            )
+
+            conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS staging_reviews AS "
+                f"SELECT {col_list} FROM reviews WHERE 0"
+            )
+            conn.execute("DELETE FROM staging_reviews")
+            conn.executemany(
+                f"INSERT INTO staging_reviews ({col_list}) VALUES ({placeholders})",
+                rows,
+            )
+            total, inserted, updated = conn.execute(
+                """
+                SELECT COUNT(*),
+                       COALESCE(SUM(r.review_uid IS NULL), 0),
+                       COALESCE(SUM(r.review_uid IS NOT NULL AND r.content_fp IS NOT s.content_fp), 0)
+                FROM staging_reviews s
+                LEFT JOIN reviews r ON r.review_uid = s.review_uid
+                """
+            ).fetchone()
+            counts = {"inserted": inserted, "updated": updated, "unchanged": total - inserted - updated}
+            if update_rollups:
+                apply_staged_deltas(conn)
+            if update_search_index:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS staged_new_uids (review_uid TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM staged_new_uids")
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO staged_new_uids
+                    SELECT s.review_uid FROM staging_reviews s
+                    WHERE NOT EXISTS (SELECT 1 FROM reviews r WHERE r.review_uid = s.review_uid)
+                    """
+                )
+
+            # WHERE true disambiguates ON CONFLICT after a SELECT
+            conn.execute(
+                f"INSERT INTO reviews ({col_list}) "
+                f"SELECT {col_list} FROM staging_reviews WHERE true "
+                + (CHANGED_CONFLICT_SQL if change_detection else UPSERT_CONFLICT_SQL)
+            )
+            if change_detection:
+                conn.execute(LAST_SEEN_SQL)
+            if update_search_index:
+                conn.execute(
+                    """
+                    INSERT INTO reviews_fts(rowid, review_text)
+                    SELECT r.review_rowid, r.review_text
+                    FROM staged_new_uids n JOIN reviews r ON r.review_uid = n.review_uid
+                    """
+                )
+                conn.execute("DELETE FROM staged_new_uids")
+            conn.execute("DELETE FROM staging_reviews")
+            if checkpoint is not None:
+                _write_run_checkpoint(conn, checkpoint)
+    finally:
+        conn.close()
+
+    return counts
+
+
+def rebuild_search_index(db_path: str):
+    """
+    Rebuild reviews_fts from the reviews table.
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute("INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild')")
+    finally:
+        conn.close()
+
+
+def record_last_seen(df: pd.DataFrame, db_path: str, run_id: str):
+    """
+    Note a sighting of already-stored reviews in review_last_seen only, e.g.
+    for rows split_known_reviews dropped as unchanged.
+    """
+    if df.empty:
+        return
+    scrape_times = _nullable(pd.to_datetime(df["scrape_time"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S"))
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO review_last_seen (review_uid, run_id, scrape_time, sort_mode)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(review_uid) DO UPDATE SET
+                    run_id=excluded.run_id,
+                    scrape_time=excluded.scrape_time,
+                    sort_mode=excluded.sort_mode
+                """,
+                zip(df["review_uid"].tolist(), [run_id] * len(df), scrape_times, _nullable(df["sort_mode"])),
+            )
+    finally:
+        conn.close()
+
+
+# Columns whose change makes an already-stored review worth re-upserting
+CHANGE_COLS = ["rating", "review_text", "thumbs_up"]
+
+
+def _comparable(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    for col in ["rating", "thumbs_up"]:
+        out[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64").fillna(-1)
+    out["review_text"] = df["review_text"].fillna("").astype(str)
+    return out
+
+
+def split_known_reviews(df: pd.DataFrame, db_path: str, chunk_rows: int = 500) -> tuple[pd.DataFrame, dict]:
+    """
+    Drop rows whose review_uid is already stored with the same CHANGE_COLS
+    values, looking uids up in batches of `chunk_rows` via the uid_key
+    index. Returns (new + changed rows, {"new", "changed", "unchanged"}).
+    `df` must already be deduplicated on review_uid.
+    """
+    if df.empty:
+        return df, {"new": 0, "changed": 0, "unchanged": 0}
+
+    keys = uid_keys(df["review_uid"]).tolist()
+    stored = []
+    conn = connect(db_path)
+    try:
+        for start in range(0, len(keys), chunk_rows):
+            batch = keys[start:start + chunk_rows]
+            stored.extend(conn.execute(
+                f"SELECT review_uid, {', '.join(CHANGE_COLS)} FROM reviews "
+                f"WHERE uid_key IN ({', '.join('?' for _ in batch)})",
+                batch,
+            ))
+    finally:
+        conn.close()
+
+    known = pd.DataFrame(stored, columns=["review_uid"] + CHANGE_COLS).drop_duplicates("review_uid")
+    is_known = df["review_uid"].isin(known["review_uid"]).to_numpy()
+
+    current = _comparable(df[is_known])
+    previous = _comparable(known.set_index("review_uid").reindex(df.loc[is_known, "review_uid"]))
+    previous.index = current.index
+    unchanged = pd.Series(False, index=df.index)
+    unchanged[is_known] = (current == previous).all(axis=1)
+
+    counts = {
+        "new": int((~is_known).sum()),
+        "changed": int(is_known.sum() - unchanged.sum()),
+        "unchanged": int(unchanged.sum()),
+    }
+    return df[~unchanged.to_numpy()], counts
+
+
+def load_scrape_cursors(db_path: str, app_id: str, sort_names) -> dict:
+    """
+    {(app_id, sort_name): StreamCursor} for every sort mode, empty cursors
+    for streams that have never been scraped.
+    """
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT sort_mode, newest_review_date, newest_review_uid, continuation_token,
+                   pending_review_date, pending_review_uid
+            FROM scrape_cursors WHERE app_id = ?
+            """,
             (app_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+    saved = {r[0]: r[1:] for r in rows}
+
+    return {
+        (app_id, name): StreamCursor(app_id, name, *saved.get(name, ()))
+        for name in sort_names
+    }
+
+
+def save_scrape_cursors(db_path: str, cursors):
+    conn = connect(db_path)
+    try:
+        with conn:
+            for c in cursors:
+                conn.execute("INSERT OR IGNORE INTO apps(app_id) VALUES (?)", (c.app_id,))
+                conn.execute(
+                    """
+                    INSERT INTO scrape_cursors (
+                        app_id, sort_mode, newest_review_date, newest_review_uid, continuation_token,
+                        pending_review_date, pending_review_uid
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(app_id, sort_mode) DO UPDATE SET
+                        newest_review_date=excluded.newest_review_date,
+                        newest_review_uid=excluded.newest_review_uid,
+                        continuation_token=excluded.continuation_token,
+                        pending_review_date=excluded.pending_review_date,
+                        pending_review_uid=excluded.pending_review_uid,
+                        updated_at=datetime('now')
+                    """,
+                    (
+                        c.app_id,
+                        c.sort_mode,
+                        None if c.newest_review_date is None else c.newest_review_date.strftime("%Y-%m-%d %H:%M:%S"),
+                        c.newest_review_uid,
+                        c.continuation_token,
+                        None if c.pending_review_date is None else c.pending_review_date.strftime("%Y-%m-%d %H:%M:%S"),
+                        c.pending_review_uid,
+                    ),
+                )
+    finally:
+        conn.close()
+
+
+def register_apps(db_path: str, platforms: dict):
+    """
+    Insert or update apps rows from {app_id: platform}, so apps first
+    loaded by upsert_reviews keep the right platform.
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO apps(app_id, platform) VALUES (?, ?)
+                ON CONFLICT(app_id) DO UPDATE SET platform=excluded.platform, updated_at=datetime('now')
+                WHERE apps.platform != excluded.platform
+                """,
+                list(platforms.items()),
+            )
+    finally:
+        conn.close()
+
+
+def _write_run_checkpoint(conn: sqlite3.Connection, checkpoint: dict):
+    conn.execute(
+        """
+        INSERT INTO run_checkpoints (run_id, app_id, pages, state_json) VALUES (?, ?, ?, ?)
+        ON CONFLICT(run_id) DO UPDATE SET
+            pages=excluded.pages, state_json=excluded.state_json, updated_at=datetime('now')
+        """,
+        (checkpoint["run_id"], checkpoint["app_id"], checkpoint["pages"], json.dumps(checkpoint["state"])),
+    )
+    conn.executemany(
+        """
+        INSERT INTO run_stream_checkpoints (
+            run_id, app_id, sort_mode, country, lang, continuation_token, pages, collected,
+            new_rows, seen_review_date, seen_review_uid, done
         )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(run_id, app_id, sort_mode, country, lang) DO UPDATE SET
+            continuation_token=excluded.continuation_token,
+            pages=excluded.pages,
+            collected=excluded.collected,
+            new_rows=excluded.new_rows,
+            seen_review_date=excluded.seen_review_date,
+            seen_review_uid=excluded.seen_review_uid,
+            done=excluded.done,
+            updated_at=datetime('now')
+        """,
+        [
+            (checkpoint["run_id"], s["app_id"], s["sort_mode"], s["country"], s["lang"], s["continuation_token"],
+             s["pages"], s["collected"], s["new_rows"], s["seen_review_date"], s["seen_review_uid"], int(s["done"]))
+            for s in checkpoint["streams"]
+        ],
+    )
+
 
-        rows = df[[
-            "review_uid", "app_id", "user_name", "rating",
-            "review_text", "review_date", "thumbs_up",
-            "app_version", "sort_mode", "scrape_time", "run_id"
-        ]].to_records(index=False)
+def save_run_checkpoint(db_path: str, checkpoint: dict):
+    """
+    Upsert a run checkpoint: {"run_id", "app_id", "pages", "state" (JSON-able
+    run counters), "streams" (StreamCheckpoint.to_dict() snapshots)}.
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            _write_run_checkpoint(conn, checkpoint)
+    finally:
+        conn.close()
 
-        conn.executemany(
+
+def load_run_checkpoint(db_path: str, run_id: str):
+    """
+    (app_id, pages, state, {stream key: StreamCheckpoint}) saved for
+    `run_id`, or None if it has no checkpoint (never checkpointed or
+    already completed).
+    """
+    conn = connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT app_id, pages, state_json FROM run_checkpoints WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        streams = conn.execute(
             """
-            INSERT INTO reviews (
-                review_uid, app_id, user_name, rating,
-                review_text, review_date, thumbs_up,
-                app_version, sort_mode, scrape_time, run_id
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(review_uid) DO UPDATE SET
-                rating=excluded.rating,
-                review_text=excluded.review_text,
-                review_date=excluded.review_date,
-                thumbs_up=excluded.thumbs_up,
-                app_version=excluded.app_version,
-                sort_mode=excluded.sort_mode,
-                scrape_time=excluded.scrape_time,
-                run_id=excluded.run_id
+            SELECT app_id, sort_mode, country, lang, continuation_token, pages, collected,
+                   new_rows, seen_review_date, seen_review_uid, done
+            FROM run_stream_checkpoints WHERE run_id = ?
             """,
-            list(rows),
-        )
+            (run_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+    checkpoints = {}
+    for r in streams:
+        c = StreamCheckpoint(*r)
+        checkpoints[c.key] = c
+    return row[0], row[1], json.loads(row[2]), checkpoints
+
+
+def read_run_reviews(db_path: str, run_id: str, app_id: str) -> pd.DataFrame:
+    """
+    Reviews of `app_id` last inserted or changed by `run_id` (EXPECTED_COLS
+    order), e.g. the pages an interrupted run committed.
+    """
+    cols = ["review_uid", "user_name", "rating", "review_text", "review_date",
+            "thumbs_up", "app_version", "sort_mode", "scrape_time"]
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(cols)} FROM reviews WHERE run_id = ? AND app_id = ?", (run_id, app_id)
+        ).fetchall()
+    finally:
+        conn.close()
+    df = pd.DataFrame(rows, columns=cols)
+    for col in ["review_date", "scrape_time"]:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def clear_run_checkpoint(db_path: str, run_id: str):
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM run_stream_checkpoints WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM run_checkpoints WHERE run_id = ?", (run_id,))
+    finally:
+        conn.close()
+
+
+def record_pipeline_run(db_path: str, run: dict):
+    """
+    Insert or replace a pipeline_runs row plus its pipeline_run_stages rows.
+    `run` holds the pipeline_runs columns and "metrics" (RunMetrics.to_dict()).
+    """
+    metrics = run.get("metrics") or {}
+    latency = metrics.get("page_latency") or {}
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM pipeline_run_stages WHERE run_id = ?", (run["run_id"],))
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO pipeline_runs (
+                    run_id, app_id, mode, status, started_at, finished_at, wall_s, cpu_s, peak_rss_mb,
+                    rows_raw, rows_processed, pages, page_p50_ms, page_p90_ms, metrics_json
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run["run_id"], run.get("app_id"), run.get("mode"), run["status"],
+                    run["started_at"], run.get("finished_at"),
+                    metrics.get("wall_s"), metrics.get("cpu_s"), metrics.get("peak_rss_mb"),
+                    run.get("rows_raw"), run.get("rows_processed"),
+                    latency.get("count"), latency.get("p50_ms"), latency.get("p90_ms"),
+                    json.dumps(metrics),
+                ),
+            )
+            conn.executemany(
+                """
+                INSERT INTO pipeline_run_stages (run_id, stage, calls, wall_s, cpu_s, peak_rss_mb, rows, rows_per_s)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (run["run_id"], name, s["calls"], s["wall_s"], s["cpu_s"], s["peak_rss_mb"], s["rows"], s["rows_per_s"])
+                    for name, s in metrics.get("stages", {}).items()
+                ],
+            )
+    finally:
+        conn.close()
@@ -0,0 +1,217 @@
+"""
+Run instrumentation: per-stage wall / CPU time, peak RSS and rows/sec,
+per-page scrape latency histograms (Play pages in page_latency, other
+sources under their own name via histogram()), and optional cProfile / tracemalloc
+capture.
+
+A stage may be entered many times (once per page in streaming runs); its
+figures accumulate over all entries. Peak RSS is per stage where Linux
+lets us reset the high-water mark (/proc/self/clear_refs), otherwise the
+process-wide peak so far. CPU time is process-wide, so it includes scrape
+worker threads running during the stage.
+
+run_pipeline writes RunMetrics.to_dict() into run_metadata_{run_id}.json
+(under "metrics") and into the pipeline_runs / pipeline_run_stages tables.
+"""
+from __future__ import annotations
+
+import bisect
+import cProfile
+import io
+import pstats
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# Upper bucket bounds in ms for page request latency; the last bucket is open
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+_STATUS = Path("/proc/self/status")
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        _CLEAR_REFS.write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size in MB since the last reset (VmHWM), or over the
+    process lifetime where /proc is unavailable.
+    """
+    try:
+        for line in _STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class LatencyHistogram:
+    """
+    Thread-safe fixed-bucket latency histogram (see LATENCY_BUCKETS_MS).
+    """
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Upper bound of the bucket holding the q-quantile, capped at max_ms.
+        """
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                bound = self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+                return round(min(bound, self.max_ms), 1)
+        return round(self.max_ms, 1)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}" for b in self.buckets_ms] + [f"gt_{self.buckets_ms[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p90_ms": self.quantile(0.9),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class RunMetrics:
+    """
+    Stage timings for one run. Use `with metrics.stage("clean") as st:` and
+    set st["rows"] to the rows the stage handled.
+    """
+
+    def __init__(self, run_id: str, profile: bool = False, trace_memory: bool = False):
+        self.run_id = run_id
+        self.stages = {}
+        self.rows = {}                      # run-level counts, e.g. rows_raw / rows_processed
+        self.page_latency = LatencyHistogram()
+        self.histograms = {}                # extra named latency histograms, e.g. "appstore"
+        self.profile = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self.peak_rss_scope = "stage" if _reset_peak_rss() else "process"
+        self._wall0 = self._cpu0 = None
+        self.wall_s = self.cpu_s = None
+        self.run_peak_rss_mb = 0.0
+        self.tracemalloc_top = None
+
+    def start(self):
+        self._wall0, self._cpu0 = time.perf_counter(), time.process_time()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+        self.wall_s = time.perf_counter() - self._wall0
+        self.cpu_s = time.process_time() - self._cpu0
+        self.run_peak_rss_mb = max([peak_rss_mb()] + [s["peak_rss_mb"] for s in self.stages.values()])
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            self.tracemalloc_top = [
+                {"where": str(stat.traceback[0]), "size_mb": round(stat.size / 2**20, 2), "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:15]
+            ]
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str, rows: int | None = None):
+        record = {"rows": rows}
+        if self.peak_rss_scope == "stage":
+            _reset_peak_rss()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            s = self.stages.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "peak_rss_mb": 0.0})
+            s["calls"] += 1
+            s["wall_s"] += wall
+            s["cpu_s"] += cpu
+            s["rows"] += int(record.get("rows") or 0)
+            s["peak_rss_mb"] = max(s["peak_rss_mb"], peak_rss_mb())
+            if self.trace_memory and tracemalloc.is_tracing():
+                traced_peak = tracemalloc.get_traced_memory()[1] / 2**20
+                s["traced_peak_mb"] = max(s.get("traced_peak_mb", 0.0), traced_peak)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        return self.histograms.setdefault(name, LatencyHistogram())
+
+    def timed_pages(self, pages, name: str = "scrape"):
+        """
+        Re-yield `pages`, charging the time spent waiting for each one (and
+        its rows) to stage `name`.
+        """
+        it = iter(pages)
+        while True:
+            with self.stage(name) as st:
+                page = next(it, None)
+                st["rows"] = 0 if page is None else len(page)
+            if page is None:
+                return
+            yield page
+
+    def profile_summary(self, limit: int = 25) -> str | None:
+        if self.profile is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def dump_profile(self, path: Path):
+        if self.profile is not None:
+            self.profile.dump_stats(str(path))
+
+    def to_dict(self) -> dict:
+        stages = {}
+        for name, s in self.stages.items():
+            stages[name] = {
+                **{k: round(v, 4) if isinstance(v, float) else v for k, v in s.items()},
+                "rows_per_s": round(s["rows"] / s["wall_s"], 1) if s["rows"] and s["wall_s"] > 0 else None,
+            }
+        out = {
+            "wall_s": round(self.wall_s, 4) if self.wall_s is not None else None,
+            "cpu_s": round(self.cpu_s, 4) if self.cpu_s is not None else None,
+            "peak_rss_mb": round(self.run_peak_rss_mb, 1),
+            "peak_rss_scope": self.peak_rss_scope,
+            **self.rows,
+            "stages": stages,
+            "page_latency": self.page_latency.to_dict(),
+        }
+        for name, hist in self.histograms.items():
+            out[f"{name}_latency"] = hist.to_dict()
+        if self.tracemalloc_top is not None:
+            out["tracemalloc_top"] = self.tracemalloc_top
+        return out
@@ -0,0 +1,119 @@
+"""
+Versioned schema migrations for the reviews SQLite DB.
+
+Version 1 is the baseline schema/schema_sqlite.sql; later versions are
+schema/migrations/NNNN_<name>.sql. Applied versions are recorded in the
+schema_version table, so bringing a DB up to date is one SELECT when
+nothing is pending.
+
+  python -m google_play_reviews.pipeline.migrations <db_path>
+"""
+import argparse
+import re
+import sqlite3
+from pathlib import Path
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "schema"
+BASELINE_PATH = SCHEMA_DIR / "schema_sqlite.sql"
+MIGRATIONS_DIR = SCHEMA_DIR / "migrations"
+
+_MIGRATION_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+def list_migrations():
+    """
+    [(version, name, path)] in version order, baseline first.
+    """
+    migrations = [(1, "baseline", BASELINE_PATH)]
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        m = _MIGRATION_RE.match(path.name)
+        if m is None:
+            raise ValueError(f"Bad migration file name: {path.name}")
+        migrations.append((int(m.group(1)), m.group(2), path))
+
+    versions = [v for v, _, _ in migrations]
+    if versions != list(range(1, len(versions) + 1)):
+        raise ValueError(f"Migration versions must be contiguous from 1, got {versions}")
+    return migrations
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not exists:
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection, logger=None) -> int:
+    """
+    Apply pending migrations, each in its own transaction. Returns the
+    resulting schema version.
+    """
+    version = current_version(conn)
+    migrations = list_migrations()
+    if version >= migrations[-1][0]:
+        return version
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+          version INTEGER PRIMARY KEY,
+          name TEXT NOT NULL,
+          applied_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+        """
+    )
+    conn.commit()
+
+    # Table rebuilds (e.g. 0009) drop and re-create parent tables, which
+    # foreign key enforcement would refuse mid-way; the constraints are
+    # checked as a whole before each migration commits instead
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        for v, name, path in migrations:
+            if v <= version:
+                continue
+            sql = path.read_text(encoding="utf-8")
+            try:
+                conn.executescript(
+                    "BEGIN;\n"
+                    + sql
+                    + f"\nINSERT INTO schema_version(version, name) VALUES ({v}, '{name}');"
+                )
+                violations = conn.execute("PRAGMA foreign_key_check").fetchmany(5)
+                if violations:
+                    raise sqlite3.IntegrityError(f"Migration {v} ({name}) breaks foreign keys: {violations}")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            if logger:
+                logger.info(f"[MIGRATE] applied version={v} name={name}")
+            version = v
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations to a reviews DB")
+    parser.add_argument("db_path", help="Path to the SQLite DB")
+    args = parser.parse_args()
+
+    Path(args.db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(args.db_path, timeout=30)
+    try:
+        before = current_version(conn)
+        after = migrate(conn)
+    finally:
+        conn.close()
+    print(f"schema_version {before} -> {after}")
+
+
+if __name__ == "__main__":
+    main()
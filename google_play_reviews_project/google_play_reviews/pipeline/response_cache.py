@@ -0,0 +1,265 @@
+"""
+On-disk record/replay cache for google_play_scraper.reviews pages.
+
+Each page response is stored as one gzip-compressed JSON file named by the
+sha256 of its request key (app_id, sort, lang, country, page size,
+continuation position), where the position is "start" for a stream's first
+page and the continuation token otherwise. Replaying a stream from "start"
+walks the same chain of tokens the recorded run followed, so the pages come
+back in the same order with the same next tokens.
+
+Modes:
+- "record":  serve fresh cached pages, fetch and store misses
+- "refresh": always fetch, store the result
+- "replay":  only serve cached pages (TTL ignored); a miss raises
+             ResponseCacheMiss, so no request ever reaches the network
+- "off":     no cache
+
+Empty pages (failed or throttled requests) are never stored. Entries older
+than `ttl_hours` count as misses outside replay mode. When the cache grows
+past `max_mb`, the least recently used entries (by file mtime, bumped on
+every hit) are deleted down to 90% of the limit.
+
+  python -m google_play_reviews.pipeline.response_cache stats
+  python -m google_play_reviews.pipeline.response_cache prune --max-mb 100
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from google_play_scraper.features.reviews import _ContinuationToken
+
+from .config import PIPELINE_CONFIG
+
+MODES = ("off", "record", "refresh", "replay")
+SUFFIX = ".json.gz"
+
+
+class ResponseCacheMiss(LookupError):
+    """A replay-mode lookup found no cached page."""
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _decode(obj):
+    if len(obj) == 1 and "__dt__" in obj:
+        return datetime.fromisoformat(obj["__dt__"])
+    return obj
+
+
+def _token_fields(token) -> dict | None:
+    if token is None:
+        return None
+    return {k: getattr(token, k, None) for k in ("token", "lang", "country", "sort", "count")}
+
+
+class ResponseCache:
+    def __init__(self, cache_dir, mode: str = "record", ttl_hours: float | None = 24,
+                 max_mb: float | None = 512, compress_level: int = 6):
+        if mode not in MODES:
+            raise ValueError(f"response cache mode must be one of {MODES}, got {mode!r}")
+        self.dir = Path(cache_dir)
+        self.mode = mode
+        self.ttl_s = ttl_hours * 3600 if ttl_hours else None
+        self.max_bytes = int(max_mb * 2**20) if max_mb else None
+        self.compress_level = compress_level
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "skipped": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._size = None  # total bytes on disk, counted lazily
+
+    @classmethod
+    def from_config(cls, config=PIPELINE_CONFIG) -> ResponseCache | None:
+        mode = config.get("response_cache", "off")
+        if mode == "off":
+            return None
+        return cls(
+            config["response_cache_dir"],
+            mode=mode,
+            ttl_hours=config.get("response_cache_ttl_hours"),
+            max_mb=config.get("response_cache_max_mb"),
+        )
+
+    @staticmethod
+    def key(app_id, lang, country, sort, count, continuation_token=None) -> str | None:
+        """
+        Request key, or None for requests past the end of a stream (a token
+        whose .token is None), which never reach the network anyway.
+        """
+        if continuation_token is None:
+            position = "start"
+        elif getattr(continuation_token, "token", None) is None:
+            return None
+        else:
+            position = str(continuation_token.token)
+        raw = json.dumps([app_id, int(getattr(sort, "value", sort)), lang, country, int(count), position])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}{SUFFIX}"
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    def get(self, key: str):
+        """
+        (result, continuation_token) for a cached page, None on a miss
+        (ResponseCacheMiss in replay mode).
+        """
+        if self.mode == "refresh":
+            return None
+        path = self.path(key)
+        try:
+            payload = json.loads(gzip.decompress(path.read_bytes()), object_hook=_decode)
+        except (OSError, ValueError, EOFError):
+            payload = None
+        if payload is not None and self.mode != "replay" and self.ttl_s is not None \
+                and time.time() - payload["fetched_at"] > self.ttl_s:
+            self._count("expired")
+            payload = None
+        if payload is None:
+            self._count("misses")
+            if self.mode == "replay":
+                raise ResponseCacheMiss(f"no cached page for key {key}")
+            return None
+
+        self._count("hits")
+        try:
+            os.utime(path)  # LRU recency
+        except OSError:
+            pass
+        t = payload["next_token"]
+        token = None if t is None else _ContinuationToken(
+            t["token"], t["lang"], t["country"], t["sort"], t["count"], None, None
+        )
+        return payload["result"], token
+
+    def put(self, key: str, result, continuation_token):
+        """
+        Store a fetched page. Empty pages and pages without a continuation
+        token are not stored: google_play_scraper returns ([], None) when a
+        request fails or is throttled, and replaying that would end the
+        stream for the whole TTL.
+        """
+        if self.mode not in ("record", "refresh"):
+            return
+        if not result or continuation_token is None:
+            self._count("skipped")
+            return
+        payload = {"fetched_at": time.time(), "result": result, "next_token": _token_fields(continuation_token)}
+        data = gzip.compress(json.dumps(payload, default=_encode).encode(), compresslevel=self.compress_level)
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            old = path.stat().st_size
+        except OSError:
+            old = 0
+        # Write-then-rename so concurrent readers never see a partial entry
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.stats["stored"] += 1
+            if self._size is not None:
+                self._size += len(data) - old
+        if self.max_bytes is not None and self.size_bytes() > self.max_bytes:
+            self.evict(int(self.max_bytes * 0.9))
+
+    def _entries(self):
+        for path in self.dir.glob(f"*/*{SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield path, st.st_size, st.st_mtime
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            return self._size
+
+    def evict(self, target_bytes: int) -> int:
+        """
+        Delete least recently used entries until the cache holds at most
+        `target_bytes`. Returns the number of entries removed.
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            size = sum(e[1] for e in entries)
+            removed = 0
+            for path, entry_size, _ in entries:
+                if size <= target_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                size -= entry_size
+                removed += 1
+            self._size = size
+            self.stats["evicted"] += removed
+        return removed
+
+    def prune_expired(self) -> int:
+        if self.ttl_s is None:
+            return 0
+        cutoff = time.time() - self.ttl_s
+        removed = 0
+        for path, _, _ in list(self._entries()):
+            try:
+                fetched_at = json.loads(gzip.decompress(path.read_bytes()))["fetched_at"]
+            except (OSError, ValueError, EOFError, KeyError):
+                fetched_at = 0
+            if fetched_at < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        with self._lock:
+            self._size = None
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for path, _, _ in list(self._entries()):
+            path.unlink(missing_ok=True)
+            removed += 1
+        with self._lock:
+            self._size = 0
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or prune the scraper response cache")
+    parser.add_argument("command", choices=["stats", "prune", "clear"])
+    parser.add_argument("--dir", default=PIPELINE_CONFIG["response_cache_dir"])
+    parser.add_argument("--ttl-hours", type=float, default=PIPELINE_CONFIG.get("response_cache_ttl_hours"))
+    parser.add_argument("--max-mb", type=float, default=PIPELINE_CONFIG.get("response_cache_max_mb"))
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.dir, mode="record", ttl_hours=args.ttl_hours, max_mb=args.max_mb)
+    if args.command == "prune":
+        expired = cache.prune_expired()
+        evicted = cache.evict(cache.max_bytes) if cache.max_bytes is not None else 0
+        print(f"removed expired={expired} evicted={evicted}")
+    elif args.command == "clear":
+        print(f"removed {cache.clear()} entries")
+    entries = list(cache._entries())
+    print(f"dir={cache.dir} entries={len(entries)} size_mb={sum(e[1] for e in entries) / 2**20:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Materialized review rollups, kept current by db.upsert_reviews.
+
+Per (app_id, day), (app_id, month) and (app_id, app_version) each rollup
+table holds the review count, rating sum, rating histogram (rating_1..5)
+and thumbs_up sum. Every upsert turns its new and content-changed rows into
++1 / -1 deltas (old values out, new values in) and adds them to all three
+tables with one grouped INSERT ... ON CONFLICT each.
+
+Missing app_version is stored as '' (primary key columns cannot be NULL).
+"""
+from __future__ import annotations
+
+import sqlite3
+
+# table -> (key column, expression over review columns)
+ROLLUPS = {
+    "rollup_daily": ("day", "substr(review_date, 1, 10)"),
+    "rollup_monthly": ("month", "substr(review_date, 1, 7)"),
+    "rollup_version": ("app_version", "COALESCE(app_version, '')"),
+}
+
+VALUE_COLS = ["reviews", "rating_sum", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5", "thumbs_up_sum"]
+
+_AGGREGATES = ",\n    ".join(
+    ["SUM(sign)", "SUM(sign * COALESCE(rating, 0))"]
+    + [f"SUM(sign * (COALESCE(rating, 0) = {k}))" for k in range(1, 6)]
+    + ["SUM(sign * COALESCE(thumbs_up, 0))"]
+)
+
+_CREATE_DELTA_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS rollup_delta (
+  app_id TEXT, review_date TEXT, app_version TEXT, rating INTEGER, thumbs_up INTEGER, sign INTEGER
+)
+"""
+
+# Rows of staging_reviews that are new or whose content fingerprint changed add
+# their new values; the stored versions of changed rows take their old ones out
+STAGED_DELTA_SQL = """
+INSERT INTO rollup_delta
+SELECT s.app_id, s.review_date, s.app_version, s.rating, s.thumbs_up, 1
+FROM staging_reviews s
+LEFT JOIN reviews r ON r.review_uid = s.review_uid
+WHERE r.review_uid IS NULL OR r.content_fp IS NOT s.content_fp
+UNION ALL
+SELECT r.app_id, r.review_date, r.app_version, r.rating, r.thumbs_up, -1
+FROM staging_reviews s
+JOIN reviews r ON r.review_uid = s.review_uid
+WHERE r.content_fp IS NOT s.content_fp
+"""
+
+
+def _apply_sql(table: str) -> str:
+    key, expr = ROLLUPS[table]
+    updates = ",\n    ".join(f"{c} = {c} + excluded.{c}" for c in VALUE_COLS)
+    return f"""
+INSERT INTO {table} (app_id, {key}, {", ".join(VALUE_COLS)})
+SELECT app_id, {expr},
+    {_AGGREGATES}
+FROM rollup_delta
+WHERE {expr} IS NOT NULL
+GROUP BY 1, 2
+ON CONFLICT(app_id, {key}) DO UPDATE SET
+    {updates}
+"""
+
+
+def _apply_delta(conn: sqlite3.Connection):
+    for table in ROLLUPS:
+        conn.execute(_apply_sql(table))
+    conn.execute("DELETE FROM rollup_delta")
+
+
+def apply_staged_deltas(conn: sqlite3.Connection):
+    """
+    Fold staging_reviews into the rollups. Must run inside the upsert
+    transaction, before staging_reviews is merged into reviews.
+    """
+    conn.execute(_CREATE_DELTA_SQL)
+    conn.execute("DELETE FROM rollup_delta")
+    conn.execute(STAGED_DELTA_SQL)
+    _apply_delta(conn)
+
+
+def rebuild_rollups(conn: sqlite3.Connection):
+    """
+    Recompute every rollup from the reviews table (one transaction).
+    """
+    with conn:
+        conn.execute(_CREATE_DELTA_SQL)
+        conn.execute("DELETE FROM rollup_delta")
+        for table in ROLLUPS:
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            "INSERT INTO rollup_delta "
+            "SELECT app_id, review_date, app_version, rating, thumbs_up, 1 FROM reviews"
+        )
+        _apply_delta(conn)
+
+
+def rollups_missing(conn: sqlite3.Connection) -> bool:
+    """
+    True when reviews has rows but the rollups were never filled (a DB
+    migrated from before the rollup tables existed).
+    """
+    has_reviews = conn.execute("SELECT 1 FROM reviews LIMIT 1").fetchone() is not None
+    has_rollups = conn.execute("SELECT 1 FROM rollup_daily LIMIT 1").fetchone() is not None
+    return has_reviews and not has_rollups
@@ -1,17 +1,36 @@
 from datetime import datetime
 from pathlib import Path
+import argparse
 import time
 import uuid
 
 import pandas as pd
 from google_play_scraper import Sort
 
-from .scraper import scrape_reviews
+from ..analysis.eda_incremental import RunProfile, load_seen, update_cumulative
+from ..analysis import keywords
+from ..analysis.version_alerts import update_alerts
+from .appstore import APPSTORE_PLATFORM, scrape_appstore_pages
+from .scraper import EXPECTED_COLS, build_streams, scrape_pages, scrape_reviews
 from .config import PIPELINE_CONFIG
 from .logging_utils import get_logger
+from .metrics import RunMetrics
 from .processing import basic_clean
-from .storage import save_run_outputs
-from .db import upsert_reviews
+from .response_cache import ResponseCache
+from .storage import RunOutputWriter, add_run_metadata, read_frame, save_run_outputs
+from .db import (
+    clear_run_checkpoint,
+    load_run_checkpoint,
+    load_scrape_cursors,
+    read_run_reviews,
+    record_last_seen,
+    record_pipeline_run,
+    register_apps,
+    save_scrape_cursors,
+    split_known_reviews,
+    upsert_reviews,
+)
+from .uids import DEFAULT_UID_SCHEME, UidStats
 
 
 logger = get_logger()
@@ -21,21 +40,236 @@ SORT_MODES = {
     "most_relevant": Sort.MOST_RELEVANT,
 }
 
-def run_pipeline():
-    start_ts = time.time()
-    run_id = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:8]
-    logger.info(f"[RUN_START] run_id={run_id}")
+
+def _uid_stats():
+    return UidStats() if PIPELINE_CONFIG.get("uid_stats", False) else None
+
+
+def _log_uid_stats(uid_stats):
+    if uid_stats is not None:
+        logger.info(f"[UID_STATS] {uid_stats.to_dict()}")
+
+
+def _add_counts(total, counts):
+    for k, v in (counts or {}).items():
+        total[k] = total.get(k, 0) + v
+
+
+def _format_counts(counts):
+    # " inserted=.. updated=.. unchanged=.." when the loader reported them
+    return "".join(f" {k}={v}" for k, v in (counts or {}).items())
+
+
+def _skip_known():
+    return PIPELINE_CONFIG.get("load_to_db", False) and PIPELINE_CONFIG.get("skip_known_reviews", False)
+
+
+def _drop_known(df, run_id):
+    """
+    split_known_reviews, still noting the dropped rows' sighting in
+    review_last_seen when change detection is on.
+    """
+    kept, counts = split_known_reviews(df, PIPELINE_CONFIG["db_path"])
+    if PIPELINE_CONFIG.get("db_change_detection", False):
+        record_last_seen(df[~df["review_uid"].isin(kept["review_uid"])], PIPELINE_CONFIG["db_path"], run_id)
+    return kept, counts
+
+def _checkpointing():
+    return PIPELINE_CONFIG.get("load_to_db", False) and PIPELINE_CONFIG.get("checkpointing", False)
+
+
+def run_streaming(run_id, cursors=None, metrics=None, response_cache=None, resume=None):
+    """
+    Page-at-a-time variant of steps 1-4: every scraped page is cleaned,
+    appended to the run files and buffered for the DB, which is loaded in
+    batches of `db_batch_rows`. Nothing holds more than one batch in memory.
+    Stage timings accumulate over pages in `metrics`.
+
+    With checkpointing, each page is loaded on its own, in one transaction
+    with its streams' positions and the run's counters, after it was
+    appended to the run files. `resume` (a db.load_run_checkpoint result)
+    continues an interrupted run after its last committed page; the EDA and
+    keyword contributions of the pages it committed are re-read from the DB.
+    """
+    metrics = metrics or RunMetrics(run_id)
+    load_to_db = PIPELINE_CONFIG.get("load_to_db", False)
+    checkpointing = _checkpointing() or resume is not None
+    batch_rows = PIPELINE_CONFIG.get("db_batch_rows", 2000)
+    writer = RunOutputWriter(run_id=run_id, config=PIPELINE_CONFIG, logger=logger)
+    uid_stats = _uid_stats()
+    stream_checkpoints = {} if checkpointing else None
+    state = {}
+    if resume is not None:
+        _, _, state, stream_checkpoints = resume
+        writer.resume(
+            state["writer"],
+            committed_processed=lambda: read_run_reviews(PIPELINE_CONFIG["db_path"], run_id, PIPELINE_CONFIG["app_id"]),
+        )
+
+    streams = build_streams(
+        [PIPELINE_CONFIG["app_id"]],
+        SORT_MODES,
+        countries=[PIPELINE_CONFIG.get("country", "us")],
+        langs=[PIPELINE_CONFIG.get("lang", "en")],
+    )
+    pages = scrape_pages(
+        streams,
+        target_per_mode=PIPELINE_CONFIG["target_per_mode"],
+        max_workers=PIPELINE_CONFIG.get("scrape_workers", 1),
+        requests_per_sec=PIPELINE_CONFIG.get("rate_limit_per_sec"),
+        cursors=cursors,
+        uid_scheme=PIPELINE_CONFIG.get("uid_scheme", DEFAULT_UID_SCHEME),
+        uid_stats=uid_stats,
+        page_latency=metrics.page_latency,
+        response_cache=response_cache,
+        checkpoints=stream_checkpoints,
+    )
+
+    buffer, buffered = [], 0
+    loaded, n_pages = state.get("loaded", 0), state.get("pages", 0)
+    sort_counts = state.get("sort_counts", {})
+    known_counts = state.get("known_counts", {"new": 0, "changed": 0, "unchanged": 0})
+    load_counts = state.get("load_counts", {})
+    eda_partial = RunProfile(load_seen(PIPELINE_CONFIG)) if PIPELINE_CONFIG.get("eda_incremental", False) else None
+    keyword_state = keywords.load_state(PIPELINE_CONFIG) if PIPELINE_CONFIG.get("keywords_incremental", False) else None
+    if resume is not None and (eda_partial is not None or keyword_state is not None):
+        committed = read_run_reviews(PIPELINE_CONFIG["db_path"], run_id, PIPELINE_CONFIG["app_id"])
+        if eda_partial is not None:
+            with metrics.stage("eda", len(committed)):
+                eda_partial.update(committed)
+        if keyword_state is not None:
+            with metrics.stage("keywords", len(committed)):
+                keyword_state[0].update_new(committed)
+        logger.info(f"[RESUME] run_id={run_id} committed_pages={n_pages} committed_rows={len(committed)}")
+
+    def _flush(page_checkpoints=None):
+        nonlocal buffer, buffered, loaded
+        if not buffer and page_checkpoints is None:
+            return
+        batch = pd.concat(buffer, ignore_index=True) if buffer else pd.DataFrame(columns=EXPECTED_COLS)
+        checkpoint = None
+        if page_checkpoints is not None:
+            checkpoint = {
+                "run_id": run_id,
+                "app_id": PIPELINE_CONFIG["app_id"],
+                "pages": n_pages,
+                "state": {
+                    "writer": writer.state(),
+                    "pages": n_pages,
+                    "loaded": loaded + len(batch),
+                    "sort_counts": sort_counts,
+                    "known_counts": known_counts,
+                    "load_counts": load_counts,
+                },
+                "streams": page_checkpoints,
+            }
+        with metrics.stage("db_load", len(batch)):
+            counts = upsert_reviews(
+                df=batch,
+                db_path=PIPELINE_CONFIG["db_path"],
+                app_id=PIPELINE_CONFIG["app_id"],
+                run_id=run_id,
+                change_detection=PIPELINE_CONFIG.get("db_change_detection", False),
+                checkpoint=checkpoint,
+            )
+        loaded += len(batch)
+        _add_counts(load_counts, counts)
+        if checkpoint is None:
+            logger.info(f"[DB_LOAD] batch rows={len(batch)} total={loaded}{_format_counts(counts)}")
+        buffer, buffered = [], 0
+
+    try:
+        for page in metrics.timed_pages(pages, "scrape"):
+            n_pages += 1
+            page_raw = page[EXPECTED_COLS]
+            with metrics.stage("clean", len(page_raw)):
+                page_clean = basic_clean(page_raw)
+            if _skip_known():
+                with metrics.stage("dedup_known", len(page_clean)):
+                    page_clean, counts = _drop_known(page_clean, run_id)
+                for k, v in counts.items():
+                    known_counts[k] += v
+            with metrics.stage("save", len(page_raw)):
+                writer.append(page_raw, page_clean)
+            if eda_partial is not None:
+                with metrics.stage("eda", len(page_clean)):
+                    eda_partial.update(page_clean)
+            if keyword_state is not None:
+                with metrics.stage("keywords", len(page_clean)):
+                    keyword_state[0].update_new(page_clean)
+
+            for k, v in page_raw["sort_mode"].value_counts().items():
+                sort_counts[k] = sort_counts.get(k, 0) + int(v)
+
+            if checkpointing:
+                # load_counts in the checkpoint lag one page; they are only for logging
+                buffer.append(page_clean)
+                _flush(page.attrs.get("checkpoints", []))
+            elif load_to_db:
+                buffer.append(page_clean)
+                buffered += len(page_clean)
+                if buffered >= batch_rows:
+                    _flush()
+
+        if load_to_db:
+            _flush()
+    except BaseException:
+        # Stop the scrape workers, and close Parquet / Feather files so a
+        # --resume can read back their committed rows
+        pages.close()
+        writer.abort()
+        raise
+
+    if load_to_db:
+        logger.info(f"[DB_LOAD] sqlite db_path={PIPELINE_CONFIG['db_path']} rows={loaded}{_format_counts(load_counts)}")
+    logger.info(f"[SCRAPE] streaming pages={n_pages} rows={writer.rows_raw}")
+    logger.info(f"[SCRAPE_BREAKDOWN] {sort_counts}")
+    _log_uid_stats(uid_stats)
+    if _skip_known():
+        logger.info(f"[DEDUP_KNOWN] {known_counts}")
+
+    with metrics.stage("save"):
+        writer.close()
+    metrics.rows.update(rows_raw=writer.rows_raw, rows_processed=writer.rows_processed)
+
+    if eda_partial is not None:
+        with metrics.stage("eda"):
+            update_cumulative(run_id, eda_partial, config=PIPELINE_CONFIG, logger=logger)
+    if keyword_state is not None:
+        with metrics.stage("keywords"):
+            keywords.commit_run(run_id, *keyword_state, writer.rows_processed, config=PIPELINE_CONFIG, logger=logger)
+
+    return writer.rows_processed
+
+
+def run_batch(run_id, cursors=None, metrics=None, response_cache=None):
+    """
+    Whole-run variant of steps 1-4: scrape (or load) everything, then clean,
+    save and load the full DataFrame. Each step is a stage in `metrics`.
+    """
+    metrics = metrics or RunMetrics(run_id)
 
     # 1) Collect (scrape) OR load data
     if PIPELINE_CONFIG.get("use_scraper", False):
-        df_raw = scrape_reviews(
-            app_id=PIPELINE_CONFIG["app_id"],
-            lang=PIPELINE_CONFIG.get("lang", "en"),
-            country=PIPELINE_CONFIG.get("country", "us"),
-            target_per_mode=PIPELINE_CONFIG["target_per_mode"],
-            sort_modes=SORT_MODES,
-        )
+        uid_stats = _uid_stats()
+        with metrics.stage("scrape") as st:
+            df_raw = scrape_reviews(
+                app_id=PIPELINE_CONFIG["app_id"],
+                lang=PIPELINE_CONFIG.get("lang", "en"),
+                country=PIPELINE_CONFIG.get("country", "us"),
+                target_per_mode=PIPELINE_CONFIG["target_per_mode"],
+                sort_modes=SORT_MODES,
+                max_workers=PIPELINE_CONFIG.get("scrape_workers", 1),
+                requests_per_sec=PIPELINE_CONFIG.get("rate_limit_per_sec"),
+                cursors=cursors,
+                uid_scheme=PIPELINE_CONFIG.get("uid_scheme", DEFAULT_UID_SCHEME),
+                uid_stats=uid_stats,
+                page_latency=metrics.page_latency,
+                response_cache=response_cache,
+            )
+            st["rows"] = len(df_raw)
         logger.info(f"[SCRAPE] rows={len(df_raw)} cols={len(df_raw.columns)}")
+        _log_uid_stats(uid_stats)
 
         # quick per-sort breakdown
         if "sort_mode" in df_raw.columns:
@@ -46,37 +280,262 @@ def run_pipeline():
         input_path = Path(PIPELINE_CONFIG["input_csv"])
         if not input_path.exists():
             raise FileNotFoundError(f"Input CSV not found: {input_path}")
-        df_raw = pd.read_csv(input_path)
+        with metrics.stage("load") as st:
+            df_raw = read_frame(input_path)
+            st["rows"] = len(df_raw)
         logger.info(f"[LOAD] rows={len(df_raw)} cols={len(df_raw.columns)} path={input_path}")
 
     # 2) Basic processing
-    df = basic_clean(df_raw, logger=logger)
+    with metrics.stage("clean", len(df_raw)):
+        df = basic_clean(df_raw, logger=logger)
+
+    # Only new reviews and known ones whose rating/text/thumbs_up changed go on
+    # to the processed file and the DB; the raw file keeps everything scraped
+    if _skip_known():
+        with metrics.stage("dedup_known", len(df)):
+            df, counts = _drop_known(df, run_id)
+        logger.info(f"[DEDUP_KNOWN] {counts}")
+    metrics.rows.update(rows_raw=len(df_raw), rows_processed=len(df))
 
     # 3) Save outputs + run metadata
-    save_run_outputs(
-        df_raw=df_raw,
-        df_processed=df,
-        run_id=run_id,
-        config=PIPELINE_CONFIG,
+    with metrics.stage("save", len(df_raw)):
+        save_run_outputs(
+            df_raw=df_raw,
+            df_processed=df,
+            run_id=run_id,
+            config=PIPELINE_CONFIG,
+            logger=logger,
+        )
+    # 4) Load
+    if PIPELINE_CONFIG.get("load_to_db", False):
+        with metrics.stage("db_load", len(df)):
+            counts = upsert_reviews(
+                df=df,
+                db_path=PIPELINE_CONFIG["db_path"],
+                app_id=PIPELINE_CONFIG["app_id"],
+                run_id=run_id,
+                change_detection=PIPELINE_CONFIG.get("db_change_detection", False),
+            )
+        logger.info(f"[DB_LOAD] sqlite db_path={PIPELINE_CONFIG['db_path']} rows={len(df)}{_format_counts(counts)}")
+
+    # 5) Incremental EDA summary
+    if PIPELINE_CONFIG.get("eda_incremental", False):
+        with metrics.stage("eda", len(df)):
+            update_cumulative(run_id, RunProfile(load_seen(PIPELINE_CONFIG)).update(df), config=PIPELINE_CONFIG, logger=logger)
+
+    # 6) Incremental keyword stats
+    if PIPELINE_CONFIG.get("keywords_incremental", False):
+        with metrics.stage("keywords", len(df)):
+            keywords.update_keywords(run_id, df, config=PIPELINE_CONFIG, logger=logger)
+
+    return len(df)
+
+
+def run_appstore(run_id, metrics):
+    """
+    Scrape PIPELINE_CONFIG["appstore_apps"] page by page and clean, save
+    (as run `{run_id}_appstore`) and load them like run_streaming does,
+    buffering DB batches per app. EDA and keyword stats stay Play-only.
+    """
+    load_to_db = PIPELINE_CONFIG.get("load_to_db", False)
+    batch_rows = PIPELINE_CONFIG.get("db_batch_rows", 2000)
+    apps = PIPELINE_CONFIG["appstore_apps"]
+    if load_to_db:
+        register_apps(PIPELINE_CONFIG["db_path"], {
+            (a["app_id"] if isinstance(a, dict) else a): APPSTORE_PLATFORM for a in apps
+        })
+    writer = RunOutputWriter(run_id=f"{run_id}_appstore", config=PIPELINE_CONFIG, logger=logger)
+
+    pages = scrape_appstore_pages(
+        apps,
+        max_workers=PIPELINE_CONFIG.get("appstore_workers", 8),
+        requests_per_sec=PIPELINE_CONFIG.get("appstore_rate_limit_per_sec"),
+        base_url=PIPELINE_CONFIG.get("appstore_base_url", "https://itunes.apple.com"),
+        uid_scheme=PIPELINE_CONFIG.get("uid_scheme", DEFAULT_UID_SCHEME),
+        page_latency=metrics.histogram("appstore"),
         logger=logger,
     )
-    # 4) Load
+
+    buffers, buffered, loaded, n_pages = {}, {}, 0, 0
+    known_counts = {"new": 0, "changed": 0, "unchanged": 0}
+    load_counts = {}
+
+    def _flush(app_id):
+        nonlocal loaded
+        if not buffers.get(app_id):
+            return
+        batch = pd.concat(buffers.pop(app_id), ignore_index=True)
+        buffered[app_id] = 0
+        with metrics.stage("appstore_db_load", len(batch)):
+            counts = upsert_reviews(
+                df=batch,
+                db_path=PIPELINE_CONFIG["db_path"],
+                app_id=app_id,
+                run_id=run_id,
+                change_detection=PIPELINE_CONFIG.get("db_change_detection", False),
+            )
+        loaded += len(batch)
+        _add_counts(load_counts, counts)
+
+    for page in metrics.timed_pages(pages, "appstore_scrape"):
+        n_pages += 1
+        app_id = page["app_id"].iat[0]
+        with metrics.stage("appstore_clean", len(page)):
+            page_clean = basic_clean(page)
+        if _skip_known():
+            with metrics.stage("appstore_dedup_known", len(page_clean)):
+                page_clean, counts = _drop_known(page_clean, run_id)
+            _add_counts(known_counts, counts)
+        with metrics.stage("appstore_save", len(page)):
+            writer.append(page, page_clean)
+
+        if load_to_db:
+            buffers.setdefault(app_id, []).append(page_clean[EXPECTED_COLS])
+            buffered[app_id] = buffered.get(app_id, 0) + len(page_clean)
+            if buffered[app_id] >= batch_rows:
+                _flush(app_id)
+
+    if load_to_db:
+        for app_id in list(buffers):
+            _flush(app_id)
+        logger.info(f"[DB_LOAD] appstore rows={loaded}{_format_counts(load_counts)}")
+
+    logger.info(f"[SCRAPE] appstore apps={len(apps)} pages={n_pages} rows={writer.rows_raw}")
+    if _skip_known():
+        logger.info(f"[DEDUP_KNOWN] appstore {known_counts}")
+    with metrics.stage("appstore_save"):
+        writer.close()
+    metrics.rows.update(appstore_rows_raw=writer.rows_raw, appstore_rows_processed=writer.rows_processed)
+    return writer.rows_processed
+
+
+def _save_metrics(run_id, metrics, status, started_at, mode):
+    """
+    Write the run's metrics to its metadata JSON, the pipeline_runs table
+    (when loading to the DB) and, with profile_cprofile, a .prof file.
+    """
+    summary = metrics.to_dict()
+    logger.info(
+        f"[METRICS] status={status} wall_s={summary['wall_s']} cpu_s={summary['cpu_s']} "
+        f"peak_rss_mb={summary['peak_rss_mb']} stages="
+        + str({name: round(st["wall_s"], 2) for name, st in summary["stages"].items()})
+        + f" page_p50_ms={summary['page_latency']['p50_ms']} page_p90_ms={summary['page_latency']['p90_ms']}"
+    )
+    extra = {"metrics": summary}
+    if metrics.profile is not None:
+        prof_path = Path(PIPELINE_CONFIG["logs_dir"]) / f"profile_{run_id}.prof"
+        metrics.dump_profile(prof_path)
+        extra["cprofile"] = {"path": str(prof_path), "top": metrics.profile_summary()}
+    add_run_metadata(run_id, extra, config=PIPELINE_CONFIG, logger=logger)
+
     if PIPELINE_CONFIG.get("load_to_db", False):
-        upsert_reviews(
-            df=df,
-            db_path=PIPELINE_CONFIG["db_path"],
-            app_id=PIPELINE_CONFIG["app_id"],
-            run_id=run_id,
+        record_pipeline_run(PIPELINE_CONFIG["db_path"], {
+            "run_id": run_id,
+            "app_id": PIPELINE_CONFIG["app_id"],
+            "mode": mode,
+            "status": status,
+            "started_at": started_at,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "rows_raw": metrics.rows.get("rows_raw"),
+            "rows_processed": metrics.rows.get("rows_processed"),
+            "metrics": summary,
+        })
+
+
+def run_pipeline(resume_run_id=None):
+    """
+    One pipeline run; returns its run_id. resume_run_id continues an
+    interrupted checkpointed run (see run_streaming) under its own run_id.
+    """
+    start_ts = time.time()
+    run_id = resume_run_id or datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + uuid.uuid4().hex[:8]
+    started_at = datetime.now().isoformat(timespec="seconds")
+    logger.info(f"[RUN_START] run_id={run_id}" + (" resume=yes" if resume_run_id else ""))
+
+    use_scraper = PIPELINE_CONFIG.get("use_scraper", False)
+    load_to_db = PIPELINE_CONFIG.get("load_to_db", False)
+    # Checkpoints are per page, so checkpointed runs take the streaming path
+    streaming = use_scraper and (PIPELINE_CONFIG.get("streaming", False) or _checkpointing())
+
+    resume = None
+    if resume_run_id is not None:
+        if not (use_scraper and load_to_db):
+            raise ValueError("--resume needs use_scraper and load_to_db")
+        resume = load_run_checkpoint(PIPELINE_CONFIG["db_path"], resume_run_id)
+        if resume is None:
+            raise ValueError(f"No checkpoint for run {resume_run_id} (never checkpointed, or it completed)")
+        if resume[0] != PIPELINE_CONFIG["app_id"]:
+            raise ValueError(f"Run {resume_run_id} is for app_id={resume[0]}, config has {PIPELINE_CONFIG['app_id']}")
+        streaming = True
+
+    metrics = RunMetrics(
+        run_id,
+        profile=PIPELINE_CONFIG.get("profile_cprofile", False),
+        trace_memory=PIPELINE_CONFIG.get("profile_tracemalloc", False),
     )
-        logger.info(f"[DB_LOAD] sqlite db_path={PIPELINE_CONFIG['db_path']} rows={len(df)}")
+    metrics.start()
+    status = "error"
+    try:
+        cursors = None
+        if use_scraper and load_to_db and PIPELINE_CONFIG.get("incremental", False):
+            with metrics.stage("cursors"):
+                cursors = load_scrape_cursors(
+                    PIPELINE_CONFIG["db_path"], PIPELINE_CONFIG["app_id"], SORT_MODES
+                )
+            for (_, sort_name), c in cursors.items():
+                logger.info(
+                    f"[CURSOR] sort_mode={sort_name} newest_review_date={c.newest_review_date} "
+                    f"resume_token={'yes' if c.continuation_token else 'no'}"
+                )
+
+        response_cache = ResponseCache.from_config(PIPELINE_CONFIG) if use_scraper else None
+        if streaming:
+            run_streaming(run_id, cursors=cursors, metrics=metrics, response_cache=response_cache, resume=resume)
+        else:
+            run_batch(run_id, cursors=cursors, metrics=metrics, response_cache=response_cache)
+        if response_cache is not None:
+            logger.info(f"[RESPONSE_CACHE] mode={response_cache.mode} {response_cache.stats}")
+            metrics.rows["response_cache"] = dict(response_cache.stats, mode=response_cache.mode)
 
+        # Advance cursors only once the rows they cover are in the DB
+        if cursors is not None:
+            with metrics.stage("cursors"):
+                save_scrape_cursors(PIPELINE_CONFIG["db_path"], cursors.values())
+            new_counts = {c.sort_mode: c.new_rows for c in cursors.values()}
+            logger.info(f"[CURSOR_SAVE] new_rows={new_counts}")
+
+        if PIPELINE_CONFIG.get("appstore_apps"):
+            run_appstore(run_id, metrics)
+
+        if load_to_db and PIPELINE_CONFIG.get("version_alerts", False):
+            with metrics.stage("version_alerts"):
+                update_alerts(run_id, config=PIPELINE_CONFIG, logger=logger)
+        if streaming and (resume is not None or _checkpointing()):
+            clear_run_checkpoint(PIPELINE_CONFIG["db_path"], run_id)
+        status = "ok"
+    finally:
+        metrics.stop()
+        # A failure here must not replace the run's own exception
+        try:
+            _save_metrics(run_id, metrics, status, started_at, "streaming" if streaming else "batch")
+        except Exception as e:
+            logger.warning(f"[METRICS] not saved run_id={run_id} error={e!r}")
 
     elapsed = time.time() - start_ts
     logger.info(f"[RUN_END] run_id={run_id} duration_sec={elapsed:.2f}")
+    return run_id
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape, clean, save and load one pipeline run")
+    parser.add_argument("--resume", metavar="RUN_ID", default=None,
+                        help="Continue an interrupted checkpointed run after its last committed page")
+    args = parser.parse_args()
+    run_pipeline(resume_run_id=args.resume)
+
 
 if __name__ == "__main__":
     try:
-        run_pipeline()
+        main()
     except Exception as e:
         logger.exception(f"[RUN_ERROR] {e}")
         raise
@@ -0,0 +1,308 @@
+"""
+Multi-app scheduler: runs run_pipeline for a portfolio of Play apps on a
+bounded worker pool, with fetch depth and frequency following each app's
+review velocity and one page-request budget shared by all apps.
+
+Apps come from the JSON file `scheduler_apps_file` (a list of app_ids or
+{"app_id", "country", "lang"} dicts) or, when that is None, from the
+google_play rows of the apps table.
+
+Per cycle, for each app:
+- velocity = reviews per hour over the last `scheduler_velocity_window_hours`
+  (from rollup_daily, so one row per app-day is read);
+- interval = the time it takes to gather `scheduler_new_reviews_per_run`
+  new reviews at that velocity, clamped to [min, max] interval hours;
+  the app is due once that long has passed since its last ok run
+  (pipeline_runs), and always when it never ran;
+- target_per_mode = expected new reviews since the last run times
+  `scheduler_depth_margin`, clamped to [min, max] target (max for apps
+  that never ran, as a backfill).
+
+Due apps are taken in order of expected new reviews, apps that never ran
+last (their backfill gets whatever the others leave). Each costs
+ceil(target / 200) page requests per sort mode (an upper bound: NEWEST
+stops at the cursor's high-water mark). Once `scheduler_request_budget`
+is spent, the next app's depth is cut to what is left and the rest wait
+for the next cycle. A NEWEST run cut short by its target leaves the
+cursor's continuation token, so the app's next run pages on through the
+reviews it did not reach (see scraper.StreamCursor). High-traffic apps are thus refreshed often and deep,
+and quiet apps are rarely due and cheap when they are.
+
+Every app runs in its own worker process, because run_pipeline reads the
+module-level PIPELINE_CONFIG; the scheduler sets app_id, target_per_mode
+and per-app EDA / keyword / alert state dirs in the worker. The
+per-process rate limit is rate_limit_per_sec / scheduler_workers, so
+the total stays within the configured rate.
+
+  python -m google_play_reviews.pipeline.scheduler --plan
+  python -m google_play_reviews.pipeline.scheduler --loop
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from . import run_pipeline as rp
+from .config import PIPELINE_CONFIG
+from .db import connect, init_db
+
+PAGE_SIZE = 200  # reviews per google_play_scraper.reviews call (see scraper.iter_page_columns)
+
+# Per-app state dirs, so concurrent runs of different apps never share a state file
+APP_STATE_DIRS = ["eda_state_dir", "eda_report_dir", "keywords_state_dir", "version_alerts_dir"]
+
+
+def load_apps(config=PIPELINE_CONFIG) -> list[dict]:
+    """
+    [{"app_id", "country", "lang"}] from scheduler_apps_file, else the apps table.
+    """
+    defaults = {"country": config.get("country", "us"), "lang": config.get("lang", "en")}
+    path = config.get("scheduler_apps_file")
+    if path:
+        entries = json.loads(Path(path).read_text(encoding="utf-8"))
+        if isinstance(entries, dict):
+            entries = entries["apps"]
+        return [{**defaults, **(e if isinstance(e, dict) else {"app_id": e})} for e in entries]
+    conn = connect(config["db_path"])
+    try:
+        rows = conn.execute("SELECT app_id FROM apps WHERE platform = 'google_play' ORDER BY app_id").fetchall()
+    finally:
+        conn.close()
+    return [{**defaults, "app_id": r[0]} for r in rows]
+
+
+def review_velocity(db_path: str, app_ids, window_hours: float, now: datetime) -> dict:
+    """
+    {app_id: reviews per hour} over the `window_hours` before `now`, by review_date.
+    """
+    since = (now - timedelta(hours=window_hours)).strftime("%Y-%m-%d")
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT app_id, SUM(reviews) FROM rollup_daily
+            WHERE day >= ? AND app_id IN ({', '.join('?' for _ in app_ids)})
+            GROUP BY app_id
+            """,
+            [since, *app_ids],
+        ).fetchall()
+    finally:
+        conn.close()
+    counts = dict(rows)
+    return {a: (counts.get(a) or 0) / window_hours for a in app_ids}
+
+
+def last_ok_runs(db_path: str, app_ids) -> dict:
+    """
+    {app_id: started_at of its latest ok run}; apps that never ran are absent.
+    """
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT app_id, MAX(started_at) FROM pipeline_runs
+            WHERE status = 'ok' AND app_id IN ({', '.join('?' for _ in app_ids)})
+            GROUP BY app_id
+            """,
+            list(app_ids),
+        ).fetchall()
+    finally:
+        conn.close()
+    return {a: datetime.fromisoformat(t) for a, t in rows if t}
+
+
+def _priority(entry: dict):
+    return (math.isinf(entry["expected_new"]), -entry["expected_new"])
+
+
+def plan_cycle(apps, velocity: dict, last_run: dict, config=PIPELINE_CONFIG, now: datetime | None = None,
+               n_sort_modes: int = len(rp.SORT_MODES)) -> list[dict]:
+    """
+    One entry per app with its velocity, interval, target_per_mode,
+    page-request estimate and action: "run", "not_due" or "over_budget".
+    Entries to run come first, in priority order.
+    """
+    now = now or datetime.now()
+    min_iv, max_iv = config["scheduler_min_interval_hours"], config["scheduler_max_interval_hours"]
+    min_t, max_t = config["scheduler_min_target"], config["scheduler_max_target"]
+
+    entries = []
+    for app in apps:
+        app_id = app["app_id"]
+        v = velocity.get(app_id, 0.0)
+        interval = max_iv if v <= 0 else min(max(config["scheduler_new_reviews_per_run"] / v, min_iv), max_iv)
+        last = last_run.get(app_id)
+        if last is None:
+            hours_since, expected, target = None, math.inf, max_t
+        else:
+            hours_since = (now - last).total_seconds() / 3600
+            expected = v * hours_since
+            target = int(min(max(math.ceil(expected * config["scheduler_depth_margin"]), min_t), max_t))
+        entries.append({
+            **app,
+            "velocity_per_h": round(v, 3),
+            "interval_h": round(interval, 2),
+            "hours_since_run": None if hours_since is None else round(hours_since, 2),
+            "next_due": None if last is None else (last + timedelta(hours=interval)).isoformat(timespec="seconds"),
+            "expected_new": expected,
+            "due": last is None or hours_since >= interval,
+            "target_per_mode": target,
+        })
+
+    budget = config.get("scheduler_request_budget")
+    remaining = math.inf if budget is None else budget
+    # Known apps by expected new reviews; never-run apps backfill with what is left
+    for e in sorted(entries, key=_priority):
+        pages = math.ceil(e["target_per_mode"] / PAGE_SIZE) * n_sort_modes
+        if not e["due"]:
+            e["action"] = "not_due"
+        elif pages <= remaining:
+            e["action"] = "run"
+        elif remaining >= n_sort_modes:
+            # Cut depth to what the budget still covers
+            e["target_per_mode"] = int(remaining // n_sort_modes) * PAGE_SIZE
+            pages = math.ceil(e["target_per_mode"] / PAGE_SIZE) * n_sort_modes
+            e["action"] = "run"
+        else:
+            e["action"] = "over_budget"
+        e["pages"] = pages
+        if e["action"] == "run":
+            remaining -= pages
+
+    order = {"run": 0, "over_budget": 1, "not_due": 2}
+    entries.sort(key=lambda e: (order[e["action"]], _priority(e)))
+    for e in entries:
+        if math.isinf(e["expected_new"]):
+            e["expected_new"] = None
+        else:
+            e["expected_new"] = round(e["expected_new"], 1)
+    return entries
+
+
+def _app_dir(app_id: str) -> str:
+    return re.sub(r"[^\w.-]", "_", app_id)
+
+
+def app_overrides(entry: dict, config=PIPELINE_CONFIG) -> dict:
+    """
+    Full config for one scheduled run of entry["app_id"], applied to
+    PIPELINE_CONFIG in the worker.
+    """
+    workers = max(1, int(config.get("scheduler_workers", 1)))
+    rate = config.get("rate_limit_per_sec")
+    overrides = {
+        **config,
+        "app_id": entry["app_id"],
+        "country": entry["country"],
+        "lang": entry["lang"],
+        "target_per_mode": entry["target_per_mode"],
+        "use_scraper": True,
+        "appstore_apps": [],
+        "rate_limit_per_sec": rate / workers if rate else rate,
+    }
+    for key in APP_STATE_DIRS:
+        overrides[key] = str(Path(config[key]) / _app_dir(entry["app_id"]))
+    return overrides
+
+
+def run_app(overrides: dict) -> dict:
+    """
+    Worker process entry point: one run_pipeline for one app.
+    """
+    PIPELINE_CONFIG.update(overrides)
+    t0 = time.perf_counter()
+    try:
+        run_id = rp.run_pipeline()
+        status, error = "ok", None
+    except Exception as e:
+        rp.logger.exception(f"[SCHEDULER] app_id={overrides['app_id']} error={e!r}")
+        run_id, status, error = None, "error", repr(e)
+    return {"app_id": overrides["app_id"], "run_id": run_id, "status": status, "error": error,
+            "wall_s": round(time.perf_counter() - t0, 2)}
+
+
+def run_cycle(config=PIPELINE_CONFIG, logger=None, dry_run: bool = False, now: datetime | None = None):
+    """
+    Plan one cycle and run its due apps. Returns (plan, results).
+    """
+    init_db(config["db_path"])  # migrate once here rather than racing in the workers
+    apps = load_apps(config)
+    if not apps:
+        return [], []
+    now = now or datetime.now()
+    app_ids = [a["app_id"] for a in apps]
+    plan = plan_cycle(
+        apps,
+        review_velocity(config["db_path"], app_ids, config["scheduler_velocity_window_hours"], now),
+        last_ok_runs(config["db_path"], app_ids),
+        config,
+        now,
+    )
+    jobs = [e for e in plan if e["action"] == "run"]
+    if logger:
+        logger.info(
+            f"[SCHEDULER] apps={len(apps)} due={len(jobs)} pages={sum(e['pages'] for e in jobs)} "
+            f"budget={config.get('scheduler_request_budget')} "
+            f"deferred={[e['app_id'] for e in plan if e['action'] == 'over_budget']}"
+        )
+    if dry_run or not jobs:
+        return plan, []
+
+    results = []
+    workers = max(1, min(int(config.get("scheduler_workers", 1)), len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_app, app_overrides(e, config)) for e in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if logger:
+                logger.info(f"[SCHEDULER] app_id={result['app_id']} status={result['status']} "
+                            f"run_id={result['run_id']} wall_s={result['wall_s']}")
+    return plan, results
+
+
+def seconds_until_next(plan: list[dict], config=PIPELINE_CONFIG, now: datetime | None = None) -> float:
+    now = now or datetime.now()
+    floor = config["scheduler_min_interval_hours"] * 3600
+    waits = [(datetime.fromisoformat(e["next_due"]) - now).total_seconds()
+             for e in plan if e["action"] == "not_due" and e["next_due"]]
+    return max(min(waits, default=floor), 60.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pipeline for many apps by review velocity")
+    parser.add_argument("--apps-file", default=PIPELINE_CONFIG.get("scheduler_apps_file"),
+                        help="JSON list of app_ids / {app_id, country, lang}; default: the apps table")
+    parser.add_argument("--workers", type=int, default=PIPELINE_CONFIG["scheduler_workers"])
+    parser.add_argument("--budget", type=int, default=PIPELINE_CONFIG["scheduler_request_budget"],
+                        help="Page requests per cycle, all apps together")
+    parser.add_argument("--plan", action="store_true", help="Print the plan without running anything")
+    parser.add_argument("--loop", action="store_true", help="Keep running cycles until interrupted")
+    args = parser.parse_args()
+
+    logger = rp.logger
+    config = {**PIPELINE_CONFIG, "scheduler_apps_file": args.apps_file,
+              "scheduler_workers": args.workers, "scheduler_request_budget": args.budget}
+    while True:
+        plan, _ = run_cycle(config, logger, dry_run=args.plan)
+        if args.plan:
+            cols = ["app_id", "action", "velocity_per_h", "interval_h", "hours_since_run",
+                    "expected_new", "target_per_mode", "pages"]
+            print("\t".join(cols))
+            for e in plan:
+                print("\t".join(str(e[c]) for c in cols))
+        if not args.loop:
+            return
+        wait = seconds_until_next(plan, config)
+        logger.info(f"[SCHEDULER] sleeping {wait / 60:.0f} min")
+        time.sleep(wait)
+
+
+if __name__ == "__main__":
+    main()
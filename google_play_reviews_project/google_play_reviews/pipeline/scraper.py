@@ -1,8 +1,71 @@
-from google_play_scraper import reviews
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from google_play_scraper import Sort, reviews
+from google_play_scraper.features.reviews import _ContinuationToken
 import pandas as pd
 from tqdm import tqdm
 import hashlib
+import json
+import sys
+import time
 from datetime import datetime
+import numpy as np
+
+from .throttle import host_limiter
+from .uids import DEFAULT_UID_SCHEME, page_uids
+
+PLAY_HOST = "play.google.com"
+
+EXPECTED_COLS = [
+    "review_uid", "user_name", "rating", "review_text", "review_date",
+    "thumbs_up", "app_version", "sort_mode", "scrape_time"
+]
+
+
+# output column -> google_play_scraper review field, collected column-wise per page
+PAGE_SOURCE_FIELDS = {
+    "user_name": "userName",
+    "rating": "score",
+    "review_text": "content",
+    "review_date": "at",
+    "thumbs_up": "thumbsUpCount",
+    "app_version": "reviewCreatedVersion",
+}
+
+
+def _interned(values):
+    # user_name / app_version repeat heavily; share one string object per distinct value
+    return [sys.intern(v) if isinstance(v, str) else v for v in values]
+
+
+def _int_column(values):
+    # Same dtype pandas would infer from row dicts: int64, or float64 if any value is missing
+    if any(v is None for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    return np.array(values, dtype=np.int64)
+
+
+def page_frame(page, sort_name, scrape_time):
+    """
+    Typed EXPECTED_COLS DataFrame from column lists. sort_mode is constant;
+    scrape_time is one value per page, broadcast (scalar) or already
+    expanded to one value per row (array).
+    """
+    n = len(page["review_uid"])
+    if np.ndim(scrape_time) == 0:
+        scrape_time = np.full(n, np.datetime64(scrape_time, "ns"))
+    return pd.DataFrame({
+        "review_uid": page["review_uid"],
+        "user_name": _interned(page["user_name"]),
+        "rating": _int_column(page["rating"]),
+        "review_text": page["review_text"],
+        "review_date": pd.to_datetime(page["review_date"]),
+        "thumbs_up": _int_column(page["thumbs_up"]),
+        "app_version": _interned(page["app_version"]),
+        "sort_mode": [sort_name] * n,
+        "scrape_time": scrape_time,
+    }, columns=EXPECTED_COLS)
 
 
 def make_review_uid(user, date, text):
@@ -10,92 +73,533 @@ def make_review_uid(user, date, text):
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-def collect_reviews(app_id, lang, country, target_per_mode, sort_mode, sort_name):
-    all_rows = []
+class StreamCursor:
+    """
+    Incremental state of one (app_id, sort_mode) stream, persisted in the
+    scrape_cursors table (see db.load_scrape_cursors / db.save_scrape_cursors).
+
+    NEWEST is date-ordered, so paging stops at the stored high-water mark
+    (newest review_date/review_uid of a fully fetched stretch). If a run
+    stops at target_per_mode first, the reviews between its last page and
+    the mark are still unfetched: the mark stays, the continuation token is
+    saved and the next run pages on from it until it reaches the mark; the
+    newest review seen meanwhile waits as the pending mark. Other sorts have
+    no usable order, so they resume from the saved continuation token.
+    """
+
+    def __init__(self, app_id, sort_mode, newest_review_date=None, newest_review_uid=None,
+                 continuation_token=None, pending_review_date=None, pending_review_uid=None):
+        self.app_id = app_id
+        self.sort_mode = sort_mode
+        self.newest_review_date = pd.to_datetime(newest_review_date) if newest_review_date else None
+        self.newest_review_uid = newest_review_uid
+        self.continuation_token = continuation_token  # JSON text, see token_to_json
+        self.pending_review_date = pd.to_datetime(pending_review_date) if pending_review_date else None
+        self.pending_review_uid = pending_review_uid
+        self.start()
+
+    def reached_known(self, uid, review_date):
+        if self.newest_review_date is None:
+            return False
+        if uid == self.newest_review_uid:
+            return True
+        return review_date is not None and pd.Timestamp(review_date) < self.newest_review_date
+
+    def observe(self, uid, review_date):
+        self.new_rows += 1
+        if review_date is None:
+            return
+        ts = pd.Timestamp(review_date)
+        if self._seen_date is None or ts > self._seen_date:
+            self._seen_date = ts
+            self._seen_uid = uid
+
+    def start(self):
+        self.new_rows = 0
+        self._seen_date = None
+        self._seen_uid = None
+
+    def restore(self, new_rows, seen_date, seen_uid):
+        # Progress of an interrupted run, see StreamCheckpoint
+        self.new_rows = new_rows
+        self._seen_date = pd.to_datetime(seen_date) if seen_date else None
+        self._seen_uid = seen_uid
+
+    def finish(self, continuation_token, drained=None):
+        """
+        Record the end of a run's paging. Streams without a high-water mark
+        (drained=None) keep `continuation_token`. NEWEST passes drained:
+        False (stopped at target_per_mode before the mark) keeps the mark
+        and the token to close the gap from on the next run; True moves the
+        mark to the newest review seen.
+        """
+        seen_date, seen_uid = self._seen_date, self._seen_uid
+        if self.pending_review_date is not None and (seen_date is None or self.pending_review_date > seen_date):
+            seen_date, seen_uid = self.pending_review_date, self.pending_review_uid
+
+        if drained is False and self.newest_review_date is not None:
+            self.continuation_token = token_to_json(continuation_token)
+            self.pending_review_date, self.pending_review_uid = seen_date, seen_uid
+            return
+        self.continuation_token = None if drained is not None else token_to_json(continuation_token)
+        self.pending_review_date = self.pending_review_uid = None
+        if seen_date is not None and (self.newest_review_date is None or seen_date > self.newest_review_date):
+            self.newest_review_date = seen_date
+            self.newest_review_uid = seen_uid
+
+
+class StreamCheckpoint:
+    """
+    Position of one (app_id, sort_mode, country, lang) stream within a
+    checkpointed run, persisted per committed page in run_stream_checkpoints
+    (see db.upsert_reviews / db.load_run_checkpoint). A checkpoint with
+    pages > 0 makes iter_page_columns continue from its token instead of
+    the stream's start.
+    """
+
+    def __init__(self, app_id, sort_mode, country, lang, continuation_token=None, pages=0, collected=0,
+                 new_rows=0, seen_review_date=None, seen_review_uid=None, done=False):
+        self.app_id = app_id
+        self.sort_mode = sort_mode  # sort name, e.g. "newest"
+        self.country = country
+        self.lang = lang
+        self.continuation_token = continuation_token  # JSON text, see token_to_json
+        self.pages = pages
+        self.collected = collected
+        self.new_rows = new_rows
+        self.seen_review_date = seen_review_date
+        self.seen_review_uid = seen_review_uid
+        self.done = bool(done)
+
+    @property
+    def key(self):
+        return (self.app_id, self.sort_mode, self.country, self.lang)
+
+    def advance(self, continuation_token, collected, done, cursor=None):
+        self.continuation_token = token_to_json(continuation_token)
+        self.pages += 1
+        self.collected = collected
+        self.done = done or self.continuation_token is None
+        if cursor is not None:
+            self.new_rows = cursor.new_rows
+            self.seen_review_date = None if cursor._seen_date is None \
+                else cursor._seen_date.strftime("%Y-%m-%d %H:%M:%S")
+            self.seen_review_uid = cursor._seen_uid
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def token_to_json(token):
+    if token is None or getattr(token, "token", None) is None:
+        return None
+    return json.dumps({
+        "token": token.token,
+        "lang": token.lang,
+        "country": token.country,
+        "sort": token.sort,
+        "count": token.count,
+    })
+
+
+def token_from_json(text):
+    if not text:
+        return None
+    d = json.loads(text)
+    return _ContinuationToken(d["token"], d["lang"], d["country"], d["sort"], d["count"], None, None)
+
+
+def iter_page_columns(app_id, lang, country, target_per_mode, sort_mode, sort_name,
+                      rate_limiter=None, position=None, cursor=None, uid_scheme=DEFAULT_UID_SCHEME,
+                      page_latency=None, response_cache=None, checkpoint=None):
+    """
+    Yield (columns, scrape_time) per fetched page, where columns maps
+    review_uid + PAGE_SOURCE_FIELDS to per-page lists, until the stream
+    ends, `target_per_mode` rows were collected, or the cursor's high-water
+    mark is reached. The NEWEST mark only advances once everything down to
+    it was fetched (see StreamCursor); stopping at the target first saves
+    the continuation token to resume from instead.
+
+    page_latency: optional metrics.LatencyHistogram, observing each page
+    request (rate limiter wait excluded).
+    response_cache: optional response_cache.ResponseCache; cached pages
+    skip the rate limiter and the request.
+    checkpoint: optional StreamCheckpoint, resumed from when it has pages
+    and advanced before each page is yielded.
+    """
+    collected = 0
     continuation_token = None
     pbar = None
 
+    # Incremental mode: NEWEST stops at the high-water mark, other sorts (and
+    # a NEWEST gap left by an earlier run) resume from the saved token
+    stop_at_known = cursor is not None and sort_mode == Sort.NEWEST
+    if cursor is not None:
+        cursor.start()
+        continuation_token = token_from_json(cursor.continuation_token)
+    reached_known = drained = False
+
+    if checkpoint is not None and checkpoint.pages:
+        # Resuming an interrupted run: continue after its last committed page
+        collected = checkpoint.collected
+        continuation_token = token_from_json(checkpoint.continuation_token)
+        if cursor is not None:
+            cursor.restore(checkpoint.new_rows, checkpoint.seen_review_date, checkpoint.seen_review_uid)
+        if checkpoint.done:
+            if cursor is not None:
+                # A drained stream's checkpoint has no token, see below
+                cursor.finish(continuation_token, drained=continuation_token is None if stop_at_known else None)
+            return
+
     try:
-        pbar = tqdm(total=target_per_mode, desc=f"Collecting ({sort_name})")
-
-        while len(all_rows) < target_per_mode:
-            result, continuation_token = reviews(
-                app_id,
-                lang=lang,
-                country=country,
-                sort=sort_mode,
-                count=200,
-                continuation_token=continuation_token
-            )
+        pbar = tqdm(total=target_per_mode, desc=f"Collecting ({app_id}/{sort_name})", position=position)
+
+        while collected < target_per_mode:
+            key = cached = None
+            if response_cache is not None:
+                key = response_cache.key(app_id, lang, country, sort_mode, 200, continuation_token)
+                cached = response_cache.get(key) if key is not None else None
+
+            if cached is not None:
+                result, continuation_token = cached
+            else:
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
+
+                t0 = time.perf_counter()
+                result, continuation_token = reviews(
+                    app_id,
+                    lang=lang,
+                    country=country,
+                    sort=sort_mode,
+                    count=200,
+                    continuation_token=continuation_token
+                )
+                if page_latency is not None:
+                    page_latency.observe(time.perf_counter() - t0)
+                if key is not None:
+                    response_cache.put(key, result, continuation_token)
 
             if not result:
+                drained = True
                 break
 
-            for r in result:
-                row = {
-                    "review_uid": make_review_uid(
-                        r.get("userName"),
-                        r.get("at"),
-                        r.get("content")
-                    ),
-                    "user_name": r.get("userName"),
-                    "rating": r.get("score"),
-                    "review_text": r.get("content"),
-                    "review_date": r.get("at"),
-                    "thumbs_up": r.get("thumbsUpCount"),
-                    "app_version": r.get("reviewCreatedVersion"),
-                    "sort_mode": sort_name,
-                    "scrape_time": datetime.utcnow(),
-                }
-                all_rows.append(row)
+            page = {c: [] for c in PAGE_SOURCE_FIELDS}
+            page["review_uid"] = []
+            for r, uid in zip(result, page_uids(result, uid_scheme)):
+                if stop_at_known and cursor.reached_known(uid, r.get("at")):
+                    reached_known = True
+                    break
+                if cursor is not None:
+                    cursor.observe(uid, r.get("at"))
+
+                page["review_uid"].append(uid)
+                for col, field in PAGE_SOURCE_FIELDS.items():
+                    page[col].append(r.get(field))
+
+            n_rows = len(page["review_uid"])
 
             # only count actually added toward the target
-            added = min(len(result), target_per_mode - len(all_rows) + len(result))
-            pbar.update(min(len(result), target_per_mode - (len(all_rows) - len(result))))
+            pbar.update(min(n_rows, target_per_mode - collected))
+            collected += n_rows
+
+            if checkpoint is not None:
+                checkpoint.advance(
+                    None if reached_known else continuation_token,
+                    collected,
+                    done=collected >= target_per_mode or reached_known,
+                    cursor=cursor,
+                )
+            if n_rows:
+                yield page, datetime.utcnow()
 
-            if continuation_token is None:
+            if continuation_token is None or reached_known:
+                drained = True
                 break
 
     finally:
         if pbar is not None:
             pbar.close()
 
-    df = pd.DataFrame(all_rows)
+    if cursor is not None:
+        cursor.finish(continuation_token, drained=drained if stop_at_known else None)
+
+
+def iter_review_pages(app_id, lang, country, target_per_mode, sort_mode, sort_name,
+                      rate_limiter=None, position=None, cursor=None, uid_scheme=DEFAULT_UID_SCHEME,
+                      page_latency=None, response_cache=None, checkpoint=None):
+    """
+    Yield one typed DataFrame (EXPECTED_COLS) per fetched page; see iter_page_columns.
+    With a checkpoint, each frame carries its stream's position after that
+    page in attrs["checkpoint"] (a StreamCheckpoint.to_dict() snapshot).
+    """
+    for page, scrape_time in iter_page_columns(
+        app_id=app_id,
+        lang=lang,
+        country=country,
+        target_per_mode=target_per_mode,
+        sort_mode=sort_mode,
+        sort_name=sort_name,
+        rate_limiter=rate_limiter,
+        position=position,
+        cursor=cursor,
+        uid_scheme=uid_scheme,
+        page_latency=page_latency,
+        response_cache=response_cache,
+        checkpoint=checkpoint,
+    ):
+        df = page_frame(page, sort_name, scrape_time)
+        if checkpoint is not None:
+            # Snapshot now: the generator advances the checkpoint again before the next page
+            df.attrs["checkpoint"] = checkpoint.to_dict()
+        yield df
+
+
+def collect_reviews(app_id, lang, country, target_per_mode, sort_mode, sort_name,
+                    rate_limiter=None, position=None, cursor=None, uid_scheme=DEFAULT_UID_SCHEME,
+                    page_latency=None, response_cache=None):
+    # Append each page's column lists and build one DataFrame at the end:
+    # no per-row dicts and no per-page frames to concat
+    columns = {c: [] for c in ["review_uid", *PAGE_SOURCE_FIELDS]}
+    page_times, page_sizes = [], []
+    for page, scrape_time in iter_page_columns(
+        app_id=app_id,
+        lang=lang,
+        country=country,
+        target_per_mode=target_per_mode,
+        sort_mode=sort_mode,
+        sort_name=sort_name,
+        rate_limiter=rate_limiter,
+        position=position,
+        cursor=cursor,
+        uid_scheme=uid_scheme,
+        page_latency=page_latency,
+        response_cache=response_cache,
+    ):
+        for c, values in page.items():
+            columns[c].extend(values)
+        page_times.append(np.datetime64(scrape_time, "ns"))
+        page_sizes.append(len(page["review_uid"]))
+
+    if not page_sizes:
+        return pd.DataFrame()
+    df = page_frame(columns, sort_name, np.repeat(np.array(page_times), page_sizes))
     return df
 
 
-def scrape_reviews(app_id, lang, country, target_per_mode, sort_modes):
+def build_streams(app_ids, sort_modes, countries=("us",), langs=("en",)):
     """
-    sort_modes example:
-      {"newest": Sort.NEWEST, "most_relevant": Sort.MOST_RELEVANT}
+    One (app_id, sort_name, sort_mode, country, lang) tuple per independent review stream.
+    """
+    return [
+        (app_id, sort_name, sort_mode, country, lang)
+        for app_id in app_ids
+        for country in countries
+        for lang in langs
+        for sort_name, sort_mode in sort_modes.items()
+    ]
+
+
+def scrape_streams(streams, target_per_mode, max_workers=1, requests_per_sec=None, cursors=None,
+                   uid_scheme=DEFAULT_UID_SCHEME, uid_stats=None, page_latency=None, response_cache=None):
+    """
+    Collect every stream (see build_streams) on its own worker thread.
+
+    All streams hit the same host, so they share one rate limiter
+    (`requests_per_sec` page requests/sec in total; None = unlimited).
+    Results are merged in stream order, so dedup keeps the same rows as a
+    sequential run. Output has an extra leading `app_id` column.
+
+    cursors: optional {(app_id, sort_name): StreamCursor} for incremental
+    collection; each cursor is advanced in place.
+    uid_stats: optional uids.UidStats, updated with the rows before dedup.
+    page_latency: optional metrics.LatencyHistogram shared by all streams.
+    response_cache: optional response_cache.ResponseCache shared by all streams.
     """
-    dfs = []
+    cursors = cursors or {}
+    limiter = host_limiter(PLAY_HOST, requests_per_sec)
 
-    for sort_name, sort_mode in sort_modes.items():
-        df_mode = collect_reviews(
+    def _collect(position, stream):
+        app_id, sort_name, sort_mode, country, lang = stream
+        df_stream = collect_reviews(
             app_id=app_id,
             lang=lang,
             country=country,
             target_per_mode=target_per_mode,
             sort_mode=sort_mode,
-            sort_name=sort_name
+            sort_name=sort_name,
+            rate_limiter=limiter,
+            position=position,
+            cursor=cursors.get((app_id, sort_name)),
+            uid_scheme=uid_scheme,
+            page_latency=page_latency,
+            response_cache=response_cache,
         )
-        dfs.append(df_mode)
+        df_stream["app_id"] = app_id
+        return df_stream
+
+    workers = max(1, min(int(max_workers or 1), len(streams)))
+    if workers == 1:
+        dfs = [_collect(None, s) for s in streams]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+            dfs = list(pool.map(_collect, range(len(streams)), streams))
 
     raw_df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+    if uid_stats is not None:
+        uid_stats.update(raw_df)
 
     # Deduplicate
     if not raw_df.empty and "review_uid" in raw_df.columns:
         raw_df = raw_df.drop_duplicates(subset="review_uid")
 
     # Enforce expected column order (and fill missing cols)
-    expected_cols = [
-        "review_uid", "user_name", "rating", "review_text", "review_date",
-        "thumbs_up", "app_version", "sort_mode", "scrape_time"
-    ]
-    for c in expected_cols:
+    cols = ["app_id"] + EXPECTED_COLS
+    for c in cols:
         if c not in raw_df.columns:
             raw_df[c] = None
-    raw_df = raw_df[expected_cols]
+    raw_df = raw_df[cols]
 
     return raw_df
+
+
+def scrape_reviews(app_id, lang, country, target_per_mode, sort_modes,
+                   max_workers=1, requests_per_sec=None, cursors=None,
+                   uid_scheme=DEFAULT_UID_SCHEME, uid_stats=None, page_latency=None, response_cache=None):
+    """
+    sort_modes example:
+      {"newest": Sort.NEWEST, "most_relevant": Sort.MOST_RELEVANT}
+
+    max_workers > 1 collects the sort modes concurrently (see scrape_streams).
+    """
+    streams = build_streams([app_id], sort_modes, countries=[country], langs=[lang])
+    raw_df = scrape_streams(
+        streams,
+        target_per_mode=target_per_mode,
+        max_workers=max_workers,
+        requests_per_sec=requests_per_sec,
+        cursors=cursors,
+        uid_scheme=uid_scheme,
+        uid_stats=uid_stats,
+        page_latency=page_latency,
+        response_cache=response_cache,
+    )
+    return raw_df[EXPECTED_COLS]
+
+
+def _put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _interleave(page_iters, max_workers):
+    """
+    Drain several page generators on worker threads through a bounded queue,
+    yielding pages as they arrive. At most ~2 pages per worker are buffered.
+    """
+    q = queue.Queue(maxsize=2 * max_workers)
+    stop = threading.Event()
+    done = object()
+
+    def _drain(it):
+        try:
+            for page in it:
+                if not _put(q, page, stop):
+                    return
+        except BaseException as e:
+            _put(q, e, stop)
+        finally:
+            _put(q, done, stop)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+    try:
+        for it in page_iters:
+            pool.submit(_drain, it)
+        remaining = len(page_iters)
+        while remaining:
+            item = q.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+
+
+def scrape_pages(streams, target_per_mode, max_workers=1, requests_per_sec=None, cursors=None,
+                 uid_scheme=DEFAULT_UID_SCHEME, uid_stats=None, page_latency=None, response_cache=None,
+                 checkpoints=None):
+    """
+    Streaming counterpart of scrape_streams: yields deduplicated page
+    DataFrames (["app_id"] + EXPECTED_COLS) as soon as they are fetched,
+    so memory is bounded by a few pages plus the set of uids seen this run.
+
+    checkpoints: optional {(app_id, sort_name, country, lang): StreamCheckpoint};
+    streams without one get a fresh checkpoint. Each yielded page then has
+    attrs["checkpoints"], the stream positions (StreamCheckpoint.to_dict())
+    reached since the previous yielded page, so committing them with the
+    page never skips a page that deduplicated to nothing (positions reached
+    after the last non-empty page come on a final empty page).
+    """
+    limiter = host_limiter(PLAY_HOST, requests_per_sec)
+    cursors = cursors or {}
+    if checkpoints is not None:
+        for app_id, sort_name, _, country, lang in streams:
+            checkpoints.setdefault((app_id, sort_name, country, lang),
+                                   StreamCheckpoint(app_id, sort_name, country, lang))
+
+    def _stream_pages(position, stream):
+        app_id, sort_name, sort_mode, country, lang = stream
+        for page in iter_review_pages(
+            app_id=app_id,
+            lang=lang,
+            country=country,
+            target_per_mode=target_per_mode,
+            sort_mode=sort_mode,
+            sort_name=sort_name,
+            rate_limiter=limiter,
+            position=position,
+            cursor=cursors.get((app_id, sort_name)),
+            uid_scheme=uid_scheme,
+            page_latency=page_latency,
+            response_cache=response_cache,
+            checkpoint=None if checkpoints is None else checkpoints[(app_id, sort_name, country, lang)],
+        ):
+            page.insert(0, "app_id", app_id)
+            yield page
+
+    workers = max(1, min(int(max_workers or 1), len(streams)))
+    if workers == 1:
+        pages = (p for s in streams for p in _stream_pages(None, s))
+    else:
+        pages = _interleave([_stream_pages(i, s) for i, s in enumerate(streams)], workers)
+
+    seen = set()
+    reached = {}
+    for page in pages:
+        if uid_stats is not None:
+            uid_stats.update(page)
+        if "checkpoint" in page.attrs:
+            state = page.attrs["checkpoint"]
+            reached[(state["app_id"], state["sort_mode"], state["country"], state["lang"])] = state
+        page = page.drop_duplicates(subset="review_uid")
+        page = page[~page["review_uid"].isin(seen)]
+        seen.update(page["review_uid"])
+        if not page.empty:
+            page = page.reset_index(drop=True)
+            page.attrs = {"checkpoints": list(reached.values())} if reached else {}
+            reached = {}
+            yield page
+    if reached:
+        # Positions reached after the last non-empty page ride on an empty one
+        page = pd.DataFrame(columns=["app_id"] + EXPECTED_COLS)
+        page.attrs = {"checkpoints": list(reached.values())}
+        yield page
@@ -3,29 +3,381 @@ from datetime import datetime
 import json
 import pandas as pd
 
-def save_run_outputs(df_raw, df_processed, run_id, config, logger):
-    raw_dir = Path(config["raw_out_dir"])
-    proc_dir = Path(config["processed_out_dir"])
-    raw_dir.mkdir(parents=True, exist_ok=True)
-    proc_dir.mkdir(parents=True, exist_ok=True)
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # CSV output works without pyarrow
+    pa = None
 
-    raw_out = raw_dir / f"reviews_raw_{run_id}.csv"
-    proc_out = proc_dir / f"reviews_processed_{run_id}.csv"
+# output_format -> file suffix
+OUTPUT_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",  # Arrow IPC file, memory-mappable
+}
 
-    df_raw.to_csv(raw_out, index=False)
-    df_processed.to_csv(proc_out, index=False)
+DATETIME_COLS = ["review_date", "scrape_time"]
+INT_COLS = ["rating", "thumbs_up"]
+CATEGORY_COLS = ["sort_mode", "app_version"]
+
+
+def _require_pyarrow(fmt):
+    if pa is None:
+        raise ImportError(f"output_format={fmt!r} requires pyarrow (pip install pyarrow)")
+
+
+def output_path(out_dir, prefix, run_id, fmt):
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output_format {fmt!r}, expected one of {list(OUTPUT_FORMATS)}")
+    return Path(out_dir) / f"{prefix}_{run_id}{OUTPUT_FORMATS[fmt]}"
+
+
+def detect_format(path):
+    suffix = Path(path).suffix.lower()
+    for fmt, ext in OUTPUT_FORMATS.items():
+        if suffix == ext:
+            return fmt
+    if suffix in (".arrow", ".ipc"):
+        return "feather"
+    raise ValueError(f"Cannot detect format of {path} (suffix {suffix!r})")
+
+
+def to_typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed columns for columnar formats: datetimes, nullable ints and
+    categorical sort_mode/app_version.
+    """
+    df = df.copy()
+    for col in DATETIME_COLS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    for col in INT_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def arrow_schema(df: pd.DataFrame):
+    """
+    Fixed Arrow types for the known review columns, so every page of a
+    streaming write shares one schema (pages with all-null columns included).
+    """
+    known = {
+        "app_id": pa.string(),
+        "review_uid": pa.string(),
+        "user_name": pa.string(),
+        "review_text": pa.string(),
+        "rating": pa.int64(),
+        "thumbs_up": pa.int64(),
+        "review_date": pa.timestamp("ns"),
+        "scrape_time": pa.timestamp("ns"),
+        "sort_mode": pa.dictionary(pa.int32(), pa.string()),
+        "app_version": pa.dictionary(pa.int32(), pa.string()),
+    }
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    return pa.schema([
+        pa.field(name, known.get(name, inferred.field(name).type))
+        for name in df.columns
+    ])
 
-    logger.info(f"[SAVE] raw={raw_out} processed={proc_out}")
+
+def _to_arrow(df, schema=None):
+    df = to_typed_frame(df)
+    if schema is None:
+        schema = arrow_schema(df)
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_frame(df: pd.DataFrame, path, fmt="csv", compression=None):
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return
+    _require_pyarrow(fmt)
+    table = _to_arrow(df)
+    if fmt == "parquet":
+        pq.write_table(table, path, compression=compression or "zstd")
+    else:
+        feather.write_feather(table, path, compression=compression or "lz4")
+
+
+def read_frame(path, columns=None) -> pd.DataFrame:
+    """
+    Read a run output in any OUTPUT_FORMATS, optionally only `columns`.
+    Columnar formats come back already typed; CSV dates are parsed here.
+    """
+    path = Path(path)
+    fmt = detect_format(path)
+
+    if fmt == "parquet":
+        _require_pyarrow(fmt)
+        return pq.read_table(path, columns=columns).to_pandas()
+    if fmt == "feather":
+        _require_pyarrow(fmt)
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    usecols = None if columns is None else (lambda c: c in set(columns))
+    df = pd.read_csv(path, usecols=usecols)
+    for col in DATETIME_COLS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def iter_frames(path, chunksize=100_000, columns=None):
+    """
+    Yield `path` as DataFrames of at most `chunksize` rows (same typing as
+    read_frame), holding only one chunk in memory at a time.
+    """
+    path = Path(path)
+    fmt = detect_format(path)
+
+    if fmt == "parquet":
+        _require_pyarrow(fmt)
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    if fmt == "feather":
+        _require_pyarrow(fmt)
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                table = pa.Table.from_batches([reader.get_batch(i)])
+                if columns is not None:
+                    table = table.select(columns)
+                for start in range(0, table.num_rows, chunksize):
+                    yield table.slice(start, chunksize).to_pandas()
+        return
+
+    usecols = None if columns is None else (lambda c: c in set(columns))
+    for df in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        for col in DATETIME_COLS:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        yield df
+
+
+def write_run_metadata(run_id, rows_raw, rows_processed, columns, config, logger):
+    proc_dir = Path(config["processed_out_dir"])
+    proc_dir.mkdir(parents=True, exist_ok=True)
 
     # Save small run metadata JSON (observability)
     meta = {
         "run_id": run_id,
         "timestamp": datetime.now().isoformat(),
-        "rows_raw": int(len(df_raw)),
-        "rows_processed": int(len(df_processed)),
-        "columns": list(df_processed.columns),
+        "rows_raw": int(rows_raw),
+        "rows_processed": int(rows_processed),
+        "columns": list(columns),
         "config": config,
     }
     meta_out = proc_dir / f"run_metadata_{run_id}.json"
     meta_out.write_text(json.dumps(meta, indent=2))
     logger.info(f"[SAVE] metadata={meta_out}")
+
+
+def add_run_metadata(run_id, extra, config, logger):
+    """
+    Merge `extra` into run_metadata_{run_id}.json (created if the run wrote
+    none, e.g. when it failed before saving outputs).
+    """
+    meta_out = Path(config["processed_out_dir"]) / f"run_metadata_{run_id}.json"
+    meta = json.loads(meta_out.read_text()) if meta_out.exists() else {"run_id": run_id}
+    meta.update(extra)
+    meta_out.parent.mkdir(parents=True, exist_ok=True)
+    meta_out.write_text(json.dumps(meta, indent=2))
+    logger.info(f"[SAVE] metadata={meta_out} keys={sorted(extra)}")
+
+
+def save_run_outputs(df_raw, df_processed, run_id, config, logger):
+    raw_dir = Path(config["raw_out_dir"])
+    proc_dir = Path(config["processed_out_dir"])
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    proc_dir.mkdir(parents=True, exist_ok=True)
+
+    fmt = config.get("output_format", "csv")
+    compression = config.get("output_compression")
+    raw_out = output_path(raw_dir, "reviews_raw", run_id, fmt)
+    proc_out = output_path(proc_dir, "reviews_processed", run_id, fmt)
+
+    write_frame(df_raw, raw_out, fmt, compression)
+    write_frame(df_processed, proc_out, fmt, compression)
+
+    logger.info(f"[SAVE] raw={raw_out} processed={proc_out}")
+
+    write_run_metadata(
+        run_id=run_id,
+        rows_raw=len(df_raw),
+        rows_processed=len(df_processed),
+        columns=df_processed.columns,
+        config=config,
+        logger=logger,
+    )
+
+
+class _ArrowAppender:
+    def __init__(self, path, fmt, compression):
+        self.path = path
+        self.fmt = fmt
+        self.compression = compression
+        self._writer = None
+        self._schema = None
+
+    def append(self, df):
+        if self._writer is None:
+            table = _to_arrow(df)
+            self._schema = table.schema
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression or "zstd")
+            else:
+                # An IPC file holds one dictionary per field, but every page brings
+                # its own sort_mode / app_version dictionary: store them as strings
+                self._schema = pa.schema([
+                    pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f
+                    for f in self._schema
+                ])
+                table = table.cast(self._schema)
+                options = pa.ipc.IpcWriteOptions(compression=self.compression or "lz4")
+                self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+        else:
+            table = _to_arrow(df, self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class RunOutputWriter:
+    """
+    Append-only counterpart of save_run_outputs for streaming runs: writes
+    the same files one page at a time, then the run metadata on close().
+    """
+
+    def __init__(self, run_id, config, logger):
+        self.run_id = run_id
+        self.config = config
+        self.logger = logger
+
+        self.raw_dir = Path(config["raw_out_dir"])
+        self.proc_dir = Path(config["processed_out_dir"])
+        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        self.proc_dir.mkdir(parents=True, exist_ok=True)
+
+        self.fmt = config.get("output_format", "csv")
+        self._open(run_id)
+
+        self.rows_raw = 0
+        self.rows_processed = 0
+        self.columns = []
+        self._started = False
+
+    def _open(self, file_id):
+        self.raw_out = output_path(self.raw_dir, "reviews_raw", file_id, self.fmt)
+        self.proc_out = output_path(self.proc_dir, "reviews_processed", file_id, self.fmt)
+        if self.fmt != "csv":
+            _require_pyarrow(self.fmt)
+            compression = self.config.get("output_compression")
+            self._raw_appender = _ArrowAppender(self.raw_out, self.fmt, compression)
+            self._proc_appender = _ArrowAppender(self.proc_out, self.fmt, compression)
+
+    def state(self) -> dict:
+        """
+        Counters (and, for CSV, file sizes) to checkpoint after an append.
+        """
+        state = {"rows_raw": self.rows_raw, "rows_processed": self.rows_processed,
+                 "columns": self.columns}
+        if self.fmt == "csv" and self._started:
+            state["raw_bytes"] = self.raw_out.stat().st_size
+            state["proc_bytes"] = self.proc_out.stat().st_size
+        return state
+
+    def _read_committed(self, path, rows):
+        # First `rows` rows of an earlier attempt's file; None if it has no
+        # footer (the process died before abort() could close it)
+        if not rows:
+            return None
+        try:
+            return read_frame(path).head(rows)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"[RESUME] unreadable run file {path}: {e}")
+            return None
+
+    def resume(self, state, committed_processed=None):
+        """
+        Continue an interrupted run's files from a checkpointed state(). CSV
+        files are cut back to their checkpointed size (dropping pages written
+        after the last commit) and appended to. Parquet / Feather files
+        can't be appended to once closed, so their committed rows are read
+        back and written to fresh files of the same name, which the rest of
+        the run appends to.
+
+        committed_processed: optional callable returning the committed
+        processed rows (e.g. from the DB), used when the processed file is
+        unreadable. Raw rows of an unreadable raw file are lost; rows_raw
+        drops accordingly and the loss is logged.
+        """
+        self.rows_raw = state["rows_raw"]
+        self.rows_processed = state["rows_processed"]
+        self.columns = state["columns"]
+        if self.fmt == "csv":
+            if "raw_bytes" in state:
+                for path, size in ((self.raw_out, state["raw_bytes"]), (self.proc_out, state["proc_bytes"])):
+                    with open(path, "r+b") as f:
+                        f.truncate(size)
+                self._started = True
+            return
+
+        raw = self._read_committed(self.raw_out, self.rows_raw)
+        proc = self._read_committed(self.proc_out, self.rows_processed)
+        if proc is None and self.rows_processed and committed_processed is not None:
+            proc = committed_processed()
+            self.logger.info(f"[RESUME] processed rows={len(proc)} re-exported from the DB")
+        if raw is None and self.rows_raw:
+            self.logger.warning(f"[RESUME] {self.rows_raw} committed raw rows lost with {self.raw_out}")
+        self.rows_raw = 0 if raw is None else len(raw)
+        self.rows_processed = 0 if proc is None else len(proc)
+
+        self._open(self.run_id)
+        if raw is not None and len(raw):
+            self._raw_appender.append(raw)
+        if proc is not None and len(proc):
+            self._proc_appender.append(proc)
+        self._started = True
+
+    def append(self, df_raw, df_processed):
+        if self.fmt == "csv":
+            header = not self._started
+            df_raw.to_csv(self.raw_out, mode="w" if header else "a", header=header, index=False)
+            df_processed.to_csv(self.proc_out, mode="w" if header else "a", header=header, index=False)
+        else:
+            self._raw_appender.append(df_raw)
+            self._proc_appender.append(df_processed)
+        self._started = True
+
+        self.rows_raw += len(df_raw)
+        self.rows_processed += len(df_processed)
+        self.columns = list(df_processed.columns)
+
+    def abort(self):
+        """
+        Close the files of a failed run without writing run metadata, so
+        Parquet / Feather files get their footer and stay readable for resume().
+        """
+        if self.fmt != "csv":
+            self._raw_appender.close()
+            self._proc_appender.close()
+
+    def close(self):
+        self.abort()
+        self.logger.info(f"[SAVE] raw={self.raw_out} processed={self.proc_out}")
+        write_run_metadata(
+            run_id=self.run_id,
+            rows_raw=self.rows_raw,
+            rows_processed=self.rows_processed,
+            columns=self.columns,
+            config=self.config,
+            logger=self.logger,
+        )
@@ -0,0 +1,49 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `requests_per_sec` acquisitions per second,
+    with up to `burst` acquisitions allowed back to back.
+    """
+
+    def __init__(self, requests_per_sec, burst=1):
+        if requests_per_sec <= 0:
+            raise ValueError(f"requests_per_sec must be > 0, got {requests_per_sec}")
+        self.requests_per_sec = float(requests_per_sec)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.requests_per_sec)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.requests_per_sec
+            time.sleep(wait)
+
+
+_HOST_LIMITERS = {}
+_HOST_LOCK = threading.Lock()
+
+
+def host_limiter(host, requests_per_sec, burst=1):
+    """
+    Process-wide limiter for `host`, shared by every worker that talks to it.
+    Returns None when rate limiting is disabled (requests_per_sec falsy).
+    """
+    if not requests_per_sec:
+        return None
+    with _HOST_LOCK:
+        limiter = _HOST_LIMITERS.get(host)
+        if limiter is None or limiter.requests_per_sec != float(requests_per_sec) or limiter.burst != burst:
+            limiter = RateLimiter(requests_per_sec, burst=burst)
+            _HOST_LIMITERS[host] = limiter
+        return limiter
@@ -0,0 +1,237 @@
+"""
+Batch review_uid hashing, compact integer keys and uid stability stats.
+
+A review_uid hashes "{user}_{date}_{text}". Schemes:
+  sha256   legacy, 64 hex chars; same value as the original per-row uid, so
+           existing DB rows and run files keep matching (default)
+  blake2b  128-bit digest, 32 hex chars
+  xxh128   128-bit xxHash, 32 hex chars (needs the optional xxhash package)
+
+Switching scheme on an existing DB stores already-known reviews again under
+new uids, so only change it for a fresh DB.
+
+uid_keys() turns any uid into a signed 64-bit integer (its first 8 bytes),
+stored as reviews.uid_key for compact indexed lookups.
+
+  python -m google_play_reviews.pipeline.uids --input data/raw/reviews_raw_<run_id>.csv
+  python -m google_play_reviews.pipeline.uids --db data/db/reviews.db
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from collections import defaultdict
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULT_UID_SCHEME = "sha256"
+
+
+# scheme -> hash constructor; every one exposes .hexdigest()
+HASH_CONSTRUCTORS = {
+    "sha256": hashlib.sha256,
+    "blake2b": partial(hashlib.blake2b, digest_size=16),
+}
+if xxhash is not None:
+    HASH_CONSTRUCTORS["xxh128"] = xxhash.xxh3_128
+
+
+def available_schemes() -> list[str]:
+    return list(HASH_CONSTRUCTORS)
+
+
+def _constructor(scheme: str):
+    if scheme == "xxh128" and xxhash is None:
+        raise ImportError("uid scheme 'xxh128' requires xxhash (pip install xxhash)")
+    if scheme not in HASH_CONSTRUCTORS:
+        raise ValueError(f"Unknown uid scheme {scheme!r}; expected one of {available_schemes()}")
+    return HASH_CONSTRUCTORS[scheme]
+
+
+def _as_source_values(values) -> list:
+    # Missing values hash as "None", like the scraper's raw None fields
+    if isinstance(values, pd.Series):
+        values = values.astype(object).where(values.notna(), None)
+        return [v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in values]
+    return list(values)
+
+
+def review_uids(users, dates, texts, scheme: str = DEFAULT_UID_SCHEME) -> list[str]:
+    """
+    review_uid for every (user, date, text) triple, in one pass. Accepts
+    lists or Series; dates may be datetimes or pandas Timestamps.
+    """
+    new = _constructor(scheme)
+    return [
+        new(f"{u}_{d}_{t}".encode("utf-8")).hexdigest()
+        for u, d, t in zip(_as_source_values(users), _as_source_values(dates), _as_source_values(texts))
+    ]
+
+
+def page_uids(result: list[dict], scheme: str = DEFAULT_UID_SCHEME) -> list[str]:
+    """
+    review_uid for every review dict of one google_play_scraper page.
+    """
+    new = _constructor(scheme)
+    return [new(f"{r.get('userName')}_{r.get('at')}_{r.get('content')}".encode("utf-8")).hexdigest() for r in result]
+
+
+def frame_uids(df: pd.DataFrame, scheme: str = DEFAULT_UID_SCHEME) -> pd.Series:
+    """
+    Recompute review_uid for an EXPECTED_COLS frame (e.g. to re-key a run file).
+    """
+    uids = review_uids(df["user_name"], df["review_date"], df["review_text"], scheme=scheme)
+    return pd.Series(uids, index=df.index, dtype=object)
+
+
+def uid_keys(uids) -> np.ndarray:
+    """
+    Signed 64-bit key per hex uid (first 16 hex chars, big-endian), as int64.
+    """
+    uids = list(uids)
+    if not uids:
+        return np.empty(0, dtype=np.int64)
+    raw = bytes.fromhex("".join(u[:16] for u in uids))
+    return np.frombuffer(raw, dtype=">i8").astype(np.int64)
+
+
+def first_sightings(keys: np.ndarray, seen: np.ndarray, run_keys: set) -> np.ndarray:
+    """
+    Mask of the uid_keys in neither `seen` (sorted, from earlier runs) nor
+    `run_keys` (this run so far), first occurrence only; adds them to run_keys.
+    """
+    keep = np.zeros(len(keys), dtype=bool)
+    for i in np.flatnonzero(~np.isin(keys, seen)):
+        k = int(keys[i])
+        if k not in run_keys:
+            run_keys.add(k)
+            keep[i] = True
+    return keep
+
+
+class UidStats:
+    """
+    Collision / stability counters over scraped rows, fed page by page
+    before dedup (so the same review fetched by several sort modes counts):
+
+      cross_sort_uids    uids fetched by more than one sort mode
+      repeat_rows        rows whose uid was already seen in the same sort mode
+      content_collisions uids seen with different (user, date, text) content
+      unstable_reviews   (user, text) pairs seen under more than one uid,
+                         e.g. a review_date that differs between sort modes
+      key_collisions     distinct uids sharing a 64-bit uid_key
+
+    Keeps several entries per uid for the whole run and walks every row in
+    Python, so it is an opt-in diagnostic (config uid_stats), not for
+    routine runs.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.repeat_rows = 0
+        self._uid_sorts: dict[str, set] = defaultdict(set)
+        self._uid_content: dict[str, bytes] = {}
+        self._review_uids: dict[bytes, set] = defaultdict(set)
+        self._keys: dict[int, str] = {}
+        self.content_collisions = 0
+        self.key_collisions = 0
+
+    @staticmethod
+    def _digest(*parts) -> bytes:
+        return hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=16).digest()
+
+    def update(self, df: pd.DataFrame) -> "UidStats":
+        if df.empty:
+            return self
+        n = len(df)
+        sorts = df["sort_mode"].tolist() if "sort_mode" in df.columns else [None] * n
+        users = _as_source_values(df["user_name"])
+        dates = _as_source_values(df["review_date"])
+        texts = _as_source_values(df["review_text"])
+        uids = df["review_uid"].tolist()
+
+        for uid, key, sort, user, date, text in zip(uids, uid_keys(uids).tolist(), sorts, users, dates, texts):
+            self.rows += 1
+            if sort in self._uid_sorts[uid]:
+                self.repeat_rows += 1
+            self._uid_sorts[uid].add(sort)
+
+            content = self._digest(user, date, text)
+            known = self._uid_content.setdefault(uid, content)
+            if known != content:
+                self.content_collisions += 1
+
+            self._review_uids[self._digest(user, text)].add(uid)
+
+            other = self._keys.setdefault(key, uid)
+            if other != uid:
+                self.key_collisions += 1
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "unique_uids": len(self._uid_sorts),
+            "repeat_rows": self.repeat_rows,
+            "cross_sort_uids": sum(1 for s in self._uid_sorts.values() if len(s) > 1),
+            "content_collisions": self.content_collisions,
+            "unstable_reviews": sum(1 for u in self._review_uids.values() if len(u) > 1),
+            "key_collisions": self.key_collisions,
+        }
+
+
+def stats_from_db(db_path: str, app_id: str | None = None, chunk_rows: int = 100_000) -> dict:
+    """
+    UidStats over the stored reviews. Stored rows are already deduplicated,
+    so only content/key collisions and unstable reviews are meaningful.
+    """
+    stats = UidStats()
+    where, params = ("WHERE app_id = ?", (app_id,)) if app_id else ("", ())
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.execute(
+            f"SELECT review_uid, user_name, review_text, review_date, sort_mode FROM reviews {where}",
+            params,
+        )
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            stats.update(pd.DataFrame(rows, columns=["review_uid", "user_name", "review_text", "review_date", "sort_mode"]))
+    finally:
+        conn.close()
+    return stats.to_dict()
+
+
+def main():
+    from .storage import iter_frames
+
+    parser = argparse.ArgumentParser(description="review_uid collision and stability stats")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--input", nargs="+", help="Raw run file(s) (csv/parquet/feather)")
+    src.add_argument("--db", help="Path to the reviews SQLite DB")
+    parser.add_argument("--app-id", default=None, help="DB mode: only this app")
+    args = parser.parse_args()
+
+    if args.db:
+        result = stats_from_db(args.db, app_id=args.app_id)
+    else:
+        stats = UidStats()
+        for path in args.input:
+            for chunk in iter_frames(path, columns=["review_uid", "user_name", "review_text", "review_date", "sort_mode"]):
+                stats.update(chunk)
+        result = stats.to_dict()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
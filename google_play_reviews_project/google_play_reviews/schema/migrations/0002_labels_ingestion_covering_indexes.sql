@@ -0,0 +1,46 @@
+-- Entities from schema_design.md that the baseline schema did not create yet,
+-- plus covering indexes for the EDA time-series / rating / version queries.
+
+CREATE TABLE IF NOT EXISTS ingestion_batches (
+  ingestion_id TEXT PRIMARY KEY,
+  source TEXT NOT NULL DEFAULT 'google_play',
+  app_id TEXT NOT NULL,
+  sort_mode TEXT,
+  started_at TEXT,
+  ended_at TEXT,
+  notes TEXT,
+  FOREIGN KEY (app_id) REFERENCES apps(app_id)
+);
+
+ALTER TABLE reviews ADD COLUMN ingestion_id TEXT REFERENCES ingestion_batches(ingestion_id);
+
+CREATE TABLE IF NOT EXISTS labels (
+  label_id TEXT PRIMARY KEY,
+  review_id TEXT NOT NULL,
+  label_type TEXT NOT NULL,
+  label_value TEXT,
+  label_source TEXT NOT NULL,
+  created_at TEXT NOT NULL DEFAULT (datetime('now')),
+  FOREIGN KEY (review_id) REFERENCES reviews(review_uid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_labels_review
+ON labels(review_id);
+
+CREATE INDEX IF NOT EXISTS idx_labels_type_source
+ON labels(label_type, label_source, review_id);
+
+-- Daily / monthly rating series: WHERE app_id = ? [AND review_date range]
+-- GROUP BY date(review_date) reading rating from the index only.
+-- Supersedes idx_reviews_app_date (its prefix).
+CREATE INDEX IF NOT EXISTS idx_reviews_app_date_rating
+ON reviews(app_id, review_date, rating);
+
+DROP INDEX IF EXISTS idx_reviews_app_date;
+
+-- Per-version rating stats: WHERE app_id = ? GROUP BY app_version.
+-- Supersedes idx_reviews_app_version.
+CREATE INDEX IF NOT EXISTS idx_reviews_app_version_rating
+ON reviews(app_id, app_version, rating);
+
+DROP INDEX IF EXISTS idx_reviews_app_version;
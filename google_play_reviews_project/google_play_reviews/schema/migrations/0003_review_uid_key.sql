@@ -0,0 +1,8 @@
+-- Compact 64-bit key derived from review_uid (its first 8 bytes, see
+-- pipeline/uids.py) for integer lookups that do not touch the TEXT primary key.
+-- Rows loaded before this migration are backfilled by db.init_db.
+
+ALTER TABLE reviews ADD COLUMN uid_key INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_reviews_uid_key
+ON reviews(uid_key);
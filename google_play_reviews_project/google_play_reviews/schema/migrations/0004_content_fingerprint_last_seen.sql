@@ -0,0 +1,15 @@
+-- Change-aware upserts: a 64-bit fingerprint of the mutable review content
+-- (rating, review_text, thumbs_up, app_version; see db.content_fingerprint)
+-- lets a re-seen review skip its UPDATE when nothing changed. When each
+-- review was last seen is kept in a narrow side table instead of the main row.
+-- Existing rows get their fingerprint backfilled by db.init_db.
+
+ALTER TABLE reviews ADD COLUMN content_fp INTEGER;
+
+CREATE TABLE IF NOT EXISTS review_last_seen (
+  review_uid TEXT PRIMARY KEY,
+  run_id TEXT,
+  scrape_time TEXT,
+  sort_mode TEXT,
+  FOREIGN KEY (review_uid) REFERENCES reviews(review_uid)
+) WITHOUT ROWID;
@@ -0,0 +1,45 @@
+-- Materialized rating / volume rollups per (app_id, day), (app_id, month) and
+-- (app_id, app_version), maintained by db.upsert_reviews (see pipeline/rollups.py).
+-- A DB that already has reviews gets them filled on first open by db.init_db.
+
+CREATE TABLE IF NOT EXISTS rollup_daily (
+  app_id TEXT NOT NULL,
+  day TEXT NOT NULL,
+  reviews INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0,
+  rating_1 INTEGER NOT NULL DEFAULT 0,
+  rating_2 INTEGER NOT NULL DEFAULT 0,
+  rating_3 INTEGER NOT NULL DEFAULT 0,
+  rating_4 INTEGER NOT NULL DEFAULT 0,
+  rating_5 INTEGER NOT NULL DEFAULT 0,
+  thumbs_up_sum INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (app_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_monthly (
+  app_id TEXT NOT NULL,
+  month TEXT NOT NULL,
+  reviews INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0,
+  rating_1 INTEGER NOT NULL DEFAULT 0,
+  rating_2 INTEGER NOT NULL DEFAULT 0,
+  rating_3 INTEGER NOT NULL DEFAULT 0,
+  rating_4 INTEGER NOT NULL DEFAULT 0,
+  rating_5 INTEGER NOT NULL DEFAULT 0,
+  thumbs_up_sum INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (app_id, month)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_version (
+  app_id TEXT NOT NULL,
+  app_version TEXT NOT NULL,
+  reviews INTEGER NOT NULL DEFAULT 0,
+  rating_sum INTEGER NOT NULL DEFAULT 0,
+  rating_1 INTEGER NOT NULL DEFAULT 0,
+  rating_2 INTEGER NOT NULL DEFAULT 0,
+  rating_3 INTEGER NOT NULL DEFAULT 0,
+  rating_4 INTEGER NOT NULL DEFAULT 0,
+  rating_5 INTEGER NOT NULL DEFAULT 0,
+  thumbs_up_sum INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (app_id, app_version)
+) WITHOUT ROWID;
@@ -0,0 +1,15 @@
+-- Full-text index over reviews.review_text (external content: the text is not
+-- stored twice). db.upsert_reviews indexes newly inserted reviews; a uid is a
+-- hash of the text, so stored text never changes under the same uid.
+-- Porter stemming lets "crash" match "crashes" / "crashing"; prefix indexes
+-- keep short prefix queries ("log*") fast.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+  review_text,
+  content='reviews',
+  content_rowid='rowid',
+  tokenize='porter unicode61 remove_diacritics 2',
+  prefix='2 3'
+);
+
+INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild');
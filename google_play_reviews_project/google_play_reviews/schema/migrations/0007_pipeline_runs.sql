@@ -0,0 +1,37 @@
+-- Per-run performance history written by run_pipeline (see pipeline/metrics.py):
+-- one row per run with totals and the full metrics JSON, and one row per
+-- (run, stage) so stage timings can be charted across runs with plain SQL.
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+  run_id TEXT PRIMARY KEY,
+  app_id TEXT,
+  mode TEXT,
+  status TEXT NOT NULL,
+  started_at TEXT NOT NULL,
+  finished_at TEXT,
+  wall_s REAL,
+  cpu_s REAL,
+  peak_rss_mb REAL,
+  rows_raw INTEGER,
+  rows_processed INTEGER,
+  pages INTEGER,
+  page_p50_ms REAL,
+  page_p90_ms REAL,
+  metrics_json TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_app_started
+ON pipeline_runs(app_id, started_at);
+
+CREATE TABLE IF NOT EXISTS pipeline_run_stages (
+  run_id TEXT NOT NULL,
+  stage TEXT NOT NULL,
+  calls INTEGER,
+  wall_s REAL,
+  cpu_s REAL,
+  peak_rss_mb REAL,
+  rows INTEGER,
+  rows_per_s REAL,
+  PRIMARY KEY (run_id, stage),
+  FOREIGN KEY (run_id) REFERENCES pipeline_runs(run_id)
+) WITHOUT ROWID;
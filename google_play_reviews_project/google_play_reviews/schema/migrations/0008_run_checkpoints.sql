@@ -0,0 +1,34 @@
+-- Checkpoints of runs with checkpointing on (see run_pipeline --resume). Each
+-- scraped page is upserted in the same transaction as its stream's position
+-- and the run's counters, so an interrupted run resumes after its last
+-- committed page instead of starting over.
+
+-- Run-level state: offsets of the run files and the counters run_streaming keeps
+CREATE TABLE IF NOT EXISTS run_checkpoints (
+  run_id TEXT PRIMARY KEY,
+  app_id TEXT NOT NULL,
+  pages INTEGER NOT NULL DEFAULT 0,
+  state_json TEXT NOT NULL,
+  updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+-- One row per (app_id, sort_mode, country, lang) stream of the run: where to
+-- continue, how many rows count toward target_per_mode, and the newest review
+-- seen so far (for the incremental cursor saved when the run completes)
+CREATE TABLE IF NOT EXISTS run_stream_checkpoints (
+  run_id TEXT NOT NULL,
+  app_id TEXT NOT NULL,
+  sort_mode TEXT NOT NULL,
+  country TEXT NOT NULL,
+  lang TEXT NOT NULL,
+  continuation_token TEXT,
+  pages INTEGER NOT NULL DEFAULT 0,
+  collected INTEGER NOT NULL DEFAULT 0,
+  new_rows INTEGER NOT NULL DEFAULT 0,
+  seen_review_date TEXT,
+  seen_review_uid TEXT,
+  done INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+  PRIMARY KEY (run_id, app_id, sort_mode, country, lang),
+  FOREIGN KEY (run_id) REFERENCES run_checkpoints(run_id)
+) WITHOUT ROWID;
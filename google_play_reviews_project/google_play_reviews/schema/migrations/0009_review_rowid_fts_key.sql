@@ -0,0 +1,67 @@
+-- Stable integer key for reviews. reviews was a rowid table with a TEXT
+-- primary key, and VACUUM may renumber the rowids of such a table, which
+-- silently pointed reviews_fts (content_rowid='rowid') at other reviews.
+-- review_rowid is an INTEGER PRIMARY KEY, i.e. the rowid itself, which VACUUM
+-- never changes. review_uid stays the natural key (UNIQUE, so ON CONFLICT
+-- upserts and the labels / review_last_seen foreign keys keep working).
+--
+-- Table rebuild per https://www.sqlite.org/lang_altertable.html; migrations.py
+-- runs migrations with foreign keys off and checks them before committing.
+-- Existing rowids are kept as review_rowid, so they still match reviews_fts.
+
+CREATE TABLE reviews_new (
+  review_uid TEXT NOT NULL UNIQUE,
+  app_id TEXT NOT NULL,
+  user_name TEXT,
+  rating INTEGER,
+  review_text TEXT NOT NULL,
+  review_date TEXT,
+  thumbs_up INTEGER,
+  app_version TEXT,
+  sort_mode TEXT,
+  scrape_time TEXT,
+  run_id TEXT,
+  ingested_at TEXT NOT NULL DEFAULT (datetime('now')),
+  ingestion_id TEXT REFERENCES ingestion_batches(ingestion_id),
+  uid_key INTEGER,
+  content_fp INTEGER,
+  review_rowid INTEGER PRIMARY KEY,
+  FOREIGN KEY (app_id) REFERENCES apps(app_id)
+);
+
+INSERT INTO reviews_new (
+  review_uid, app_id, user_name, rating, review_text, review_date, thumbs_up, app_version,
+  sort_mode, scrape_time, run_id, ingested_at, ingestion_id, uid_key, content_fp, review_rowid
+)
+SELECT
+  review_uid, app_id, user_name, rating, review_text, review_date, thumbs_up, app_version,
+  sort_mode, scrape_time, run_id, ingested_at, ingestion_id, uid_key, content_fp, rowid
+FROM reviews;
+
+DROP TABLE reviews;
+ALTER TABLE reviews_new RENAME TO reviews;
+
+CREATE INDEX IF NOT EXISTS idx_reviews_app_rating
+ON reviews(app_id, rating);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_app_date_rating
+ON reviews(app_id, review_date, rating);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_app_version_rating
+ON reviews(app_id, app_version, rating);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_uid_key
+ON reviews(uid_key);
+
+-- Same index, now keyed on review_rowid by name
+DROP TABLE reviews_fts;
+
+CREATE VIRTUAL TABLE reviews_fts USING fts5(
+  review_text,
+  content='reviews',
+  content_rowid='review_rowid',
+  tokenize='porter unicode61 remove_diacritics 2',
+  prefix='2 3'
+);
+
+INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild');
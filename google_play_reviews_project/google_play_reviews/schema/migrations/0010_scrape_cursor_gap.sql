@@ -0,0 +1,8 @@
+-- NEWEST runs that stop at target_per_mode before the high-water mark leave
+-- a gap of unfetched reviews between the last page and the mark. The cursor
+-- then keeps the old mark, saves its continuation token (which the next run
+-- pages on from) and holds the newest review seen as the pending mark, which
+-- becomes the high-water mark once the gap is closed.
+
+ALTER TABLE scrape_cursors ADD COLUMN pending_review_date TEXT;
+ALTER TABLE scrape_cursors ADD COLUMN pending_review_uid TEXT;
@@ -32,3 +32,16 @@ ON reviews(app_id, rating);
 
 CREATE INDEX IF NOT EXISTS idx_reviews_app_version
 ON reviews(app_id, app_version);
+
+-- Incremental scraping state per (app_id, sort_mode) stream:
+-- high-water mark for date-ordered sorts, saved continuation token for the rest
+CREATE TABLE IF NOT EXISTS scrape_cursors (
+  app_id TEXT NOT NULL,
+  sort_mode TEXT NOT NULL,
+  newest_review_date TEXT,
+  newest_review_uid TEXT,
+  continuation_token TEXT,
+  updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+  PRIMARY KEY (app_id, sort_mode),
+  FOREIGN KEY (app_id) REFERENCES apps(app_id)
+);
@@ -0,0 +1,81 @@
+"""
+Chunked / parallel EDA must reproduce the in-memory profile (what
+eda_basic --verify checks by hand), and the analytical queries must keep
+using their indexes (benchmarks/query_plans.py).
+
+  python -m pytest -q
+"""
+import pytest
+
+from google_play_reviews.analysis.eda_basic import (
+    add_text_features, basic_profile, load_df, profile_chunked, profile_parallel, time_aggregation,
+)
+from google_play_reviews.analysis.eda_stream import APPROX_KEYS, compare_summaries, compare_time_frames
+from google_play_reviews.benchmarks.query_plans import check_query_plans
+from google_play_reviews.benchmarks.synthetic import generate_reviews
+from google_play_reviews.pipeline.db import connect, upsert_reviews
+from google_play_reviews.pipeline.storage import write_frame
+
+
+@pytest.fixture(scope="module")
+def reviews():
+    return generate_reviews(5_000, seed=7)
+
+
+@pytest.fixture(scope="module", params=["csv", "parquet"])
+def processed_path(request, reviews, tmp_path_factory):
+    if request.param != "csv":
+        pytest.importorskip("pyarrow")
+    path = tmp_path_factory.mktemp("eda") / f"reviews_processed.{request.param}"
+    write_frame(reviews, path, request.param)
+    return path
+
+
+# word_len quantile -> q; the KLL sketch bounds rank error (~1.7/k of n), not
+# value error, and the synthetic lengths have gaps in the tail
+APPROX_QUANTILES = {"word_len_p25": 0.25, "word_len_median": 0.5, "word_len_p75": 0.75, "word_len_p95": 0.95}
+RANK_TOL = 0.02
+
+
+def _in_memory(path):
+    df = add_text_features(load_df(path))
+    return df, basic_profile(df), time_aggregation(df)
+
+
+def _assert_matches(df, summary, agg, acc):
+    chunked = acc.to_summary()
+    assert compare_summaries({k: v for k, v in summary.items() if k not in APPROX_KEYS},
+                             {k: v for k, v in chunked.items() if k not in APPROX_KEYS}) == []
+    assert compare_time_frames(agg, acc.to_time_frame()) == []
+    for key, q in APPROX_QUANTILES.items():
+        lo, hi = df["word_len"].quantile([max(q - RANK_TOL, 0), min(q + RANK_TOL, 1)])
+        assert lo <= chunked[key] <= hi, f"{key}: {chunked[key]} outside [{lo}, {hi}]"
+
+
+def test_profile_chunked_matches_in_memory(processed_path):
+    df, summary, agg = _in_memory(processed_path)
+    _assert_matches(df, summary, agg, profile_chunked(processed_path, chunksize=700))
+
+
+def test_profile_parallel_matches_in_memory(processed_path):
+    df, summary, agg = _in_memory(processed_path)
+    _assert_matches(df, summary, agg, profile_parallel(processed_path, workers=2, chunksize=700))
+
+
+def test_query_plans_empty_db(tmp_path):
+    conn = connect(str(tmp_path / "plans.db"))
+    try:
+        assert check_query_plans(conn) == []
+    finally:
+        conn.close()
+
+
+def test_query_plans_loaded_db(tmp_path, reviews):
+    db_path = str(tmp_path / "plans.db")
+    upsert_reviews(reviews.dropna(subset=["review_text"]), db_path, "com.example.app", "run_1")
+    conn = connect(db_path)
+    try:
+        conn.execute("ANALYZE")
+        assert check_query_plans(conn) == []
+    finally:
+        conn.close()